@@ -0,0 +1,84 @@
+"""Measure the import time of a module, and check the heavy dependencies stay
+out of it.
+
+Usage:
+    poetry run python benchmarks/import_time.py [MODULE] [--top N]
+        [--max-ms MS] [--repeat N]
+
+Exits with an error when the import is slower than `--max-ms`, or when one of
+the HEAVY_MODULES is imported.
+"""
+
+import argparse
+import re
+import subprocess
+import sys
+
+HEAVY_MODULES: tuple[str, ...] = (
+    "playwright",
+    "pandas",
+    "gspread",
+    "google.auth",
+    "google.cloud.storage",
+)
+IMPORT_TIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def import_times(module: str) -> dict[str, tuple[int, int]]:
+    """Self and cumulative microseconds of every module imported by `module`,
+    in a fresh interpreter
+    """
+    output = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    times: dict[str, tuple[int, int]] = {}
+    for line in output.stderr.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, _, name = match.groups()
+            times[name] = (int(self_us), int(cumulative_us))
+
+    return times
+
+
+def main() -> None:
+    args_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    args_parser.add_argument("module", nargs="?", default="vigilant.app")
+    args_parser.add_argument("--top", type=int, default=15)
+    args_parser.add_argument("--max-ms", type=float)
+    args_parser.add_argument("--repeat", type=int, default=5)
+    args = args_parser.parse_args()
+
+    runs: list[dict[str, tuple[int, int]]] = [
+        import_times(args.module) for _ in range(args.repeat)
+    ]
+    times: dict[str, tuple[int, int]] = min(runs, key=lambda run: run[args.module][1])
+    total: float = times[args.module][1] / 1000
+
+    print(f"{'module':<50}{'self (ms)':>12}{'cumulative (ms)':>18}")
+    slowest = sorted(times.items(), key=lambda item: item[1][1], reverse=True)
+    for name, (self_us, cumulative_us) in slowest[: args.top]:
+        print(f"{name:<50}{self_us / 1000:>12.1f}{cumulative_us / 1000:>18.1f}")
+    print(f"\nimport {args.module}: {total:.1f} ms")
+
+    heavy: list[str] = [
+        name
+        for name in times
+        if any(name == heavy or name.startswith(f"{heavy}.") for heavy in HEAVY_MODULES)
+    ]
+    errors: list[str] = []
+    if heavy:
+        errors.append(f"heavy modules imported: {', '.join(sorted(heavy))}")
+    if args.max_ms is not None and total > args.max_ms:
+        errors.append(f"{total:.1f} ms is over the {args.max_ms:.1f} ms budget")
+
+    if errors:
+        sys.exit("\n".join(errors))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Compare statement parser engines on import time, parse time and peak memory.
+
+Usage:
+    poetry run python benchmarks/parser_engines.py [STATEMENT] [--header N]
+        [--usecols I ...] [--rows N] [--repeat N]
+
+Without STATEMENT, a synthetic .xlsx statement of `--rows` rows is used.
+"""
+
+import argparse
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from io import BytesIO
+from pathlib import Path
+
+from vigilant.core.collector.scraper.parser import PARSER_REGISTRY
+
+ENGINE_IMPORTS: dict[str, str] = {
+    "pandas": "import pandas, openpyxl, xlrd",
+    "stream": "import openpyxl, xlrd",
+}
+
+
+def synthetic_statement(rows: int) -> bytes:
+    """Statement with one header row and `rows` transactions"""
+    from openpyxl import Workbook
+
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(["Date", "Description", "Location", "Fees", "Amount"])
+    for index in range(rows):
+        sheet.append(
+            [
+                datetime(2024, 1, 1) + timedelta(days=index % 365),
+                f"Purchase {index}",
+                "Santiago",
+                0,
+                index * 100,
+            ]
+        )
+
+    buffer = BytesIO()
+    workbook.save(buffer)
+    return buffer.getvalue()
+
+
+def import_time(engine: str) -> float:
+    """Import time of the engine dependencies in a fresh interpreter"""
+    code = (
+        "import time; start = time.perf_counter(); "
+        f"{ENGINE_IMPORTS[engine]}; print(time.perf_counter() - start)"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    return float(output.stdout)
+
+
+def parse_time(
+    engine: str, data: bytes, header: int, usecols: tuple, repeat: int
+) -> tuple[float, int]:
+    """Best parse time and peak traced memory of the engine"""
+    parser = PARSER_REGISTRY[engine]()
+    parser.read(data, header=header, usecols=usecols)
+
+    timings: list[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parser.read(data, header=header, usecols=usecols)
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    parser.read(data, header=header, usecols=usecols)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return min(timings), peak
+
+
+def main() -> None:
+    args_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    args_parser.add_argument("statement", nargs="?", type=Path)
+    args_parser.add_argument("--header", type=int, default=0)
+    args_parser.add_argument("--usecols", type=int, nargs="+", default=[0, 1, 3, 4])
+    args_parser.add_argument("--rows", type=int, default=500)
+    args_parser.add_argument("--repeat", type=int, default=20)
+    args = args_parser.parse_args()
+
+    data: bytes = (
+        args.statement.read_bytes()
+        if args.statement
+        else synthetic_statement(args.rows)
+    )
+
+    print(f"{'engine':<10}{'import (ms)':>14}{'parse (ms)':>14}{'peak (KiB)':>14}")
+    for engine in PARSER_REGISTRY:
+        imported: float = import_time(engine)
+        parsed, peak = parse_time(
+            engine, data, args.header, tuple(args.usecols), args.repeat
+        )
+        print(
+            f"{engine:<10}{imported * 1000:>14.1f}{parsed * 1000:>14.2f}"
+            f"{peak / 1024:>14.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -87,7 +87,9 @@ resource "google_cloud_run_v2_service" "vigilant_robot" {
       image = var.service_image
 
       resources {
-        cpu_idle          = true
+        # Updates keep running in background after POST /update-expenses
+        # answers, CPU must stay allocated outside of requests
+        cpu_idle          = false
         startup_cpu_boost = true
 
         limits = {
@@ -100,6 +102,16 @@ resource "google_cloud_run_v2_service" "vigilant_robot" {
         container_port = 8080
       }
 
+      # Route requests once the browser is warm
+      startup_probe {
+        period_seconds    = 5
+        failure_threshold = 24
+
+        http_get {
+          path = "/healthz"
+        }
+      }
+
       env {
         name  = "STORAGE_LOCATION"
         value = "gcs"
@@ -1,3 +1,4 @@
+from collections.abc import Generator
 from pathlib import Path
 from unittest import mock
 
@@ -5,25 +6,34 @@ import pytest
 
 from vigilant.common import browser
 from vigilant.common.exceptions import DriverException
+from vigilant.common.storage import LocalStorage
 from vigilant.common.values import settings
 
 
-@mock.patch("vigilant.common.browser.sync_playwright")
-def test_session(
-    mock_sync_playwright: mock.MagicMock, mock_page: mock.MagicMock
-) -> None:
-    mock_browser = mock.MagicMock()
-    mock_browser.new_context.return_value.new_page.return_value = mock_page
+@pytest.fixture
+def mock_playwright() -> Generator[mock.MagicMock]:
+    with mock.patch("vigilant.common.browser.sync_playwright") as mock_sync_playwright:
+        yield mock_sync_playwright.return_value.start.return_value
 
-    mock_playwright_session = mock.MagicMock()
-    mock_playwright_session.chromium.launch.return_value = mock_browser
 
-    mock_sync_playwright.return_value.__enter__.return_value = mock_playwright_session
+@pytest.fixture
+def pool(monkeypatch: pytest.MonkeyPatch) -> browser.BrowserPool:
+    pool = browser.BrowserPool(max_context_uses=2, memory_limit_mb=100.0)
+    monkeypatch.setattr("vigilant.common.browser._local.pool", pool, raising=False)
+    monkeypatch.setattr("vigilant.common.browser._browser_memory_mb", lambda: 0.0)
 
-    with browser.session() as session:
-        assert session == mock_page
+    return pool
+
+
+def test_pool_launch(
+    mock_playwright: mock.MagicMock, pool: browser.BrowserPool
+) -> None:
+    mock_browser = mock_playwright.chromium.launch.return_value
 
-    mock_playwright_session.chromium.launch.assert_called_once_with(
+    pool.acquire("A")
+    pool.acquire("B")
+
+    mock_playwright.chromium.launch.assert_called_once_with(
         channel="chrome",
         args=[
             "--no-sandbox",
@@ -32,36 +42,277 @@ def test_session(
             "--disable-gpu",
         ],
     )
-    mock_browser.new_context.assert_called_once_with(
+    mock_browser.new_context.assert_called_with(
         accept_downloads=True,
         viewport={"width": 1920, "height": 1080},
         user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
         "AppleWebKit/537.36 (KHTML, like Gecko) "
         "Chrome/123.0.0.0 Safari/537.36",
     )
-    mock_browser.close.assert_called_once_with()
-    mock_page.set_default_timeout.assert_called_once_with(settings.BROWSER_WAIT_TIMEOUT)
+    assert mock_browser.new_context.call_count == 2
+    assert pool.stats().launches == 1
+    assert browser.LAUNCH_SECONDS.count() >= 1
 
 
-@mock.patch("vigilant.common.browser.sync_playwright")
-@mock.patch("vigilant.common.browser._take_screenshot")
-def test_session_exception(
-    mock_take_screenshot: mock.MagicMock, mock_sync_playwright: mock.MagicMock
+def test_pool_relaunch_disconnected(
+    mock_playwright: mock.MagicMock, pool: browser.BrowserPool
+) -> None:
+    pool.acquire("A")
+    mock_playwright.chromium.launch.return_value.is_connected.return_value = False
+    pool.acquire("A")
+
+    assert mock_playwright.chromium.launch.call_count == 2
+    assert pool.stats().reuses == 0
+
+
+def test_pool_reuse_and_recycle(
+    mock_playwright: mock.MagicMock, pool: browser.BrowserPool
+) -> None:
+    mock_browser = mock_playwright.chromium.launch.return_value
+    first_context, second_context = mock.MagicMock(), mock.MagicMock()
+    mock_browser.new_context.side_effect = [first_context, second_context]
+
+    assert pool.acquire("A") is first_context
+    assert pool.acquire("A") is first_context
+    assert pool.acquire("A") is second_context
+
+    first_context.close.assert_called_once()
+    second_context.route.assert_called_once()
+    stats: browser.PoolStats = pool.stats()
+    assert stats.reuses == 1 and stats.recycles == 1
+    assert list(stats.contexts_age) == list(stats.routes) == ["A"]
+
+
+def test_pool_recycle_memory(
+    mock_playwright: mock.MagicMock,
+    pool: browser.BrowserPool,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    pool.acquire("A")
+    monkeypatch.setattr("vigilant.common.browser._browser_memory_mb", lambda: 500.0)
+    pool.acquire("A")
+
+    assert mock_playwright.chromium.launch.return_value.new_context.call_count == 2
+    assert pool.stats().recycles == 1
+
+
+def test_pool_close(mock_playwright: mock.MagicMock, pool: browser.BrowserPool) -> None:
+    context = pool.acquire("A")
+
+    pool.discard("B")
+    pool.close()
+    pool.close()
+
+    context.close.assert_called_once()
+    mock_playwright.chromium.launch.return_value.close.assert_called_once()
+    mock_playwright.stop.assert_called_once()
+    assert pool.stats().contexts_age == {}
+
+
+def test_get_pool(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delattr("vigilant.common.browser._local.pool", raising=False)
+
+    with mock.patch("vigilant.common.browser.atexit") as mock_atexit:
+        pool: browser.BrowserPool = browser.get_pool()
+
+    assert browser.get_pool() is pool
+    mock_atexit.register.assert_called_once_with(pool.close)
+
+
+def test_close_pool(monkeypatch: pytest.MonkeyPatch) -> None:
+    pool = mock.MagicMock()
+    monkeypatch.setattr("vigilant.common.browser._local.pool", pool, raising=False)
+
+    browser.close_pool()
+    browser.close_pool()
+
+    pool.close.assert_called_once()
+    assert not hasattr(browser._local, "pool")
+
+
+def test_session(
+    mock_playwright: mock.MagicMock,
+    pool: browser.BrowserPool,
+    mock_page: mock.MagicMock,
+) -> None:
+    mock_context = mock_playwright.chromium.launch.return_value.new_context.return_value
+    mock_context.new_page.return_value = mock_page
+    mock_page.is_closed.return_value = False
+
+    with browser.session("A") as session:
+        assert session == mock_page
+
+    with browser.session("A"):
+        pass
+
+    mock_playwright.chromium.launch.assert_called_once()
+    mock_page.set_default_timeout.assert_called_with(settings.BROWSER_WAIT_TIMEOUT)
+    assert mock_page.close.call_count == 2
+    mock_context.close.assert_not_called()
+
+
+def test_session_renewed_page(
+    mock_playwright: mock.MagicMock, pool: browser.BrowserPool
 ) -> None:
-    mock_browser, mock_playwright_session = mock.MagicMock(), mock.MagicMock()
-    mock_playwright_session.chromium.launch.return_value = mock_browser
+    mock_browser = mock_playwright.chromium.launch.return_value
+    first, second = mock.MagicMock(), mock.MagicMock()
+    mock_browser.new_context.side_effect = [first, second]
+    renewed = second.new_page.return_value
+    second.pages = [renewed]
+    renewed.is_closed.return_value = False
 
-    mock_playwright_context_manager = mock.MagicMock()
-    mock_playwright_context_manager.__enter__.return_value = mock_playwright_session
+    with browser.session("A"):
+        page = browser.renew_page("A")
 
-    mock_sync_playwright.return_value = mock_playwright_context_manager
+    assert page is renewed
+    first.close.assert_called_once()
+    renewed.close.assert_called_once()
+    renewed.set_default_timeout.assert_called_with(settings.BROWSER_WAIT_TIMEOUT)
+    assert pool.pages("B") == []
+
+
+@mock.patch("vigilant.common.browser._take_screenshot")
+def test_session_exception(
+    mock_take_screenshot: mock.MagicMock,
+    mock_playwright: mock.MagicMock,
+    pool: browser.BrowserPool,
+) -> None:
+    mock_context = mock_playwright.chromium.launch.return_value.new_context.return_value
 
     with pytest.raises(DriverException):
-        with browser.session() as _:
+        with browser.session("A") as _:
             raise Exception
 
     mock_take_screenshot.assert_called_once()
-    mock_browser.close.assert_called_once()
+    mock_context.close.assert_called_once()
+    assert pool.stats().contexts_age == {}
+
+
+def test_browser_memory_mb(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    for pid, ppid, rss in ((10, 1, 99), (20, 10, 256), (30, 20, 256), (40, 1, 99)):
+        (tmp_path / str(pid)).mkdir()
+        (tmp_path / str(pid) / "stat").write_text(
+            f"{pid} (proc name) S {ppid} " + " ".join(["0"] * 19) + f" {rss} 0"
+        )
+    (tmp_path / "50").mkdir()
+    (tmp_path / "50" / "stat").write_text("corrupted")
+
+    monkeypatch.setattr("vigilant.common.browser.Path", lambda _: tmp_path)
+    monkeypatch.setattr("vigilant.common.browser.os.getpid", lambda: 10)
+    monkeypatch.setattr("vigilant.common.browser.os.sysconf", lambda _: 4096)
+
+    assert browser._browser_memory_mb() == 2.0
+
+
+def test_browser_memory_mb_unavailable(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(
+        "vigilant.common.browser.Path", lambda _: Path("/nonexistent/proc")
+    )
+
+    assert browser._browser_memory_mb() == 0.0
+
+
+class TestRequestBlocker:
+    class Rules(browser.RouteRules):
+        BLOCKED_RESOURCE_TYPES = ("image",)
+        BLOCKED_DOMAINS = ("tracker.com",)
+        ALLOWED_DOMAINS = ("cdn.bank.com",)
+
+    @pytest.mark.parametrize(
+        "resource_type, url, blocked",
+        (
+            pytest.param("image", "https://bank.com/logo.png", True, id="type"),
+            pytest.param("script", "https://tracker.com/t.js", True, id="domain"),
+            pytest.param("xhr", "https://eu.tracker.com/t", True, id="subdomain"),
+            pytest.param("image", "https://cdn.bank.com/i.png", False, id="allowed"),
+            pytest.param("document", "https://bank.com/home", False, id="passed"),
+            pytest.param("xhr", "https://nottracker.com/t", False, id="similar"),
+        ),
+    )
+    def test_handle(self, resource_type: str, url: str, blocked: bool) -> None:
+        mock_route = mock.MagicMock()
+        mock_route.request.resource_type = resource_type
+        mock_route.request.url = url
+
+        blocker = browser.RequestBlocker(self.Rules)
+        blocker.handle(mock_route)
+
+        assert mock_route.abort.called == blocked
+        assert mock_route.fallback.called != blocked
+        assert sum(blocker.blocked.values()) == int(blocked)
+
+    def test_stats(self) -> None:
+        mock_context = mock.MagicMock()
+        blocker = browser.RequestBlocker(self.Rules)
+        blocker.install(mock_context)
+
+        for resource_type in ("image", "image", "script"):
+            mock_route = mock.MagicMock()
+            mock_route.request.resource_type = resource_type
+            mock_route.request.url = "https://tracker.com/file"
+            blocker.handle(mock_route)
+
+        mock_context.route.assert_called_once_with("**/*", blocker.handle)
+        assert blocker.stats() == browser.RouteStats(
+            blocked_requests={"image": 2, "script": 1},
+            estimated_bytes_saved=130_000,
+        )
+
+
+class TestSessionStateCache:
+    KEY: str = "0nLGMSEhh7bJqGbMDsbVg3Bj4HYJr2HCNfl3r8qHRzI="
+
+    def test_save_load(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.chdir(tmp_path)
+        state: dict = {"cookies": [{"name": "sid", "value": "123"}], "origins": []}
+        cache = browser.SessionStateCache(LocalStorage(), key=self.KEY, ttl=60)
+
+        assert cache.load("A") is None
+
+        cache.save("A", state)
+
+        assert cache.load("A") == state
+        assert b"sid" not in (tmp_path / "sessions" / "A.state").read_bytes()
+
+        cache.invalidate("A")
+        assert cache.load("A") is None
+
+    def test_expired(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.chdir(tmp_path)
+        cache = browser.SessionStateCache(LocalStorage(), key=self.KEY, ttl=0)
+
+        cache.save("A", {"cookies": []})
+        monkeypatch.setattr("cryptography.fernet.time.time", lambda: 2**40)
+
+        assert cache.load("A") is None
+        assert not (tmp_path / "sessions" / "A.state").exists()
+
+    @mock.patch("vigilant.common.browser.logger")
+    def test_disabled(self, mock_logger: mock.MagicMock) -> None:
+        mock_storage = mock.MagicMock()
+        cache = browser.SessionStateCache(mock_storage, key=None)
+
+        mock_logger.warning.assert_not_called()
+
+        cache.save("A", {"cookies": []})
+        cache.invalidate("A")
+
+        assert not cache.enabled and cache.load("A") is None
+        assert not mock_storage.mock_calls
+        mock_logger.warning.assert_called_once()
+
+    def test_invalid_key(self) -> None:
+        cache = browser.SessionStateCache(mock.MagicMock(), key="not a key")
+
+        with pytest.raises(ValueError):
+            cache.enabled
+
+    @mock.patch("vigilant.common.browser.get_storage")
+    def test_default_storage(self, get_storage: mock.MagicMock) -> None:
+        cache = browser.SessionStateCache(key=self.KEY)
+
+        get_storage.assert_not_called()
+        assert cache.storage is get_storage.return_value
 
 
 def test_take_screenshot(
@@ -0,0 +1,63 @@
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from vigilant.common.cache import ReferenceDataCache
+
+
+def test_get() -> None:
+    loader = mock.MagicMock(return_value=["PAGO"])
+    cache = ReferenceDataCache(ttl=60)
+
+    assert cache.get("payments", loader) == ["PAGO"]
+    assert cache.get("payments", loader) == ["PAGO"]
+
+    loader.assert_called_once()
+    assert cache.stats().model_dump() == {"hits": 1, "misses": 1, "keys": ["payments"]}
+
+
+def test_get_expired(monkeypatch: pytest.MonkeyPatch) -> None:
+    loader = mock.MagicMock(return_value=["PAGO"])
+    cache = ReferenceDataCache(ttl=60)
+
+    cache.get("payments", loader)
+    monkeypatch.setattr("vigilant.common.cache.time.time", lambda: 2**40)
+    cache.get("payments", loader)
+
+    assert loader.call_count == 2 and cache.misses == 2
+
+
+def test_invalidate() -> None:
+    loader = mock.MagicMock(return_value=["PAGO"])
+    cache = ReferenceDataCache(ttl=60)
+
+    cache.get("payments", loader)
+    cache.get("banks", loader)
+    cache.invalidate("payments")
+
+    assert cache.stats().keys == ["banks"]
+
+    cache.invalidate()
+
+    assert cache.stats().keys == []
+
+
+def test_persisted(tmp_path: Path) -> None:
+    cache_path: Path = tmp_path / "cache" / "reference.json"
+    loader = mock.MagicMock(return_value=["PAGO"])
+
+    ReferenceDataCache(ttl=60, path=cache_path.as_posix()).get("payments", loader)
+    cache = ReferenceDataCache(ttl=60, path=cache_path.as_posix())
+
+    assert cache.get("payments", loader) == ["PAGO"]
+    loader.assert_called_once()
+
+
+def test_persisted_unreadable(tmp_path: Path) -> None:
+    cache_path: Path = tmp_path / "reference.json"
+    cache_path.write_text("Hesitation is defeat!")
+
+    cache = ReferenceDataCache(ttl=60, path=cache_path.as_posix())
+
+    assert cache.stats().keys == []
@@ -0,0 +1,85 @@
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+import pytest
+
+from vigilant.common import clients
+
+
+@pytest.fixture
+def mock_credentials() -> mock.MagicMock:
+    credentials = mock.MagicMock(token="token")
+    credentials.expiry = datetime.now(timezone.utc).replace(tzinfo=None) + timedelta(
+        hours=1
+    )
+
+    return credentials
+
+
+@pytest.fixture
+def mock_google_auth(mock_credentials: mock.MagicMock) -> mock.MagicMock:
+    with mock.patch("google.auth.default") as mock_auth:
+        mock_auth.return_value = (mock_credentials, "project")
+        yield mock_auth
+
+
+@mock.patch("google.cloud.storage.Client")
+@mock.patch("gspread.authorize")
+@mock.patch("google.auth.transport.requests.AuthorizedSession")
+def test_clients_cached(
+    MockAuthorizedSession: mock.MagicMock,
+    mock_authorize: mock.MagicMock,
+    MockStorageClient: mock.MagicMock,
+    mock_google_auth: mock.MagicMock,
+    mock_credentials: mock.MagicMock,
+) -> None:
+    google_clients = clients.GoogleClients()
+
+    assert google_clients.sheets() is google_clients.sheets()
+    assert google_clients.storage() is google_clients.storage()
+
+    mock_google_auth.assert_called_once_with(scopes=clients.SCOPES)
+    MockAuthorizedSession.assert_called_once_with(mock_credentials)
+    mock_authorize.assert_called_once_with(
+        mock_credentials, session=MockAuthorizedSession.return_value
+    )
+    MockStorageClient.assert_called_once_with(
+        project="project",
+        credentials=mock_credentials,
+        _http=MockAuthorizedSession.return_value,
+    )
+    mock_credentials.refresh.assert_not_called()
+
+    google_clients.close()
+
+    MockAuthorizedSession.return_value.close.assert_called_once()
+    google_clients.credentials()
+    assert mock_google_auth.call_count == 2
+
+
+@pytest.mark.parametrize(
+    "token, expires_in, refreshed",
+    [
+        (None, None, True),
+        ("token", None, False),
+        ("token", timedelta(minutes=1), True),
+        ("token", timedelta(hours=1), False),
+    ],
+)
+def test_credentials_refresh(
+    mock_google_auth: mock.MagicMock,
+    mock_credentials: mock.MagicMock,
+    token: str | None,
+    expires_in: timedelta | None,
+    refreshed: bool,
+) -> None:
+    mock_credentials.token = token
+    mock_credentials.expiry = (
+        datetime.now(timezone.utc).replace(tzinfo=None) + expires_in
+        if expires_in
+        else None
+    )
+
+    clients.GoogleClients().credentials()
+
+    assert mock_credentials.refresh.called == refreshed
@@ -0,0 +1,39 @@
+import math
+
+import pytest
+
+from vigilant.common.deadline import MIN_TIMEOUT, Deadline
+
+
+def test_unbounded() -> None:
+    deadline = Deadline()
+
+    assert deadline.remaining == math.inf and not deadline.expired
+    assert deadline.timeout(30000.0) == 30000.0
+
+
+def test_expired() -> None:
+    deadline = Deadline(0)
+
+    assert deadline.expired and deadline.remaining == 0.0
+    assert deadline.timeout(30000.0) == MIN_TIMEOUT
+
+
+def test_child() -> None:
+    deadline = Deadline(60)
+
+    assert deadline.child(30).remaining == pytest.approx(30, abs=1)
+    assert deadline.child(90).remaining == pytest.approx(60, abs=1)
+    assert Deadline().child(30).remaining == pytest.approx(30, abs=1)
+
+
+def test_before() -> None:
+    deadline = Deadline(60)
+
+    assert deadline.before(20).remaining == pytest.approx(40, abs=1)
+    assert deadline.before(90).expired
+    assert Deadline().before(20).remaining == math.inf
+
+
+def test_timeout() -> None:
+    assert Deadline(10).timeout(30000.0) == pytest.approx(10000.0, abs=1000)
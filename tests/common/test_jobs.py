@@ -0,0 +1,71 @@
+import threading
+from unittest import mock
+
+from vigilant.common.jobs import JobManager, JobStatus
+
+
+def test_job_lifecycle() -> None:
+    manager = JobManager()
+    release = threading.Event()
+
+    job = manager.submit(lambda: release.wait(5))
+
+    assert manager.get(job.id) is job
+    assert job.duration is None
+    release.set()
+
+    finished = manager.wait(job.id, timeout=5)
+
+    assert finished.status == JobStatus.SUCCEEDED
+    assert finished.finished and finished.duration >= 0
+    assert finished.error is None
+
+
+def test_job_crashed() -> None:
+    manager = JobManager()
+
+    job = manager.submit(mock.Mock(side_effect=ValueError("boom")))
+    manager.wait(job.id, timeout=5)
+
+    assert job.status == JobStatus.FAILED
+    assert job.error == "ValueError('boom')"
+
+
+def test_job_history_bounded() -> None:
+    manager = JobManager(history=2)
+
+    submitted = [manager.submit(lambda: None) for _ in range(3)]
+    for job in submitted:
+        manager.wait(job.id, timeout=5)
+    latest = manager.submit(lambda: None)
+
+    assert manager.get(submitted[0].id) is None
+    assert manager.get(submitted[1].id) is None
+    assert manager.get(submitted[2].id) is submitted[2]
+    assert manager.get(latest.id) is latest
+    assert manager.wait("unknown") is None
+
+
+def test_job_deduplicated() -> None:
+    manager = JobManager()
+    release = threading.Event()
+
+    job = manager.submit(lambda: release.wait(5), key="update")
+    attached = manager.submit(mock.Mock(), key="update")
+    other = manager.submit(lambda: None)
+    release.set()
+    manager.wait(other.id, timeout=5)
+
+    assert attached is job
+    assert manager.submit(lambda: None, key="update") is not job
+
+
+def test_shutdown() -> None:
+    manager = JobManager()
+    owners: list[str] = []
+
+    job = manager.submit(mock.Mock())
+    manager.shutdown(lambda: owners.append(threading.current_thread().name))
+
+    assert job.status == JobStatus.SUCCEEDED
+    assert len(owners) == 1 and owners[0].startswith("job")
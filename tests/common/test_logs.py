@@ -1,4 +1,8 @@
+import io
+import json
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
 from unittest import mock
 
 import pytest
@@ -7,17 +11,41 @@ from vigilant.common import log
 from vigilant.common.log import settings
 
 
+@pytest.fixture
+def root_logger() -> logging.Logger:
+    root: logging.Logger = logging.getLogger()
+    handlers: list[logging.Handler] = list(root.handlers)
+    level: int = root.level
+
+    yield root
+
+    for handler in set(root.handlers) - set(handlers):
+        root.removeHandler(handler)
+        handler.listener.stop()
+    root.setLevel(level)
+
+
+@mock.patch("vigilant.common.log.atexit")
 @mock.patch("vigilant.common.log._get_loglevel")
-def test_build_logger(mock_get_loglevel: mock.MagicMock) -> None:
+def test_build_logger(
+    mock_get_loglevel: mock.MagicMock,
+    mock_atexit: mock.MagicMock,
+    root_logger: logging.Logger,
+) -> None:
     mock_loglevel: int = 10
     mock_get_loglevel.return_value = mock_loglevel
 
     logger: logging.Logger = log.build_logger()
 
     mock_get_loglevel.assert_called_once()
+    assert logger is root_logger
     assert logger.hasHandlers() and logger.level == mock_loglevel
 
-    handler: logging.Handler = logger.handlers[0]
+    queue_handler: logging.Handler = logger.handlers[-1]
+    assert isinstance(queue_handler, QueueHandler)
+    mock_atexit.register.assert_called_once_with(queue_handler.listener.stop)
+
+    (handler,) = queue_handler.listener.handlers
     assert isinstance(handler, logging.StreamHandler) and handler.formatter is not None
 
     formatter: logging.Formatter = handler.formatter
@@ -28,6 +56,55 @@ def test_build_logger(mock_get_loglevel: mock.MagicMock) -> None:
     )
 
 
+@mock.patch("vigilant.common.log.atexit", mock.MagicMock())
+def test_build_logger_json(
+    monkeypatch: pytest.MonkeyPatch, root_logger: logging.Logger
+) -> None:
+    monkeypatch.setattr(settings, "LOG_FORMAT", "JSON")
+
+    queue_handler: logging.Handler = log.build_logger().handlers[-1]
+
+    assert isinstance(queue_handler.listener.handlers[0].formatter, log.JsonFormatter)
+
+
+def test_records_written_in_background() -> None:
+    stream = io.StringIO()
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(log.JsonFormatter())
+    listener = QueueListener(queue.SimpleQueue(), handler)
+    queue_handler = log._DeferredQueueHandler(listener.queue)
+    queue_handler.addFilter(log._DefaultContextFilter())
+
+    logger = logging.getLogger("vigilant.tests.queue")
+    logger.propagate = False
+    logger.addHandler(queue_handler)
+    scraper = log.ContextAdapter(logger, {"role": "Scraper", "entity": "Chile"})
+
+    listener.start()
+    with log.bind_run_id("run-1"):
+        scraper.warning(
+            "Step %s took 1.5s", "login", extra={"step": "login", "duration": 1.5}
+        )
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        logger.exception("Failed")
+    listener.stop()
+    logger.removeHandler(queue_handler)
+
+    step, failure = (json.loads(line) for line in stream.getvalue().splitlines())
+    assert step["message"] == "Step login took 1.5s"
+    assert step["severity"] == "WARNING" and step["logger"] == logger.name
+    assert (step["role"], step["entity"], step["run_id"]) == (
+        "Scraper",
+        "Chile",
+        "run-1",
+    )
+    assert (step["step"], step["duration"]) == ("login", 1.5)
+    assert failure["entity"] == log.APP_NAME and "run_id" not in failure
+    assert "ValueError: boom" in failure["exception"]
+
+
 @pytest.mark.parametrize(
     "expected_loglevel, loglevel_env",
     (
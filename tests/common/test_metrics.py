@@ -0,0 +1,84 @@
+import math
+
+import pytest
+
+from vigilant.common import metrics
+from vigilant.common.metrics import MetricsRegistry
+
+
+def test_counter() -> None:
+    registry = MetricsRegistry()
+    runs = registry.counter("runs_total", "Runs", ("outcome",))
+
+    runs.inc(outcome="succeeded")
+    runs.inc(2, outcome="failed")
+
+    assert registry.counter("runs_total", "Runs", ("outcome",)) is runs
+    assert runs.value(outcome="failed") == 2
+    assert registry.render() == (
+        "# HELP runs_total Runs\n"
+        "# TYPE runs_total counter\n"
+        'runs_total{outcome="succeeded"} 1\n'
+        'runs_total{outcome="failed"} 2\n'
+    )
+
+
+def test_histogram() -> None:
+    registry = MetricsRegistry()
+    latency = registry.histogram("latency_seconds", "Latency", buckets=(1.0, 0.1))
+
+    latency.observe(0.05)
+    latency.observe(0.5)
+    latency.observe(2.5)
+    with latency.time():
+        pass
+
+    assert latency.count() == 4
+    assert registry.render().splitlines()[2:] == [
+        'latency_seconds_bucket{le="0.1"} 2',
+        'latency_seconds_bucket{le="1"} 3',
+        'latency_seconds_bucket{le="+Inf"} 4',
+        f"latency_seconds_sum {latency._series[()].sum!r}",
+        "latency_seconds_count 4",
+    ]
+
+
+def test_labels_escaped() -> None:
+    registry = MetricsRegistry()
+    registry.counter("errors_total", "Errors", ("error",)).inc(error='a "b"\n\\')
+
+    assert 'errors_total{error="a \\"b\\"\\n\\\\"} 1' in registry.render()
+
+
+def test_invalid_labels() -> None:
+    registry = MetricsRegistry()
+    counter = registry.counter("runs_total", "Runs", ("outcome",))
+
+    with pytest.raises(ValueError):
+        counter.inc(step="login")
+
+    with pytest.raises(ValueError):
+        registry.histogram("runs_total", "Runs")
+
+
+def test_reset() -> None:
+    registry = MetricsRegistry()
+    registry.counter("runs_total", "Runs").inc()
+    registry.histogram("latency_seconds", "Latency").observe(1)
+
+    registry.reset()
+
+    assert registry.render() == (
+        "# HELP latency_seconds Latency\n"
+        "# TYPE latency_seconds histogram\n"
+        "# HELP runs_total Runs\n"
+        "# TYPE runs_total counter\n"
+    )
+
+
+@pytest.mark.parametrize(
+    "value, rendered",
+    [(1.0, "1"), (0.25, "0.25"), (math.inf, "+Inf"), (-math.inf, "-Inf")],
+)
+def test_number(value: float, rendered: str) -> None:
+    assert metrics._number(value) == rendered
@@ -0,0 +1,101 @@
+import threading
+from contextlib import suppress
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from vigilant.common.exceptions import AttachedRunFailed
+from vigilant.common.singleflight import SingleFlight
+
+
+@pytest.fixture
+def pipeline(tmp_path: Path) -> SingleFlight:
+    return SingleFlight(tmp_path / "run.lock", tmp_path / "run.json")
+
+
+def attach_during(
+    pipeline: SingleFlight, task_error: Exception | None = None
+) -> tuple[mock.Mock, list, list[str]]:
+    """Run a slow task in a thread and attach to it from a second one"""
+    started, attached, release = threading.Event(), threading.Event(), threading.Event()
+    run_ids: list[str] = []
+
+    def task(run_id: str) -> None:
+        run_ids.append(run_id)
+        started.set()
+        release.wait(5)
+        if task_error:
+            raise task_error
+
+    follower_task = mock.Mock()
+    outcomes: list = []
+
+    def follow() -> None:
+        try:
+            outcomes.append(pipeline.run(follower_task))
+        except AttachedRunFailed as e:
+            outcomes.append(e)
+
+    def lead() -> None:
+        with suppress(ValueError):
+            pipeline.run(task)
+
+    leader = threading.Thread(target=lead)
+    leader.start()
+    started.wait(5)
+
+    follower = threading.Thread(target=follow)
+    with mock.patch("vigilant.common.singleflight.logger") as mock_logger:
+        mock_logger.info.side_effect = lambda *_: attached.set()
+        follower.start()
+        assert attached.wait(5)
+    release.set()
+
+    leader.join(5)
+    follower.join(5)
+
+    return follower_task, outcomes, run_ids
+
+
+def test_run(pipeline: SingleFlight) -> None:
+    task = mock.Mock()
+
+    result = pipeline.run(task)
+
+    task.assert_called_once_with(result.run_id)
+    assert result.succeeded
+    assert pipeline.lock_path.read_text() == result.run_id
+    assert pipeline.result_path.is_file()
+
+
+def test_run_failed(pipeline: SingleFlight) -> None:
+    with pytest.raises(ValueError):
+        pipeline.run(mock.Mock(side_effect=ValueError("boom")))
+
+    assert '"error":"boom"' in pipeline.result_path.read_text()
+
+
+def test_attach(pipeline: SingleFlight) -> None:
+    follower_task, outcomes, run_ids = attach_during(pipeline)
+
+    follower_task.assert_not_called()
+    assert outcomes[0].succeeded
+    assert outcomes[0].run_id == run_ids[0] == pipeline.lock_path.read_text()
+
+
+def test_attach_failed(pipeline: SingleFlight) -> None:
+    follower_task, outcomes, _ = attach_during(pipeline, ValueError("boom"))
+
+    follower_task.assert_not_called()
+    assert isinstance(outcomes[0], AttachedRunFailed)
+    assert "boom" in str(outcomes[0])
+
+
+def test_attach_without_result(pipeline: SingleFlight) -> None:
+    pipeline.result_path.write_text("{}")
+
+    with mock.patch.object(pipeline, "_save", side_effect=lambda result: result):
+        _, outcomes, _ = attach_during(pipeline)
+
+    assert "no result was recorded" in str(outcomes[0])
@@ -1,19 +1,43 @@
+import threading
 from unittest import mock
 
+import pytest
+from gspread.exceptions import APIError
+
 from vigilant.common import spreadsheet
 
 
-@mock.patch("vigilant.common.spreadsheet.google.auth")
-@mock.patch("vigilant.common.spreadsheet.gspread")
-def test_load(mock_gspread: mock.MagicMock, mock_google_auth: mock.MagicMock) -> None:
-    mock_google_auth.default.return_value = ("A", "B")
+@pytest.fixture(autouse=True)
+def sheets_client(monkeypatch: pytest.MonkeyPatch) -> spreadsheet.SheetsClient:
+    client = spreadsheet.SheetsClient(requests_per_minute=6000, backoff_base=0.001)
+    monkeypatch.setattr("vigilant.common.spreadsheet.sheets_client", client)
+
+    return client
+
+
+def mock_worksheet_of(title: str, **kwargs) -> mock.MagicMock:
+    worksheet = mock.MagicMock(**kwargs)
+    worksheet.title = title
+
+    return worksheet
+
+
+def api_error(code: int) -> APIError:
+    response = mock.MagicMock()
+    response.json.return_value = {"error": {"code": code, "message": "Error"}}
+
+    return APIError(response)
+
+
+@mock.patch("vigilant.common.spreadsheet.google_clients")
+def test_load(mock_google_clients: mock.MagicMock) -> None:
     spreadsheet_key = "ABC123"
 
     spreadsheet.SpreadSheet.load(spreadsheet_key)
 
-    mock_google_auth.default.assert_called_once()
-    mock_gspread.authorize.assert_called_once_with("A")
-    mock_gspread.authorize().open_by_key.assert_called_once_with(spreadsheet_key)
+    mock_google_clients.sheets.return_value.open_by_key.assert_called_once_with(
+        spreadsheet_key
+    )
 
 
 def test_read() -> None:
@@ -21,11 +45,11 @@ def test_read() -> None:
     mock_range = "Defeat"
     mock_data = [["A"], ["B"], ["C"]]
 
-    mock_worksheet = mock.MagicMock()
+    mock_worksheet = mock_worksheet_of(mock_title)
     mock_worksheet.get.return_value = mock_data
 
     _mock_spreadsheet = mock.MagicMock()
-    _mock_spreadsheet.worksheet.return_value = mock_worksheet
+    _mock_spreadsheet.worksheets.return_value = [mock_worksheet]
 
     data: list[list[str]] = spreadsheet.SpreadSheet(_mock_spreadsheet).read(
         mock_title, mock_range
@@ -33,22 +57,34 @@ def test_read() -> None:
 
     assert data == mock_data
 
-    _mock_spreadsheet.worksheet.assert_called_once_with(mock_title)
+    _mock_spreadsheet.worksheets.assert_called_once()
     mock_worksheet.get.assert_called_once_with(mock_range)
 
 
+def test_read_unformatted() -> None:
+    mock_worksheet = mock_worksheet_of("Expenses")
+    _mock_spreadsheet = mock.MagicMock()
+    _mock_spreadsheet.worksheets.return_value = [mock_worksheet]
+
+    spreadsheet.SpreadSheet(_mock_spreadsheet).read("Expenses", "B3:F4", True)
+
+    mock_worksheet.get.assert_called_once_with(
+        "B3:F4", value_render_option=spreadsheet.ValueRenderOption.unformatted
+    )
+
+
 def test_write() -> None:
     mock_title = "Hesitation"
     mock_range = "Defeat"
     mock_data = [["A"], ["B"], ["C"]]
 
-    mock_worksheet = mock.MagicMock()
+    mock_worksheet = mock_worksheet_of(mock_title)
     _mock_spreadsheet = mock.MagicMock()
-    _mock_spreadsheet.worksheet.return_value = mock_worksheet
+    _mock_spreadsheet.worksheets.return_value = [mock_worksheet]
 
     spreadsheet.SpreadSheet(_mock_spreadsheet).write(mock_title, mock_range, mock_data)
 
-    _mock_spreadsheet.worksheet.assert_called_once_with(mock_title)
+    _mock_spreadsheet.worksheets.assert_called_once()
     mock_worksheet.update.assert_called_once_with(mock_data, mock_range)
 
 
@@ -56,13 +92,13 @@ def test_format_currency() -> None:
     mock_title = "Expenses"
     mock_range = "A1:A10"
 
-    mock_worksheet = mock.MagicMock()
+    mock_worksheet = mock_worksheet_of(mock_title)
     _mock_spreadsheet = mock.MagicMock()
-    _mock_spreadsheet.worksheet.return_value = mock_worksheet
+    _mock_spreadsheet.worksheets.return_value = [mock_worksheet]
 
     spreadsheet.SpreadSheet(_mock_spreadsheet).format_currency(mock_title, mock_range)
 
-    _mock_spreadsheet.worksheet.assert_called_once_with(mock_title)
+    _mock_spreadsheet.worksheets.assert_called_once()
     mock_worksheet.batch_format.assert_called_once_with(
         [
             {
@@ -76,3 +112,210 @@ def test_format_currency() -> None:
             }
         ]
     )
+
+
+def test_worksheet_cached() -> None:
+    _mock_spreadsheet = mock.MagicMock()
+    _mock_spreadsheet.worksheets.return_value = [
+        mock_worksheet_of("Gastos", id=42, row_count=100)
+    ]
+    sheet = spreadsheet.SpreadSheet(_mock_spreadsheet)
+
+    sheet.read("Gastos", "A1")
+    sheet.ensure_rows("Gastos", 1)
+    sheet.write("Gastos", "A1", [["A"]])
+
+    assert sheet.worksheet_id("Gastos") == 42
+    _mock_spreadsheet.worksheet.assert_not_called()
+    _mock_spreadsheet.worksheets.assert_called_once()
+
+
+def test_worksheet_not_found() -> None:
+    _mock_spreadsheet = mock.MagicMock()
+    _mock_spreadsheet.worksheets.return_value = [mock_worksheet_of("Gastos")]
+
+    with pytest.raises(spreadsheet.gspread.WorksheetNotFound):
+        spreadsheet.SpreadSheet(_mock_spreadsheet).read("Data", "A1")
+
+
+def test_batch() -> None:
+    mock_worksheet = mock_worksheet_of("Gastos", id=42)
+    _mock_spreadsheet = mock.MagicMock()
+    _mock_spreadsheet.worksheets.return_value = [mock_worksheet]
+
+    sheet = spreadsheet.SpreadSheet(_mock_spreadsheet)
+    with sheet.batch() as batch:
+        batch.write("Gastos", "J2", [[1000]])
+        batch.write("Gastos", "B3", [["A"], ["B"]])
+        batch.format_currency("Gastos", "F3:F4")
+        batch.format_currency("Gastos", "J2")
+
+    _mock_spreadsheet.worksheet.assert_not_called()
+    _mock_spreadsheet.worksheets.assert_called_once()
+    _mock_spreadsheet.values_batch_update.assert_called_once_with(
+        {
+            "valueInputOption": "RAW",
+            "data": [
+                {"range": "'Gastos'!J2", "values": [[1000]]},
+                {"range": "'Gastos'!B3", "values": [["A"], ["B"]]},
+            ],
+        }
+    )
+
+    requests: list[dict] = _mock_spreadsheet.batch_update.call_args.args[0]["requests"]
+    assert len(requests) == 2
+    assert requests[0]["repeatCell"] == {
+        "range": {
+            "sheetId": 42,
+            "startRowIndex": 2,
+            "endRowIndex": 4,
+            "startColumnIndex": 5,
+            "endColumnIndex": 6,
+        },
+        "cell": {"userEnteredFormat": spreadsheet.CURRENCY_FORMAT},
+        "fields": "userEnteredFormat(numberFormat)",
+    }
+    assert batch.clears == batch.values == batch.formats == []
+
+
+def test_batch_empty() -> None:
+    _mock_spreadsheet = mock.MagicMock()
+
+    with spreadsheet.SpreadSheet(_mock_spreadsheet).batch():
+        pass
+
+    _mock_spreadsheet.values_batch_clear.assert_not_called()
+    _mock_spreadsheet.values_batch_update.assert_not_called()
+    _mock_spreadsheet.batch_update.assert_not_called()
+
+
+def test_batch_chunked() -> None:
+    _mock_spreadsheet = mock.MagicMock()
+
+    with spreadsheet.SpreadSheet(_mock_spreadsheet).batch(chunk_rows=2) as batch:
+        batch.write("Gastos", "J2", [[1000]])
+        batch.write("Gastos", "B3:C5", [["A"], ["B"], ["C"]])
+        batch.clear("Gastos", "B6:F")
+
+    _mock_spreadsheet.values_batch_clear.assert_called_once_with(
+        body={"ranges": ["'Gastos'!B6:F"]}
+    )
+    assert [
+        c.args[0]["data"] for c in _mock_spreadsheet.values_batch_update.call_args_list
+    ] == [
+        [{"range": "'Gastos'!J2", "values": [[1000]]}],
+        [{"range": "'Gastos'!B3", "values": [["A"], ["B"]]}],
+        [{"range": "'Gastos'!B5", "values": [["C"]]}],
+    ]
+
+
+def test_ensure_rows() -> None:
+    mock_worksheet = mock_worksheet_of("Gastos", row_count=100)
+    _mock_spreadsheet = mock.MagicMock()
+    _mock_spreadsheet.worksheets.return_value = [mock_worksheet]
+    sheet = spreadsheet.SpreadSheet(_mock_spreadsheet)
+
+    sheet.ensure_rows("Gastos", 50)
+    mock_worksheet.add_rows.assert_not_called()
+
+    sheet.ensure_rows("Gastos", 150)
+    mock_worksheet.add_rows.assert_called_once_with(50)
+
+
+def test_token_bucket(monkeypatch: pytest.MonkeyPatch) -> None:
+    mock_sleep = mock.MagicMock()
+    monkeypatch.setattr("vigilant.common.spreadsheet.time.sleep", mock_sleep)
+    bucket = spreadsheet.TokenBucket(rate=1, capacity=2)
+
+    assert bucket.acquire() == 0
+    assert bucket.acquire() == 0
+    assert bucket.acquire() == pytest.approx(1, abs=0.01)
+    mock_sleep.assert_called_once()
+
+
+def test_sheets_client_retries(sheets_client: spreadsheet.SheetsClient) -> None:
+    request = mock.MagicMock(side_effect=[api_error(429), api_error(503), "data"])
+
+    assert sheets_client.call("write", request) == "data"
+
+    stats = sheets_client.stats()
+    assert request.call_count == 3
+    assert stats.requests == 3
+    assert stats.retries == 2
+    assert set(stats.latency_seconds) == {"write"}
+
+
+def test_sheets_client_throttles(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("vigilant.common.spreadsheet.time.sleep", mock.MagicMock())
+    client = spreadsheet.SheetsClient(requests_per_minute=1)
+
+    client.call("read", lambda: None)
+    client.call("read", lambda: None)
+
+    stats = client.stats()
+    assert stats.throttled == 1
+    assert stats.throttle_seconds > 0
+
+
+def test_sheets_client_gives_up(sheets_client: spreadsheet.SheetsClient) -> None:
+    sheets_client.max_retries = 1
+    request = mock.MagicMock(side_effect=api_error(429))
+    observed: int = spreadsheet.REQUEST_SECONDS.count(operation="give-up")
+
+    with pytest.raises(APIError):
+        sheets_client.call("give-up", request)
+
+    assert request.call_count == 2
+    assert spreadsheet.REQUEST_SECONDS.count(operation="give-up") == observed + 2
+
+
+def test_sheets_client_no_retry_on_client_error(
+    sheets_client: spreadsheet.SheetsClient,
+) -> None:
+    request = mock.MagicMock(side_effect=api_error(400))
+
+    with pytest.raises(APIError):
+        sheets_client.call("write", request)
+
+    request.assert_called_once()
+
+
+def test_sheets_client_coalesces_reads(
+    sheets_client: spreadsheet.SheetsClient,
+) -> None:
+    started, release = threading.Event(), threading.Event()
+
+    def request() -> list[list[str]]:
+        started.set()
+        release.wait(5)
+        return [["A"]]
+
+    follower = mock.MagicMock()
+    results: list = []
+    leader = threading.Thread(
+        target=lambda: results.append(sheets_client.read("key", request))
+    )
+    leader.start()
+    started.wait(5)
+
+    waiter = threading.Thread(
+        target=lambda: results.append(sheets_client.read("key", follower))
+    )
+    waiter.start()
+    while sheets_client.stats().coalesced == 0:
+        pass
+    release.set()
+    leader.join(5)
+    waiter.join(5)
+
+    assert results == [[["A"]], [["A"]]]
+    assert results[0] is not results[1]
+    follower.assert_not_called()
+    assert sheets_client.stats().requests == 1
+
+
+def test_sheets_client_read_error(sheets_client: spreadsheet.SheetsClient) -> None:
+    with pytest.raises(APIError):
+        sheets_client.read("key", mock.MagicMock(side_effect=api_error(404)))
+
+    assert sheets_client.read("key", lambda: "data") == "data"
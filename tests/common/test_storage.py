@@ -3,12 +3,15 @@ from pathlib import Path
 from unittest import mock
 
 import pytest
+from google.api_core.exceptions import NotFound
 
 from vigilant.common.storage import (
     settings,
+    UPLOAD_SECONDS,
     GoogleCloudStorage,
     LocalStorage,
-    clear_resources,
+    StorageLocation,
+    get_storage,
 )
 
 
@@ -26,8 +29,22 @@ def test_local_storage() -> None:
     )
 
 
+def test_local_storage_files(tmp_path: Path) -> None:
+    file_path: str = (tmp_path / "sessions" / "state.bin").as_posix()
+    storage = LocalStorage()
+
+    assert storage.load_file(file_path) is None
+
+    assert storage.save_file(b"state", file_path) == file_path
+    assert storage.load_file(file_path) == b"state"
+
+    storage.delete_file(file_path)
+    storage.delete_file(file_path)
+    assert storage.load_file(file_path) is None
+
+
 class TestGoogleCloudStorage:
-    @mock.patch("vigilant.common.storage.storage")
+    @mock.patch("vigilant.common.storage.google_clients")
     def test_gcs_storage(
         self, gcs_storage: mock.MagicMock, monkeypatch: pytest.MonkeyPatch
     ) -> None:
@@ -38,7 +55,7 @@ class TestGoogleCloudStorage:
         mock_bucket.blob.return_value.upload_from_string = lambda *args, **kwargs: Path(
             image_path
         ).write_bytes(image_data)
-        mock_gcs_client = gcs_storage.Client.return_value
+        mock_gcs_client = gcs_storage.storage.return_value
         mock_gcs_client.bucket.return_value = mock_bucket
 
         monkeypatch.setattr(
@@ -57,6 +74,36 @@ class TestGoogleCloudStorage:
             and image == image_data
         )
 
+    @mock.patch("vigilant.common.storage.google_clients")
+    def test_gcs_storage_files(self, gcs_storage: mock.MagicMock) -> None:
+        mock_blob = gcs_storage.storage.return_value.bucket.return_value.blob
+        mock_blob.return_value.download_as_bytes.return_value = b"state"
+
+        storage = GoogleCloudStorage()
+
+        assert storage.load_file("sessions/state.bin") == b"state"
+        assert storage.save_file(b"state", "sessions/state.bin").endswith(
+            "sessions/state.bin"
+        )
+        storage.delete_file("sessions/state.bin")
+
+        mock_blob.return_value.upload_from_string.assert_called_once_with(
+            b"state", content_type="application/octet-stream"
+        )
+        assert UPLOAD_SECONDS.count() >= 1
+        mock_blob.return_value.delete.assert_called_once()
+
+    @mock.patch("vigilant.common.storage.google_clients")
+    def test_gcs_storage_files_not_found(self, gcs_storage: mock.MagicMock) -> None:
+        mock_blob = gcs_storage.storage.return_value.bucket.return_value.blob
+        mock_blob.return_value.download_as_bytes.side_effect = NotFound("")
+        mock_blob.return_value.delete.side_effect = NotFound("")
+
+        storage = GoogleCloudStorage()
+
+        assert storage.load_file("sessions/state.bin") is None
+        storage.delete_file("sessions/state.bin")
+
     def test_build_object_uri(_, monkeypatch: pytest.MonkeyPatch) -> None:
         bucket_name: str = "app_bucket"
         file_path: str = "path/path/image.png"
@@ -68,21 +115,18 @@ class TestGoogleCloudStorage:
         assert f"{bucket_name}/{file_path}" in object_uri
 
 
-def test_clear_resources(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
-    tmp_data_path: Path = tmp_path / "data"
-    tmp_data_file: Path = tmp_path / "test_file.txt"
-    tmp_data_file.write_text("Hesitation is defeat!")
-
-    tmp_output_path: Path = tmp_path / "output"
-    tmp_output_file: Path = tmp_path / "test_file.txt"
-    tmp_output_file.write_text("Hesitation is defeat!")
-
-    monkeypatch.setattr("vigilant.common.values.IOResources.DATA_PATH", tmp_data_path)
-    monkeypatch.setattr(
-        "vigilant.common.values.IOResources.OUTPUT_PATH", tmp_output_path
-    )
+@pytest.mark.parametrize(
+    "location, expected",
+    [(StorageLocation.GCS, GoogleCloudStorage), (StorageLocation.LOCAL, LocalStorage)],
+)
+@mock.patch("vigilant.common.storage.google_clients", mock.MagicMock())
+def test_get_storage(
+    monkeypatch: pytest.MonkeyPatch, location: str, expected: type
+) -> None:
+    monkeypatch.setattr(settings, "STORAGE_LOCATION", location)
+    get_storage.cache_clear()
 
-    clear_resources()
+    storage = get_storage()
 
-    assert tmp_data_path.exists() and not any(tmp_data_path.iterdir())
-    assert tmp_output_path.exists() and not any(tmp_output_path.iterdir())
+    assert isinstance(storage, expected) and get_storage() is storage
+    get_storage.cache_clear()
@@ -0,0 +1,174 @@
+import contextvars
+import json
+import threading
+from pathlib import Path
+from unittest import mock
+
+import pytest
+import requests
+
+from vigilant.common import tracing
+
+
+@pytest.fixture
+def exporter() -> mock.MagicMock:
+    return mock.MagicMock(spec=tracing.SpanExporter)
+
+
+def test_nested_spans(exporter: mock.MagicMock) -> None:
+    tracer = tracing.Tracer(exporter)
+
+    with tracer.span("run", run_id="1") as root:
+        with tracer.span("collect") as child:
+            child.set_attribute("scrapers", 2)
+            assert tracer.current is child
+
+        exporter.export.assert_not_called()
+
+    assert tracer.current is None
+    (spans,) = exporter.export.call_args.args
+    assert [span.name for span in spans] == ["collect", "run"]
+    assert child.trace_id == root.trace_id and child.parent_id == root.span_id
+    assert root.parent_id is None and root.attributes == {"run_id": "1"}
+    assert child.attributes == {"scrapers": 2} and child.duration >= 0
+
+
+def test_span_error(exporter: mock.MagicMock) -> None:
+    tracer = tracing.Tracer(exporter)
+
+    with pytest.raises(ValueError), tracer.span("run") as span:
+        raise ValueError("boom")
+
+    assert span.error == "ValueError('boom')"
+    exporter.export.assert_called_once_with([span])
+
+
+def test_traced(exporter: mock.MagicMock) -> None:
+    tracer = tracing.Tracer(exporter)
+
+    @tracer.traced(backend="local")
+    def save_image() -> str:
+        return "path"
+
+    assert save_image() == "path"
+
+    (span,) = exporter.export.call_args.args[0]
+    assert span.name.endswith("save_image") and span.attributes == {"backend": "local"}
+
+
+def test_spans_in_other_threads(exporter: mock.MagicMock) -> None:
+    tracer = tracing.Tracer(exporter)
+    children: list[tracing.Span] = []
+
+    def scrap() -> None:
+        with tracer.span("scrap") as span:
+            children.append(span)
+
+    with tracer.span("collect") as root:
+        thread = threading.Thread(target=contextvars.copy_context().run, args=(scrap,))
+        thread.start()
+        thread.join()
+
+    assert children[0].parent_id == root.span_id
+
+
+def test_buffer_full(exporter: mock.MagicMock, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(tracing, "BUFFER_SIZE", 2)
+    tracer = tracing.Tracer(exporter)
+
+    with tracer.span("run"):
+        for _ in range(2):
+            with tracer.span("step"):
+                pass
+
+        exporter.export.assert_called_once()
+
+    assert exporter.export.call_count == 2
+
+
+def test_no_exporter() -> None:
+    tracer = tracing.Tracer()
+
+    with tracer.span("run"):
+        pass
+
+    tracer.flush()
+    assert tracer._buffer == []
+
+
+def test_json_lines_exporter(tmp_path: Path) -> None:
+    path: Path = tmp_path / "traces" / "spans.jsonl"
+    tracer = tracing.Tracer(tracing.JsonLinesExporter(path))
+
+    with tracer.span("run"), tracer.span("collect"):
+        pass
+
+    spans: list[dict] = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [span["name"] for span in spans] == ["collect", "run"]
+    assert spans[0]["parent_id"] == spans[1]["span_id"]
+
+
+def test_otlp_exporter() -> None:
+    exporter = tracing.OtlpExporter("http://collector:4318/")
+    span = tracing.Span(
+        name="sheets.write",
+        parent_id="00f067aa0ba902b7",
+        end_ns=2,
+        start_ns=1,
+        attributes={"attempts": 2, "ok": True, "ratio": 0.5, "op": "write"},
+        error="APIError()",
+    )
+
+    with mock.patch.object(exporter, "_session") as session:
+        exporter.export([span])
+
+    assert session.post.call_args.args == ("http://collector:4318/v1/traces",)
+    (otlp_span,) = session.post.call_args.kwargs["json"]["resourceSpans"][0][
+        "scopeSpans"
+    ][0]["spans"]
+    assert otlp_span["parentSpanId"] == "00f067aa0ba902b7"
+    assert otlp_span["status"] == {"code": 2, "message": "APIError()"}
+    assert otlp_span["startTimeUnixNano"] == "1"
+    assert otlp_span["attributes"] == [
+        {"key": "attempts", "value": {"intValue": "2"}},
+        {"key": "ok", "value": {"boolValue": True}},
+        {"key": "ratio", "value": {"doubleValue": 0.5}},
+        {"key": "op", "value": {"stringValue": "write"}},
+    ]
+
+
+def test_otlp_exporter_failure() -> None:
+    exporter = tracing.OtlpExporter("http://collector:4318")
+    span = tracing.Span(name="run", end_ns=1)
+
+    with (
+        mock.patch.object(exporter, "_session") as session,
+        mock.patch("vigilant.common.tracing.logger") as mock_logger,
+    ):
+        session.post.side_effect = requests.ConnectionError
+        exporter.export([span])
+
+    mock_logger.warning.assert_called_once()
+    assert tracing.OtlpExporter.payload([span])["resourceSpans"][0]["scopeSpans"][0][
+        "spans"
+    ][0]["status"] == {"code": 1}
+
+
+@pytest.mark.parametrize(
+    "otlp_endpoint, traces_path, exporter",
+    [
+        ("http://collector:4318", "spans.jsonl", tracing.OtlpExporter),
+        (None, "spans.jsonl", tracing.JsonLinesExporter),
+        (None, None, type(None)),
+    ],
+)
+def test_build_exporter(
+    monkeypatch: pytest.MonkeyPatch,
+    otlp_endpoint: str | None,
+    traces_path: str | None,
+    exporter: type,
+) -> None:
+    monkeypatch.setattr("vigilant.common.values.settings.OTLP_ENDPOINT", otlp_endpoint)
+    monkeypatch.setattr("vigilant.common.values.settings.TRACES_PATH", traces_path)
+
+    assert isinstance(tracing._build_exporter(), exporter)
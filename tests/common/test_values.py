@@ -0,0 +1,63 @@
+from collections.abc import Generator
+from pathlib import Path
+from unittest import mock
+
+import pytest
+from pydantic_settings import SettingsConfigDict
+
+from vigilant.common import values
+from vigilant.common.values import VigilantSettings
+
+
+class FirstSettings(VigilantSettings):
+    FIRST: str = "default"
+    NAMES: list[str] = []
+
+
+class SecondSettings(VigilantSettings):
+    model_config = SettingsConfigDict(env_prefix="SECOND_")
+
+    VALUE: str = "default"
+
+
+@pytest.fixture
+def env_file(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Generator[Path]:
+    monkeypatch.chdir(tmp_path)
+    values._read_env_file.cache_clear()
+    yield tmp_path / ".env"
+    values._read_env_file.cache_clear()
+
+
+def test_env_file_read_once(env_file: Path) -> None:
+    env_file.write_text("FIRST=from_file\nSECOND_VALUE=also_from_file\n")
+
+    with mock.patch(
+        "vigilant.common.values.dotenv_values", wraps=values.dotenv_values
+    ) as dotenv_values:
+        first, second = FirstSettings(), SecondSettings()
+        FirstSettings()
+
+    dotenv_values.assert_called_once()
+    assert first.FIRST == "from_file" and second.VALUE == "also_from_file"
+
+
+def test_env_file_values(env_file: Path) -> None:
+    env_file.write_text('first=lower_case\nNAMES=["a", "b"]\nVALUE=no_prefix\n')
+
+    first, second = FirstSettings(), SecondSettings()
+
+    assert first.FIRST == "lower_case" and first.NAMES == ["a", "b"]
+    assert second.VALUE == "default"
+
+
+def test_env_file_missing(env_file: Path) -> None:
+    assert FirstSettings().FIRST == "default"
+
+
+def test_environment_overrides_env_file(
+    env_file: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    env_file.write_text("FIRST=from_file\n")
+    monkeypatch.setenv("FIRST", "from_environment")
+
+    assert FirstSettings().FIRST == "from_environment"
@@ -0,0 +1,75 @@
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from vigilant.common import workspace as ws
+from vigilant.common.workspace import Workspace
+
+
+@pytest.fixture
+def runs_path(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> Path:
+    monkeypatch.setattr("vigilant.common.values.IOResources.RUNS_PATH", tmp_path)
+
+    return tmp_path
+
+
+def test_create(runs_path: Path) -> None:
+    workspace = Workspace.create()
+
+    assert workspace.root == runs_path / workspace.run_id
+    assert workspace.data_path.is_dir() and workspace.output_path.is_dir()
+    assert Workspace.open(workspace.run_id) == workspace
+
+
+def test_collect_garbage(runs_path: Path) -> None:
+    now: float = time.time()
+    for age, run_id in enumerate(["new", "mid", "old", "older"]):
+        Workspace.create(run_id)
+        os.utime(runs_path / run_id, (now - age * 60, now - age * 60))
+    os.utime(runs_path / "older", (now - 3600, now - 3600))
+
+    deleted = ws.collect_garbage(keep={"old"}, max_age=600, max_count=2)
+
+    assert deleted == [runs_path / "older"]
+    assert sorted(p.name for p in runs_path.iterdir()) == ["mid", "new", "old"]
+
+    ws.collect_garbage_in_background(keep={"mid"}, max_age=600, max_count=1).join(5)
+
+    assert sorted(p.name for p in runs_path.iterdir()) == ["mid", "new"]
+
+
+def test_collect_garbage_without_runs(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    monkeypatch.setattr(
+        "vigilant.common.values.IOResources.RUNS_PATH", tmp_path / "runs"
+    )
+
+    assert ws.collect_garbage() == []
+
+
+def test_write_atomic(tmp_path: Path) -> None:
+    path: Path = tmp_path / "output.json"
+    path.write_text("old")
+
+    ws.write_atomic(path, "new")
+
+    assert path.read_text() == "new"
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_write_atomic_failure(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    path: Path = tmp_path / "output.json"
+    path.write_text("old")
+
+    def replace(*_):
+        raise OSError("No space left on device")
+
+    monkeypatch.setattr(ws.os, "replace", replace)
+    with pytest.raises(OSError):
+        ws.write_atomic(path, b"new")
+
+    assert path.read_text() == "old"
+    assert list(tmp_path.iterdir()) == [path]
@@ -1,8 +1,18 @@
+from pathlib import Path
 from unittest import mock
 
 import pytest
 
+from vigilant.common.workspace import Workspace
+
 
 @pytest.fixture
 def mock_page() -> mock.MagicMock:
     return mock.MagicMock()
+
+
+@pytest.fixture
+def workspace(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> Workspace:
+    monkeypatch.setattr("vigilant.common.values.IOResources.RUNS_PATH", tmp_path)
+
+    return Workspace.create("test")
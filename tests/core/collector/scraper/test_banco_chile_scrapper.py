@@ -4,9 +4,10 @@ from typing import Any
 from unittest import mock
 
 import pytest
-import pandas as pd
 from playwright.sync_api import TimeoutError
 
+from vigilant.common.workspace import Workspace
+from vigilant.core.collector.scraper.parser import XLSX_SIGNATURE
 from vigilant.core.collector.scraper import BancoChileScraper
 from vigilant.core.collector.scraper.banco_chile.values import IOResources
 
@@ -23,7 +24,7 @@ def mock_bank_chile_no_transactions_data() -> dict:
     )
 
 
-@mock.patch("vigilant.core.collector.scraper.BancoChileScraper._login")
+@mock.patch("vigilant.core.collector.scraper.BancoChileScraper.authenticate")
 @mock.patch("vigilant.core.collector.scraper.BancoChileScraper._get_current_amount")
 @mock.patch(
     "vigilant.core.collector.scraper.BancoChileScraper._get_credit_transactions"
@@ -33,19 +34,20 @@ def test_navigate(
     _save: mock.MagicMock,
     _get_credit_transactions: mock.MagicMock,
     _get_current_amount: mock.MagicMock,
-    _login: mock.MagicMock,
+    authenticate: mock.MagicMock,
     mock_page: mock.MagicMock,
+    workspace: Workspace,
 ) -> None:
-    BancoChileScraper(mock_page).navigate()
+    BancoChileScraper(mock_page, workspace).navigate()
 
     _save.assert_called_once()
-    _login.assert_called_once()
+    authenticate.assert_called_once()
     _get_current_amount.assert_called_once()
     _get_credit_transactions.assert_called_once()
 
 
-def test_login(mock_page: mock.MagicMock) -> None:
-    BancoChileScraper(mock_page)._login()
+def test_login(mock_page: mock.MagicMock, workspace: Workspace) -> None:
+    BancoChileScraper(mock_page, workspace)._login()
 
     mock_page.goto.assert_called_once()
     mock_page.locator().fill.assert_called()
@@ -53,9 +55,7 @@ def test_login(mock_page: mock.MagicMock) -> None:
     mock_page.wait_for_url.assert_called_once()
 
 
-def test_get_current_amount(
-    mock_page: mock.MagicMock,
-) -> None:
+def test_get_current_amount(mock_page: mock.MagicMock, workspace: Workspace) -> None:
     mock_formatted_amount: str = " $1.000"
     mock_amount: int = 1000
 
@@ -63,31 +63,49 @@ def test_get_current_amount(
         mock_formatted_amount
     )
 
-    scraper = BancoChileScraper(mock_page)
+    scraper = BancoChileScraper(mock_page, workspace)
     scraper._get_current_amount()
 
     assert scraper.amount == mock_amount
 
 
-def test_get_credit_transactions(tmp_path: Path, mock_page: mock.MagicMock) -> None:
-    (tmp_path / IOResources.TRANSACTIONS_FILENAME).write_text("Hesitation is defeat!")
-
-    mock_download_info = mock.MagicMock()
-    mock_page.expect_download.return_value.__enter__.return_value = mock_download_info
-
-    scraper = BancoChileScraper(mock_page)
-    scraper.data_path = tmp_path
+def test_get_credit_transactions(
+    mock_page: mock.MagicMock, workspace: Workspace
+) -> None:
+    scraper = BancoChileScraper(mock_page, workspace)
 
-    scraper._get_credit_transactions()
+    with mock.patch.object(scraper, "_download_statement") as _download_statement:
+        scraper._get_credit_transactions()
 
     mock_page.goto.assert_called_once()
     mock_page.locator().click.assert_called()
-    mock_download_info.value.save_as.assert_called_once_with(
-        tmp_path / IOResources.TRANSACTIONS_FILENAME
+    _download_statement.assert_called_once_with(
+        mock.ANY, IOResources.TRANSACTIONS_FILENAME
     )
 
 
-def test_get_credit_transactions_empty(mock_page: mock.MagicMock) -> None:
+def test_get_credit_transactions_export(
+    mock_page: mock.MagicMock, monkeypatch: pytest.MonkeyPatch, workspace: Workspace
+) -> None:
+    monkeypatch.setattr(
+        "vigilant.core.collector.scraper.banco_chile.scraper.secrets.EXPORT_URL",
+        "https://chile.example.com/export",
+    )
+    mock_page.context.request.get.return_value.body.return_value = (
+        XLSX_SIGNATURE + b"statement"
+    )
+
+    scraper = BancoChileScraper(mock_page, workspace)
+    scraper._get_credit_transactions()
+
+    assert scraper.statement == XLSX_SIGNATURE + b"statement"
+    mock_page.goto.assert_not_called()
+    mock_page.expect_download.assert_not_called()
+
+
+def test_get_credit_transactions_empty(
+    mock_page: mock.MagicMock, workspace: Workspace
+) -> None:
     mock_click = mock.MagicMock()
     mock_click.side_effect = TimeoutError("")
     mock_locator = mock.MagicMock()
@@ -95,7 +113,7 @@ def test_get_credit_transactions_empty(mock_page: mock.MagicMock) -> None:
     mock_locator.click = mock_click
     mock_page.locator.return_value = mock_locator
 
-    scraper = BancoChileScraper(mock_page)
+    scraper = BancoChileScraper(mock_page, workspace)
 
     scraper._get_credit_transactions()
 
@@ -104,23 +122,19 @@ def test_get_credit_transactions_empty(mock_page: mock.MagicMock) -> None:
     mock_page.locator().wait_for.assert_called_once()
 
 
-@mock.patch("vigilant.core.collector.scraper.banco_chile.scraper.SpreadSheet")
-@mock.patch("vigilant.core.collector.scraper.banco_chile.scraper.pd.read_excel")
+@mock.patch(
+    "vigilant.core.collector.scraper.BancoChileScraper._get_payment_descriptions"
+)
+@mock.patch("vigilant.core.collector.scraper.scraper.get_parser")
 def test_save(
-    mock_pd_read_excel: mock.MagicMock,
-    MockSpreadSheet: mock.MagicMock,
+    mock_get_parser: mock.MagicMock,
+    _get_payment_descriptions: mock.MagicMock,
     tmp_path: Path,
-    tmp_path_factory: pytest.TempPathFactory,
     monkeypatch: pytest.MonkeyPatch,
     mock_page: mock.MagicMock,
     mock_bank_chile_data: dict,
+    workspace: Workspace,
 ) -> None:
-    mock_data_path: Path = tmp_path_factory.mktemp("data")
-    (mock_data_path / IOResources.TRANSACTIONS_FILENAME).write_text(
-        "Hesitation is defeat!"
-    )
-
-    mock_cols_keys: tuple[str] = ("date", "description", "location", "amount")
     mock_cols_index: tuple[str] = (1, 4, 6, 10)
 
     mock_data: list[list[Any]] = [
@@ -129,42 +143,30 @@ def test_save(
         ["24/12/1999", "Food", None, 40000],
         ["04/12/1999", "Pago Pesos TAR", "Santiago", -88000],
     ]
-    mock_data_df = pd.DataFrame(mock_data, columns=mock_cols_keys)
 
-    mock_payment_description: list[list[str]] = [
-        ["TEF PAGO NORMAL"],
-        ["Pago Pesos TAR"],
+    mock_payment_description: list[str] = [
+        "TEF PAGO NORMAL",
+        "Pago Pesos TAR",
     ]
 
-    mock_pd_read_excel.return_value = mock_data_df
+    mock_get_parser.return_value.read.return_value = mock_data
 
-    mock_spreadsheet = mock.MagicMock()
-    mock_spreadsheet.read.return_value = mock_payment_description
-    MockSpreadSheet.load.return_value = mock_spreadsheet
+    _get_payment_descriptions.return_value = mock_payment_description
 
-    monkeypatch.setattr(
-        "vigilant.common.values.IOResources.OUTPUT_PATH",
-        tmp_path,
-    )
-    monkeypatch.setattr(
-        "vigilant.core.collector.scraper.banco_chile.values.IOResources.OUTPUT_FILENAME",
-        "bank_data.json",
-    )
+    monkeypatch.setattr(BancoChileScraper, "output_filename", "bank_data.json")
 
-    scraper = BancoChileScraper(mock_page)
-    scraper.data_path = mock_data_path
+    scraper = BancoChileScraper(mock_page, workspace)
+    scraper.statement = b"Hesitation is defeat!"
     scraper.amount = 123456
 
     scraper._save()
 
-    bank_output: dict = json.loads(Path(tmp_path / "bank_data.json").read_text())
+    bank_output: dict = json.loads(
+        (workspace.output_path / "bank_data.json").read_text()
+    )
 
-    mock_pd_read_excel.assert_called_once_with(
-        mock_data_path / IOResources.TRANSACTIONS_FILENAME,
-        sheet_name=0,
-        header=17,
-        names=mock_cols_keys,
-        usecols=mock_cols_index,
+    mock_get_parser.return_value.read.assert_called_once_with(
+        b"Hesitation is defeat!", header=17, usecols=mock_cols_index
     )
     assert bank_output == mock_bank_chile_data
 
@@ -174,22 +176,17 @@ def test_save_no_transactions(
     monkeypatch: pytest.MonkeyPatch,
     mock_page: mock.MagicMock,
     mock_bank_chile_no_transactions_data: dict,
+    workspace: Workspace,
 ) -> None:
-    monkeypatch.setattr(
-        "vigilant.common.values.IOResources.OUTPUT_PATH",
-        tmp_path,
-    )
-    monkeypatch.setattr(
-        "vigilant.core.collector.scraper.banco_chile.values.IOResources.OUTPUT_FILENAME",
-        "bank_data.json",
-    )
+    monkeypatch.setattr(BancoChileScraper, "output_filename", "bank_data.json")
 
-    scraper = BancoChileScraper(mock_page)
-    scraper.data_path = Path("/")
+    scraper = BancoChileScraper(mock_page, workspace)
     scraper.amount = 123456
 
     scraper._save()
 
-    bank_output: dict = json.loads(Path(tmp_path / "bank_data.json").read_text())
+    bank_output: dict = json.loads(
+        (workspace.output_path / "bank_data.json").read_text()
+    )
 
     assert bank_output == mock_bank_chile_no_transactions_data
@@ -1,12 +1,18 @@
 import json
+from datetime import datetime
 from pathlib import Path
 from typing import Any
 from unittest import mock
 
-import pandas as pd
 import pytest
 
-from vigilant.core.collector.scraper.banco_falabella.values import Locators, IOResources
+from vigilant.common.workspace import Workspace
+from vigilant.core.collector.scraper.parser import XLSX_SIGNATURE
+from vigilant.core.collector.scraper.banco_falabella.values import (
+    secrets,
+    Locators,
+    IOResources,
+)
 from vigilant.core.collector.scraper import BancoFalabellaScraper
 
 
@@ -15,7 +21,7 @@ def mock_bank_falabella_data() -> dict:
     return json.loads(Path("tests/resources/bank_falabella.json").read_text())
 
 
-@mock.patch("vigilant.core.collector.scraper.BancoFalabellaScraper._login")
+@mock.patch("vigilant.core.collector.scraper.BancoFalabellaScraper.authenticate")
 @mock.patch(
     "vigilant.core.collector.scraper.BancoFalabellaScraper._get_credit_transactions"
 )
@@ -23,17 +29,18 @@ def mock_bank_falabella_data() -> dict:
 def test_navigate(
     _save: mock.MagicMock,
     _get_credit_transactions: mock.MagicMock,
-    _login: mock.MagicMock,
+    authenticate: mock.MagicMock,
     mock_page: mock.MagicMock,
+    workspace: Workspace,
 ) -> None:
-    BancoFalabellaScraper(mock_page).navigate()
+    BancoFalabellaScraper(mock_page, workspace).navigate()
 
     _save.assert_called_once()
-    _login.assert_called_once()
+    authenticate.assert_called_once()
     _get_credit_transactions.assert_called_once()
 
 
-def test_login(mock_page: mock.MagicMock) -> None:
+def test_login(mock_page: mock.MagicMock, workspace: Workspace) -> None:
     mock_login_btn, mock_user_input, mock_password_input, mock_generic_locator = (
         mock.MagicMock(),
         mock.MagicMock(),
@@ -60,7 +67,7 @@ def test_login(mock_page: mock.MagicMock) -> None:
 
     mock_page.locator = mock.MagicMock(side_effect=mock_login_form_locators)
 
-    BancoFalabellaScraper(mock_page)._login()
+    BancoFalabellaScraper(mock_page, workspace)._login()
 
     mock_page.goto.assert_called_once()
     mock_page.wait_for_load_state()
@@ -78,76 +85,94 @@ def test_login(mock_page: mock.MagicMock) -> None:
     mock_page.wait_for_url.assert_called_once()
 
 
-def test_get_credit_transactions(tmp_path: Path, mock_page: mock.MagicMock) -> None:
-    (tmp_path / IOResources.TRANSACTIONS_FILENAME).write_text("Hesitation is defeat!")
-
-    mock_download_info = mock.MagicMock()
-    mock_page.expect_download.return_value.__enter__.return_value = mock_download_info
+def test_get_credit_transactions(
+    mock_page: mock.MagicMock, workspace: Workspace
+) -> None:
+    scraper = BancoFalabellaScraper(mock_page, workspace)
 
-    scraper = BancoFalabellaScraper(mock_page)
-    scraper.data_path = tmp_path
-
-    scraper._get_credit_transactions()
+    with mock.patch.object(scraper, "_download_statement") as _download_statement:
+        scraper._get_credit_transactions()
 
     mock_page.locator().wait_for.assert_called_once()
     mock_page.locator().click.assert_called()
-    mock_download_info.value.save_as.assert_called_once_with(
-        tmp_path / IOResources.TRANSACTIONS_FILENAME
+    mock_page.goto.assert_called_once_with(secrets.HOME_URL)
+    _download_statement.assert_called_once_with(
+        mock.ANY, IOResources.TRANSACTIONS_FILENAME
+    )
+
+
+def test_get_credit_transactions_from_home(
+    mock_page: mock.MagicMock, workspace: Workspace
+) -> None:
+    mock_page.url = secrets.HOME_URL
+    scraper = BancoFalabellaScraper(mock_page, workspace)
+
+    with mock.patch.object(scraper, "_download_statement"):
+        scraper._get_credit_transactions()
+
+    mock_page.goto.assert_not_called()
+
+
+def test_get_credit_transactions_export(
+    mock_page: mock.MagicMock, monkeypatch: pytest.MonkeyPatch, workspace: Workspace
+) -> None:
+    monkeypatch.setattr(
+        "vigilant.core.collector.scraper.banco_falabella.scraper.secrets.EXPORT_URL",
+        "https://falabella.example.com/export",
+    )
+    mock_page.context.request.get.return_value.body.return_value = (
+        XLSX_SIGNATURE + b"statement"
     )
 
+    scraper = BancoFalabellaScraper(mock_page, workspace)
+    scraper._get_credit_transactions()
 
-@mock.patch("vigilant.core.collector.scraper.banco_falabella.scraper.SpreadSheet")
-@mock.patch("vigilant.core.collector.scraper.banco_falabella.scraper.pd.read_excel")
+    assert scraper.statement == XLSX_SIGNATURE + b"statement"
+    mock_page.expect_download.assert_not_called()
+
+
+@mock.patch(
+    "vigilant.core.collector.scraper.BancoFalabellaScraper._get_payment_descriptions"
+)
+@mock.patch("vigilant.core.collector.scraper.scraper.get_parser")
 def test_save(
-    mock_pd_read_excel: mock.MagicMock,
-    MockSpreadSheet: mock.MagicMock,
+    mock_get_parser: mock.MagicMock,
+    _get_payment_descriptions: mock.MagicMock,
     tmp_path: Path,
     monkeypatch: pytest.MonkeyPatch,
     mock_page: mock.MagicMock,
     mock_bank_falabella_data: dict,
+    workspace: Workspace,
 ) -> None:
-    mock_cols_keys: tuple[str] = ("date", "description", "fees", "amount")
     mock_cols_index: tuple[str] = (0, 1, 4, 5)
 
     mock_data: list[list[Any]] = [
-        [pd.to_datetime("1999-12-31"), "Clothes", 0, 25000],
-        [pd.to_datetime("1999-12-04"), "PAGO TARJETA CMR", 0, -120000],
-        [pd.to_datetime("1999-12-24"), "Food", 0, 40000],
-        [pd.to_datetime("1999-12-04"), "Shoes", 4, 33200],
+        [datetime(1999, 12, 31), "Clothes", 0, 25000],
+        [datetime(1999, 12, 4), "PAGO TARJETA CMR", 0, -120000],
+        [datetime(1999, 12, 24), "Food", 0, 40000],
+        [datetime(1999, 12, 4), "Shoes", 4, 33200],
     ]
-    mock_data_df = pd.DataFrame(mock_data, columns=mock_cols_keys)
 
-    mock_payment_description: list[list[str]] = [
-        ["PAGO TARJETA CMR"],
+    mock_payment_description: list[str] = [
+        "PAGO TARJETA CMR",
     ]
 
-    mock_pd_read_excel.return_value = mock_data_df
+    mock_get_parser.return_value.read.return_value = mock_data
 
-    mock_spreadsheet = mock.MagicMock()
-    mock_spreadsheet.read.return_value = mock_payment_description
-    MockSpreadSheet.load.return_value = mock_spreadsheet
+    _get_payment_descriptions.return_value = mock_payment_description
 
-    monkeypatch.setattr(
-        "vigilant.common.values.IOResources.OUTPUT_PATH",
-        tmp_path,
-    )
-    monkeypatch.setattr(
-        "vigilant.core.collector.scraper.banco_falabella.values.IOResources.OUTPUT_FILENAME",
-        "bank_data.json",
-    )
+    monkeypatch.setattr(BancoFalabellaScraper, "output_filename", "bank_data.json")
 
-    scraper = BancoFalabellaScraper(mock_page)
-    scraper.data_path = Path("/")
+    scraper = BancoFalabellaScraper(mock_page, workspace)
+    scraper.statement = b"Hesitation is defeat!"
 
     scraper._save()
 
-    bank_output: dict = json.loads(Path(tmp_path / "bank_data.json").read_text())
+    bank_output: dict = json.loads(
+        (workspace.output_path / "bank_data.json").read_text()
+    )
 
-    mock_pd_read_excel.assert_called_once_with(
-        Path("/", IOResources.TRANSACTIONS_FILENAME),
-        sheet_name=0,
-        header=0,
-        names=mock_cols_keys,
-        usecols=mock_cols_index,
+    mock_get_parser.return_value.read.assert_called_once_with(
+        b"Hesitation is defeat!", header=0, usecols=mock_cols_index
     )
     assert bank_output == mock_bank_falabella_data
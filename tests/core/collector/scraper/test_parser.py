@@ -0,0 +1,73 @@
+from datetime import datetime
+from io import BytesIO
+from unittest import mock
+
+import pytest
+import xlrd
+from openpyxl import Workbook
+
+from vigilant.core.collector.scraper import parser
+
+
+@pytest.fixture
+def statement_xlsx() -> bytes:
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(["Statement"])
+    sheet.append(["Date", "Description", "Ignored", "Amount"])
+    sheet.append([datetime(1999, 12, 31), "Clothes", "x", 25000])
+    sheet.append([None, None, "x", None])
+    sheet.append([])
+    sheet.append([datetime(1999, 12, 24), "Food", None, None])
+    sheet.append([None, None, None, None])
+
+    buffer = BytesIO()
+    workbook.save(buffer)
+    return buffer.getvalue()
+
+
+@pytest.mark.parametrize("engine", ("pandas", "stream"))
+def test_read_xlsx(engine: str, statement_xlsx: bytes) -> None:
+    rows = parser.get_parser(engine).read(statement_xlsx, header=1, usecols=(0, 1, 3))
+
+    assert rows == [
+        [datetime(1999, 12, 31), "Clothes", 25000],
+        [None, None, None],
+        [None, None, None],
+        [datetime(1999, 12, 24), "Food", None],
+    ]
+
+
+@mock.patch("xlrd.open_workbook")
+def test_read_xls(mock_open_workbook: mock.MagicMock) -> None:
+    def cell(ctype: int, value) -> xlrd.sheet.Cell:
+        return xlrd.sheet.Cell(ctype, value)
+
+    mock_book = mock_open_workbook.return_value
+    mock_book.datemode = 0
+    sheet = mock_book.sheet_by_index.return_value
+    sheet_rows = [
+        [cell(xlrd.XL_CELL_TEXT, "Date"), cell(xlrd.XL_CELL_TEXT, "Amount")],
+        [cell(xlrd.XL_CELL_DATE, 36525.0), cell(xlrd.XL_CELL_NUMBER, 100.0)],
+        [cell(xlrd.XL_CELL_EMPTY, ""), cell(xlrd.XL_CELL_BLANK, "")],
+        [cell(xlrd.XL_CELL_TEXT, "31/12/1999")],
+    ]
+    sheet.nrows = len(sheet_rows)
+    sheet.row.side_effect = sheet_rows.__getitem__
+
+    rows = parser.RowStreamParser().read(b"\xd0\xcf\x11\xe0", header=0, usecols=(0, 1))
+
+    assert rows == [
+        [datetime(1999, 12, 31), 100.0],
+        [None, None],
+        ["31/12/1999", None],
+    ]
+    mock_book.release_resources.assert_called_once()
+
+
+def test_get_parser(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("vigilant.common.values.settings.PARSER_ENGINE", "pandas")
+
+    assert isinstance(parser.get_parser(), parser.PandasParser)
+    assert isinstance(parser.get_parser("stream"), parser.RowStreamParser)
+    assert isinstance(parser.get_parser("unknown"), parser.RowStreamParser)
@@ -0,0 +1,85 @@
+import sys
+from importlib.metadata import EntryPoint
+from typing import Type
+from unittest import mock
+
+import pytest
+
+from vigilant.core.collector.scraper import registry
+from vigilant.core.collector.scraper.registry import LOAD_SECONDS, ScraperRegistry
+from vigilant.core.collector.scraper.scraper import Scraper
+
+
+class LocalScraper(Scraper):
+    def navigate(self): ...
+
+    def _login(self): ...
+
+
+LOCAL_PATH: str = f"{__name__}:LocalScraper"
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    LOAD_SECONDS.reset()
+    yield
+    LOAD_SECONDS.reset()
+
+
+def test_get_imports_lazily() -> None:
+    scrapers = ScraperRegistry({"Local": LOCAL_PATH}, group=None)
+
+    with mock.patch.object(
+        registry.importlib, "import_module", return_value=sys.modules[__name__]
+    ) as import_module:
+        assert scrapers.get("Local") is LocalScraper
+        assert scrapers.get("Local") is LocalScraper
+
+    import_module.assert_called_once_with(__name__)
+
+
+def test_get_unknown() -> None:
+    with pytest.raises(KeyError):
+        ScraperRegistry({}, group=None).get("Unknown")
+
+
+def test_load() -> None:
+    scrapers = ScraperRegistry({"Local": LOCAL_PATH}, group=None)
+
+    loaded: list[Type[Scraper]] = scrapers.load([" Local ", "Unknown"])
+
+    assert loaded == [LocalScraper] and LOAD_SECONDS.count() == 1
+
+
+def test_register() -> None:
+    scrapers = ScraperRegistry({}, group=None)
+    scrapers.register("Local", LocalScraper)
+
+    assert scrapers.names == ["Local"] and scrapers.get("Local") is LocalScraper
+
+
+@mock.patch("vigilant.core.collector.scraper.registry.entry_points")
+def test_entry_points(entry_points: mock.MagicMock) -> None:
+    entry_points.return_value = [
+        EntryPoint(name="Local", value=LOCAL_PATH, group="vigilant.scrapers")
+    ]
+    scrapers = ScraperRegistry({"Builtin": LOCAL_PATH})
+
+    assert scrapers.names == ["Builtin", "Local"]
+    assert scrapers.get("Local") is LocalScraper
+    entry_points.assert_called_once_with(group="vigilant.scrapers")
+
+
+def test_builtin_scrapers_not_imported() -> None:
+    scrapers = ScraperRegistry(group=None)
+
+    assert scrapers.names == ["BancoChile", "BancoFalabella"]
+    assert all(isinstance(path, str) for path in scrapers._scrapers.values())
+
+
+def test_package_lazy_attributes() -> None:
+    from vigilant.core.collector import scraper
+
+    assert scraper.BancoChileScraper.__name__ == "BancoChileScraper"
+    with pytest.raises(AttributeError):
+        scraper.MissingScraper
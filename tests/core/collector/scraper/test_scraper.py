@@ -0,0 +1,349 @@
+import logging
+from pathlib import Path
+from typing import Type
+from unittest import mock
+
+import pytest
+from playwright.sync_api import Error as PlaywrightError, TimeoutError
+
+from vigilant.common.cache import ReferenceDataCache
+from vigilant.common.deadline import Deadline
+from vigilant.common.exceptions import DeadlineExceeded
+from vigilant.common.values import balance_spreadsheet
+from vigilant.common.workspace import Workspace
+from vigilant.core.collector.scraper.parser import XLS_SIGNATURE, XLSX_SIGNATURE
+from vigilant.core.collector.scraper.scraper import (
+    STEP_RETRIES,
+    STEP_SECONDS,
+    Scraper,
+    _backoff,
+    step,
+)
+
+
+@pytest.fixture
+def mock_scraper() -> Type[Scraper]:
+    class MockScraper(Scraper):
+        home_url = "https://bank.example.com/home"
+        session_probe = ".amount"
+
+        def navigate(self): ...
+
+        def _login(self): ...
+
+    return MockScraper
+
+
+@pytest.fixture
+def mock_session_cache() -> mock.MagicMock:
+    with mock.patch(
+        "vigilant.core.collector.scraper.scraper.session_cache"
+    ) as mock_session_cache:
+        yield mock_session_cache
+
+
+def test_authenticate_login(
+    mock_scraper: Type[Scraper],
+    mock_session_cache: mock.MagicMock,
+    mock_page: mock.MagicMock,
+    workspace: Workspace,
+) -> None:
+    mock_session_cache.enabled = False
+    scraper = mock_scraper(mock_page, workspace)
+
+    with mock.patch.object(scraper, "_login") as _login:
+        scraper.authenticate()
+
+    _login.assert_called_once()
+    mock_session_cache.save.assert_called_once_with(
+        "MockScraper", mock_page.context.storage_state.return_value
+    )
+
+
+def test_step(
+    mock_scraper: Type[Scraper], mock_page: mock.MagicMock, workspace: Workspace
+) -> None:
+    class StepScraper(mock_scraper):
+        @step("amount")
+        def amount(self) -> int:
+            """Docstring"""
+            return 1
+
+        @step("download")
+        def download(self) -> None:
+            raise TimeoutError("")
+
+    scraper = StepScraper(mock_page, workspace)
+
+    assert scraper.amount() == 1
+    with pytest.raises(TimeoutError):
+        scraper.download()
+
+    assert StepScraper.amount.__doc__ == "Docstring"
+    assert STEP_SECONDS.count(scraper="StepScraper", step="amount") == 1
+    assert STEP_SECONDS.count(scraper="StepScraper", step="download") == 1
+
+
+@mock.patch("vigilant.core.collector.scraper.scraper.time.sleep")
+def test_step_retries(
+    sleep: mock.MagicMock,
+    mock_scraper: Type[Scraper],
+    mock_page: mock.MagicMock,
+    workspace: Workspace,
+) -> None:
+    attempts: list[int] = []
+
+    class RetryScraper(mock_scraper):
+        @step("download", retries=2)
+        def download(self) -> str:
+            attempts.append(len(attempts))
+            if len(attempts) < 3:
+                raise TimeoutError("")
+            return "statement"
+
+        @step("save", retries=2)
+        def save(self) -> None:
+            raise ValueError("Hesitation is defeat!")
+
+    scraper = RetryScraper(mock_page, workspace)
+    retries: float = STEP_RETRIES.value(scraper="RetryScraper", step="download")
+
+    assert scraper.download() == "statement"
+    with pytest.raises(ValueError):
+        scraper.save()
+
+    assert attempts == [0, 1, 2] and sleep.call_count == 2
+    assert STEP_RETRIES.value(scraper="RetryScraper", step="download") == retries + 2
+    assert STEP_RETRIES.value(scraper="RetryScraper", step="save") == 0
+
+
+@mock.patch("vigilant.core.collector.scraper.scraper.time.sleep", mock.MagicMock())
+def test_step_retries_exhausted(
+    mock_scraper: Type[Scraper], mock_page: mock.MagicMock, workspace: Workspace
+) -> None:
+    class RetryScraper(mock_scraper):
+        @step("download", retries=1)
+        def download(self) -> None:
+            mock_page.goto()
+            raise TimeoutError("")
+
+    with pytest.raises(TimeoutError):
+        RetryScraper(mock_page, workspace).download()
+
+    assert mock_page.goto.call_count == 2
+
+
+def test_step_deadline(
+    mock_scraper: Type[Scraper], mock_page: mock.MagicMock, workspace: Workspace
+) -> None:
+    class DeadlineScraper(mock_scraper):
+        @step("download", retries=2)
+        def download(self) -> None:
+            raise TimeoutError("")
+
+    with pytest.raises(DeadlineExceeded):
+        DeadlineScraper(mock_page, workspace, Deadline(0)).download()
+
+    # Backoff delays never fit in the budget left
+    with mock.patch("vigilant.core.collector.scraper.scraper._backoff", return_value=5):
+        with pytest.raises(TimeoutError):
+            DeadlineScraper(mock_page, workspace, Deadline(1)).download()
+
+    mock_page.set_default_timeout.assert_called_once()
+    assert mock_page.set_default_timeout.call_args.args[0] <= 1000.0
+
+
+def test_step_local_past_deadline(
+    mock_scraper: Type[Scraper], mock_page: mock.MagicMock, workspace: Workspace
+) -> None:
+    class LocalScraper(mock_scraper):
+        @step("save", browser=False)
+        def save(self) -> str:
+            return "saved"
+
+    assert LocalScraper(mock_page, workspace, Deadline(0)).save() == "saved"
+    mock_page.set_default_timeout.assert_not_called()
+
+
+@pytest.mark.parametrize("attempt", [0, 3, 10])
+def test_backoff(attempt: int) -> None:
+    assert 0 <= _backoff(attempt) <= min(10.0, 2**attempt)
+
+
+def test_authenticate_cached(
+    mock_scraper: Type[Scraper],
+    mock_session_cache: mock.MagicMock,
+    mock_page: mock.MagicMock,
+    workspace: Workspace,
+) -> None:
+    state: dict = {"cookies": [{"name": "sid"}], "origins": [{"origin": "a"}]}
+    mock_session_cache.load.return_value = state
+    mock_page.context.cookies.return_value = []
+    scraper = mock_scraper(mock_page, workspace)
+
+    with mock.patch.object(scraper, "_login") as _login:
+        scraper.authenticate()
+
+    _login.assert_not_called()
+    mock_page.context.add_cookies.assert_called_once_with(state["cookies"])
+    assert '"origin": "a"' in mock_page.context.add_init_script.call_args.args[0]
+    mock_page.goto.assert_called_once_with(mock_scraper.home_url)
+    mock_page.locator.assert_called_once_with(mock_scraper.session_probe)
+
+
+def test_authenticate_context_logged_in(
+    mock_scraper: Type[Scraper],
+    mock_session_cache: mock.MagicMock,
+    mock_page: mock.MagicMock,
+    workspace: Workspace,
+) -> None:
+    mock_page.context.cookies.return_value = [{"name": "sid"}]
+
+    assert mock_scraper(mock_page, workspace)._restore_session()
+    mock_session_cache.load.assert_not_called()
+
+
+def test_authenticate_no_cached_session(
+    mock_scraper: Type[Scraper],
+    mock_session_cache: mock.MagicMock,
+    mock_page: mock.MagicMock,
+    workspace: Workspace,
+) -> None:
+    mock_session_cache.load.return_value = None
+    mock_page.context.cookies.return_value = []
+
+    assert not mock_scraper(mock_page, workspace)._restore_session()
+    mock_page.goto.assert_not_called()
+
+
+def test_authenticate_expired_session(
+    mock_scraper: Type[Scraper],
+    mock_session_cache: mock.MagicMock,
+    mock_page: mock.MagicMock,
+    workspace: Workspace,
+) -> None:
+    mock_page.context.cookies.return_value = [{"name": "sid"}]
+    mock_page.locator.return_value.first.wait_for.side_effect = TimeoutError("")
+    scraper = mock_scraper(mock_page, workspace)
+
+    with (
+        mock.patch.object(scraper, "_login") as _login,
+        mock.patch(
+            "vigilant.core.collector.scraper.scraper.renew_page"
+        ) as mock_renew_page,
+    ):
+        scraper.authenticate()
+
+    _login.assert_called_once()
+    mock_session_cache.invalidate.assert_called_once_with("MockScraper")
+    mock_renew_page.assert_called_once_with("MockScraper", scraper.routes)
+    assert scraper.page is mock_renew_page.return_value
+
+
+@pytest.mark.parametrize("signature", [XLSX_SIGNATURE, XLS_SIGNATURE])
+def test_fetch_export(
+    mock_scraper: Type[Scraper],
+    mock_page: mock.MagicMock,
+    workspace: Workspace,
+    signature: bytes,
+) -> None:
+    mock_response = mock_page.context.request.get.return_value
+    mock_response.ok = True
+    mock_response.body.return_value = signature + b"statement"
+
+    statement: bytes | None = mock_scraper(mock_page, workspace)._fetch_export(
+        "https://x/e"
+    )
+
+    assert statement == signature + b"statement"
+    mock_page.context.request.get.assert_called_once_with("https://x/e")
+
+
+def test_fetch_export_disabled(
+    mock_scraper: Type[Scraper], mock_page: mock.MagicMock, workspace: Workspace
+) -> None:
+    assert mock_scraper(mock_page, workspace)._fetch_export(None) is None
+    mock_page.context.request.get.assert_not_called()
+
+
+def test_fetch_export_failed(
+    mock_scraper: Type[Scraper], mock_page: mock.MagicMock, workspace: Workspace
+) -> None:
+    mock_page.context.request.get.return_value.ok = False
+    scraper = mock_scraper(mock_page, workspace)
+
+    assert scraper._fetch_export("https://x/e") is None
+
+    mock_page.context.request.get.return_value.ok = True
+    mock_page.context.request.get.return_value.headers = {"content-type": "text/html"}
+    mock_page.context.request.get.return_value.body.return_value = b"<html>"
+
+    assert scraper._fetch_export("https://x/e") is None
+
+    mock_page.context.request.get.side_effect = PlaywrightError("Connection reset")
+
+    assert scraper._fetch_export("https://x/e") is None
+
+
+@pytest.mark.parametrize(
+    "archive, log_level, archived",
+    (
+        pytest.param(False, logging.INFO, False, id="in memory"),
+        pytest.param(True, logging.INFO, True, id="archive enabled"),
+        pytest.param(False, logging.DEBUG, True, id="debugging"),
+    ),
+)
+def test_download_statement(
+    archive: bool,
+    log_level: int,
+    archived: bool,
+    mock_scraper: Type[Scraper],
+    mock_page: mock.MagicMock,
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+    workspace: Workspace,
+) -> None:
+    download_path: Path = tmp_path / "artifact"
+    download_path.write_bytes(b"statement")
+
+    mock_download = mock.MagicMock()
+    mock_download.path.return_value = download_path.as_posix()
+    mock_page.expect_download.return_value.__enter__.return_value.value = mock_download
+    mock_trigger = mock.MagicMock()
+
+    monkeypatch.setattr("vigilant.common.values.settings.ARCHIVE_DOWNLOADS", archive)
+    scraper = mock_scraper(mock_page, workspace)
+    scraper.data_path = tmp_path / "data"
+    monkeypatch.setattr(scraper.logger, "isEnabledFor", lambda lvl: lvl >= log_level)
+
+    scraper._download_statement(mock_trigger, "t.xls")
+
+    mock_trigger.click.assert_called_once()
+    mock_download.delete.assert_called_once()
+    assert scraper.statement == b"statement"
+    assert (tmp_path / "data" / "t.xls").exists() == archived
+
+
+@mock.patch("vigilant.core.collector.scraper.scraper.SpreadSheet")
+def test_get_payment_descriptions(
+    MockSpreadSheet: mock.MagicMock,
+    mock_scraper: Type[Scraper],
+    mock_page: mock.MagicMock,
+    monkeypatch: pytest.MonkeyPatch,
+    workspace: Workspace,
+) -> None:
+    monkeypatch.setattr(
+        "vigilant.core.collector.scraper.scraper.reference_data", ReferenceDataCache()
+    )
+    MockSpreadSheet.load.return_value.read.return_value = [["PAGO"], ["TEF"]]
+
+    assert mock_scraper(mock_page, workspace)._get_payment_descriptions() == [
+        "PAGO",
+        "TEF",
+    ]
+    assert mock_scraper(mock_page, workspace)._get_payment_descriptions() == [
+        "PAGO",
+        "TEF",
+    ]
+
+    MockSpreadSheet.load.assert_called_once_with(balance_spreadsheet.KEY)
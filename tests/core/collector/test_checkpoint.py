@@ -0,0 +1,82 @@
+import time
+from pathlib import Path
+
+import pytest
+
+from vigilant.common.workspace import Workspace
+from vigilant.core.collector.checkpoint import RESTORED, Checkpoint, CheckpointStore
+
+OUTPUT: str = "bank.json"
+
+
+@pytest.fixture
+def store(tmp_path: Path) -> CheckpointStore:
+    return CheckpointStore(tmp_path / "checkpoints", max_age=60)
+
+
+@pytest.fixture
+def previous(workspace: Workspace) -> Workspace:
+    (workspace.output_path / OUTPUT).write_text('{"amount": 1}')
+
+    return workspace
+
+
+def test_save(store: CheckpointStore, previous: Workspace) -> None:
+    checkpoint: Checkpoint = store.save("Bank", previous, OUTPUT)
+
+    assert store.load("Bank") == checkpoint
+    assert checkpoint.run_id == previous.run_id and len(checkpoint.sha256) == 64
+    assert checkpoint.output_path == previous.output_path / OUTPUT
+
+
+def test_restore(store: CheckpointStore, previous: Workspace) -> None:
+    store.save("Bank", previous, OUTPUT)
+    restored_count: float = RESTORED.value(scraper="Bank")
+    retry: Workspace = Workspace.create("retry")
+
+    checkpoint: Checkpoint | None = store.restore("Bank", retry)
+
+    assert checkpoint is not None and checkpoint.run_id == previous.run_id
+    assert (retry.output_path / OUTPUT).read_text() == '{"amount": 1}'
+    assert RESTORED.value(scraper="Bank") == restored_count + 1
+
+
+def test_restore_missing(store: CheckpointStore, workspace: Workspace) -> None:
+    assert store.restore("Bank", workspace) is None
+
+
+def test_restore_expired(store: CheckpointStore, previous: Workspace) -> None:
+    checkpoint: Checkpoint = store.save("Bank", previous, OUTPUT)
+    checkpoint.completed_at = time.time() - 61
+    (store.path / "Bank.json").write_text(checkpoint.model_dump_json())
+
+    assert store.restore("Bank", Workspace.create("retry")) is None
+
+
+def test_restore_changed_output(store: CheckpointStore, previous: Workspace) -> None:
+    store.save("Bank", previous, OUTPUT)
+    (previous.output_path / OUTPUT).write_text('{"amount": 2}')
+    retry: Workspace = Workspace.create("retry")
+
+    assert store.restore("Bank", retry) is None
+    assert not (retry.output_path / OUTPUT).exists()
+
+
+def test_load_invalid(store: CheckpointStore) -> None:
+    store.path.mkdir()
+    (store.path / "Bank.json").write_text("{}")
+
+    assert store.load("Bank") is None
+
+
+def test_clear(store: CheckpointStore, previous: Workspace) -> None:
+    store.clear()
+    store.save("Bank", previous, OUTPUT)
+
+    store.clear()
+
+    assert store.load("Bank") is None
+
+
+def test_enabled(tmp_path: Path) -> None:
+    assert not CheckpointStore(tmp_path, max_age=0).enabled
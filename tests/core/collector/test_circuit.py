@@ -0,0 +1,67 @@
+import time
+from pathlib import Path
+
+import pytest
+
+from vigilant.common.exceptions import CircuitOpen
+from vigilant.core.collector.circuit import REJECTED, CircuitBreaker, CircuitState
+
+
+@pytest.fixture
+def breaker(tmp_path: Path) -> CircuitBreaker:
+    return CircuitBreaker(tmp_path / "circuits", failure_threshold=2, reset_timeout=60)
+
+
+def test_closed(breaker: CircuitBreaker) -> None:
+    breaker.record_failure("Bank")
+
+    breaker.check("Bank")
+
+    assert breaker.load("Bank") == CircuitState(failures=1)
+
+
+def test_open(breaker: CircuitBreaker) -> None:
+    rejected: float = REJECTED.value(scraper="Bank")
+    breaker.record_failure("Bank")
+    breaker.record_failure("Bank")
+
+    with pytest.raises(CircuitOpen, match="Bank failed too many times"):
+        breaker.check("Bank")
+
+    assert REJECTED.value(scraper="Bank") == rejected + 1
+
+
+def test_half_open(breaker: CircuitBreaker) -> None:
+    breaker._save("Bank", CircuitState(failures=2, opened_at=time.time() - 61))
+
+    breaker.check("Bank")
+    breaker.record_failure("Bank")
+
+    with pytest.raises(CircuitOpen):
+        breaker.check("Bank")
+
+
+def test_success_closes(breaker: CircuitBreaker) -> None:
+    breaker._save("Bank", CircuitState(failures=2, opened_at=time.time() - 61))
+
+    breaker.record_success("Bank")
+
+    breaker.check("Bank")
+    assert breaker.load("Bank") == CircuitState()
+
+
+def test_success_without_state(breaker: CircuitBreaker) -> None:
+    breaker.record_success("Bank")
+
+    assert not breaker.path.exists()
+
+
+def test_invalid_state(breaker: CircuitBreaker) -> None:
+    breaker.path.mkdir()
+    (breaker.path / "Bank.json").write_text("[]")
+
+    assert breaker.load("Bank") == CircuitState()
+
+
+def test_enabled(tmp_path: Path) -> None:
+    assert not CircuitBreaker(tmp_path, failure_threshold=0).enabled
@@ -1,10 +1,18 @@
+import threading
 from pathlib import Path
 from typing import Type
 from unittest import mock
 
 import pytest
 
+from vigilant.common.workspace import Workspace
 from vigilant.core.collector import main as collector
+from vigilant.common.deadline import Deadline
+from vigilant.common.exceptions import CircuitOpen, DeadlineExceeded
+from vigilant.common.models import CollectionResult
+from vigilant.core.collector.checkpoint import CheckpointStore
+from vigilant.core.collector.circuit import CircuitBreaker
+from vigilant.core.collector.scraper.registry import ScraperRegistry
 from vigilant.core.collector.scraper.scraper import Scraper
 
 
@@ -13,25 +21,324 @@ def mock_scraper() -> Type[Scraper]:
     class MockScraper(Scraper):
         def navigate(self): ...
 
+        def _login(self): ...
+
     return MockScraper
 
 
+@pytest.fixture(autouse=True)
+def checkpoints(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> CheckpointStore:
+    store = CheckpointStore(tmp_path / "checkpoints", max_age=60)
+    monkeypatch.setattr(collector, "checkpoints", store)
+
+    return store
+
+
+@pytest.fixture(autouse=True)
+def breaker(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> CircuitBreaker:
+    circuit_breaker = CircuitBreaker(tmp_path / "circuits", failure_threshold=1)
+    monkeypatch.setattr(collector, "breaker", circuit_breaker)
+
+    return circuit_breaker
+
+
 @mock.patch("vigilant.core.collector.main.session")
-@mock.patch("vigilant.core.collector.main.clear_resources")
 def test_collect(
     driver_session: mock.MagicMock,
-    clear_resources: mock.MagicMock,
-    tmp_path: Path,
     monkeypatch: pytest.MonkeyPatch,
     mock_scraper: Type[Scraper],
+    workspace: Workspace,
 ) -> None:
-    monkeypatch.setattr("vigilant.common.values.IOResources.DATA_PATH", tmp_path)
     monkeypatch.setattr(
         "vigilant.common.values.collector.ENABLED_SCRAPERS", ["MockScraper"]
     )
 
-    collector.SCRAPER_REGISTRY = {"MockScraper": mock_scraper}
-    collector.collect()
+    monkeypatch.setattr(
+        collector,
+        "SCRAPER_REGISTRY",
+        ScraperRegistry({"MockScraper": mock_scraper}, group=None),
+    )
+    collector.collect(workspace)
+
+    driver_session.assert_called_once()
+
+
+@mock.patch("vigilant.core.collector.main._run_scraper")
+def test_collect_concurrently(
+    run_scraper: mock.MagicMock, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    scrapers: list[mock.MagicMock] = [
+        mock.MagicMock(__name__=n, output_filename=f"{n}.json") for n in "AB"
+    ]
+
+    monkeypatch.setattr("vigilant.common.values.collector.CONCURRENT", True)
+    monkeypatch.setattr(collector, "get_enabled_scrapers", lambda: scrapers)
+
+    workspace = mock.MagicMock()
+    result: CollectionResult = collector.collect(workspace)
+
+    assert sorted(result.outputs) == ["A.json", "B.json"]
+    assert result.skipped == []
+
+    assert sorted(c.args[0].__name__ for c in run_scraper.call_args_list) == ["A", "B"]
+    assert all(c.args[1] is workspace for c in run_scraper.call_args_list)
+
+
+@mock.patch("vigilant.core.collector.main._run_scraper")
+def test_collect_concurrently_isolated_failure(run_scraper: mock.MagicMock) -> None:
+    failing, succeeding = mock.MagicMock(__name__="A"), mock.MagicMock(__name__="B")
+    error = RuntimeError("Hesitation is defeat!")
+    run_scraper.side_effect = lambda SPR, *_: SPR()
+
+    failing.side_effect = error
+
+    with pytest.raises(RuntimeError) as exc_info:
+        collector._collect_concurrently(
+            [failing, succeeding], mock.MagicMock(), Deadline()
+        )
+
+    assert exc_info.value is error
+    succeeding.assert_called_once()
+
+
+def test_shutdown(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("vigilant.common.values.collector.MAX_CONCURRENCY", 2)
+    monkeypatch.setattr(collector, "get_enabled_scrapers", lambda: ["A", "B", "C"])
+    owners: list[str] = []
+    release = threading.Event()
+
+    # Keep both workers busy so the executor starts two threads
+    executor = collector._get_executor()
+    for _ in range(2):
+        executor.submit(release.wait, 5)
+    release.set()
+
+    with mock.patch(
+        "vigilant.core.collector.main.close_pool",
+        side_effect=lambda: owners.append(threading.current_thread().name),
+    ):
+        collector.shutdown()
+
+    assert len(owners) == 2 and len(set(owners)) == 2
+    assert all(name.startswith("scraper") for name in owners)
+    assert collector._executor is None and collector._workers == 0
+
+    collector.shutdown()
+
+
+def test_run_on_worker_broken_barrier() -> None:
+    task = mock.Mock()
+
+    collector._run_on_worker(task, threading.Barrier(2, timeout=0))
+
+    task.assert_called_once()
+    assert collector._run_on_workers(task, 0) == []
+
+
+def test_warm_up(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("vigilant.common.values.collector.CONCURRENT", True)
+    monkeypatch.setattr("vigilant.common.values.collector.MAX_CONCURRENCY", 2)
+    monkeypatch.setattr(collector, "get_enabled_scrapers", lambda: ["A", "B"])
+    owners: list[str] = []
+
+    with mock.patch(
+        "vigilant.core.collector.main.get_pool",
+        side_effect=lambda: owners.append(threading.current_thread().name)
+        or mock.MagicMock(),
+    ):
+        collector.warm_up()
+
+    with mock.patch("vigilant.core.collector.main.close_pool"):
+        collector.shutdown()
+
+    assert len(set(owners)) == 2
+
+
+@mock.patch("vigilant.core.collector.main.get_pool")
+def test_warm_up_sequential(get_pool: mock.MagicMock) -> None:
+    collector.warm_up()
+
+    get_pool.assert_not_called()
+
+
+def test_get_enabled_scrapers(
+    monkeypatch: pytest.MonkeyPatch, mock_scraper: Type[Scraper]
+) -> None:
+    monkeypatch.setattr(
+        "vigilant.common.values.collector.ENABLED_SCRAPERS",
+        ["MockScraper", "Disabled"],
+    )
+    monkeypatch.setattr(
+        collector,
+        "SCRAPER_REGISTRY",
+        ScraperRegistry({"MockScraper": mock_scraper}, group=None),
+    )
+
+    assert collector.get_enabled_scrapers() == [mock_scraper]
+
+
+@mock.patch("vigilant.core.collector.main.session")
+def test_run_scraper_checkpoint(
+    driver_session: mock.MagicMock,
+    mock_scraper: Type[Scraper],
+    workspace: Workspace,
+    checkpoints: CheckpointStore,
+) -> None:
+    mock_scraper.output_filename = "mock.json"
+    mock_scraper.navigate = lambda self: (
+        self.workspace.output_path / self.output_filename
+    ).write_text("{}")
+
+    collector._run_scraper(mock_scraper, workspace)
+    retry: Workspace = Workspace.create("retry")
+    collector._run_scraper(mock_scraper, retry)
 
     driver_session.assert_called_once()
-    clear_resources.assert_called_once()
+    assert checkpoints.load("MockScraper").run_id == workspace.run_id
+    assert (retry.output_path / "mock.json").read_text() == "{}"
+
+
+@mock.patch("vigilant.core.collector.main.session")
+def test_run_scraper_failed_not_checkpointed(
+    driver_session: mock.MagicMock,
+    mock_scraper: Type[Scraper],
+    workspace: Workspace,
+    checkpoints: CheckpointStore,
+) -> None:
+    mock_scraper.output_filename = "mock.json"
+    driver_session.side_effect = RuntimeError("Hesitation is defeat!")
+
+    with pytest.raises(RuntimeError):
+        collector._run_scraper(mock_scraper, workspace)
+
+    assert checkpoints.load("MockScraper") is None
+
+
+@mock.patch("vigilant.core.collector.main.session")
+def test_run_scraper_circuit(
+    driver_session: mock.MagicMock,
+    mock_scraper: Type[Scraper],
+    workspace: Workspace,
+    breaker: CircuitBreaker,
+) -> None:
+    driver_session.side_effect = RuntimeError("Hesitation is defeat!")
+
+    with pytest.raises(RuntimeError):
+        collector._run_scraper(mock_scraper, workspace)
+    with pytest.raises(CircuitOpen):
+        collector._run_scraper(mock_scraper, workspace)
+
+    driver_session.assert_called_once()
+    assert breaker.load("MockScraper").failures == 1
+
+
+@mock.patch("vigilant.core.collector.main.session")
+def test_run_scraper_circuit_closed_on_success(
+    driver_session: mock.MagicMock,
+    mock_scraper: Type[Scraper],
+    workspace: Workspace,
+    breaker: CircuitBreaker,
+) -> None:
+    breaker.failure_threshold = 2
+    breaker.record_failure("MockScraper")
+
+    collector._run_scraper(mock_scraper, workspace)
+
+    assert breaker.load("MockScraper").failures == 0
+
+
+@mock.patch("vigilant.core.collector.main._run_scraper")
+def test_collect_deadline(
+    run_scraper: mock.MagicMock, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    scrapers: list[mock.MagicMock] = [
+        mock.MagicMock(__name__=n, output_filename=f"{n}.json") for n in "ABC"
+    ]
+    monkeypatch.setattr(collector, "get_enabled_scrapers", lambda: scrapers)
+    budgets: list[float] = []
+
+    def run(SPR, workspace, deadline: Deadline) -> None:
+        budgets.append(deadline.remaining)
+        if SPR.__name__ == "B":
+            raise DeadlineExceeded("B")
+
+    run_scraper.side_effect = run
+
+    assert collector.collect(mock.MagicMock(), Deadline(90)) == CollectionResult(
+        outputs=["A.json", "C.json"], skipped=["B"]
+    )
+    assert [round(budget) for budget in budgets] == [30, 45, 90]
+
+
+@mock.patch("vigilant.core.collector.main._run_scraper")
+def test_collect_concurrently_deadline(run_scraper: mock.MagicMock) -> None:
+    release = threading.Event()
+    scrapers: list[mock.MagicMock] = [
+        mock.MagicMock(__name__=n, output_filename=f"{n}.json") for n in "ABC"
+    ]
+
+    def run(SPR, workspace, deadline: Deadline) -> None:
+        if SPR.__name__ == "B":
+            raise DeadlineExceeded("B")
+        if SPR.__name__ == "C":
+            release.wait(5)
+
+    run_scraper.side_effect = run
+
+    with mock.patch("vigilant.core.collector.main.CANCEL_GRACE", 0.1):
+        result: CollectionResult = collector._collect_concurrently(
+            scrapers, mock.MagicMock(), Deadline(0.1)
+        )
+    release.set()
+
+    assert result.outputs == ["A.json"]
+    assert sorted(result.skipped) == ["B", "C"]
+
+
+@mock.patch("vigilant.core.collector.main.session")
+def test_run_scraper_deadline_expired(
+    driver_session: mock.MagicMock, mock_scraper: Type[Scraper], workspace: Workspace
+) -> None:
+    with pytest.raises(DeadlineExceeded):
+        collector._run_scraper(mock_scraper, workspace, Deadline(0))
+
+    driver_session.assert_not_called()
+
+
+@mock.patch("vigilant.core.collector.main.session")
+def test_run_scraper_out_of_time(
+    driver_session: mock.MagicMock,
+    mock_scraper: Type[Scraper],
+    workspace: Workspace,
+    breaker: CircuitBreaker,
+) -> None:
+    deadline = Deadline(60)
+
+    def expire(*_):
+        deadline.expires_at = 0
+        raise RuntimeError("Hesitation is defeat!")
+
+    driver_session.return_value.__enter__.side_effect = expire
+
+    with pytest.raises(DeadlineExceeded):
+        collector._run_scraper(mock_scraper, workspace, deadline)
+
+    assert breaker.load("MockScraper").failures == 0
+
+
+@mock.patch("vigilant.core.collector.main.session")
+def test_collect_circuit_open(
+    driver_session: mock.MagicMock,
+    monkeypatch: pytest.MonkeyPatch,
+    mock_scraper: Type[Scraper],
+    workspace: Workspace,
+    breaker: CircuitBreaker,
+) -> None:
+    other: Type[Scraper] = type("OtherScraper", (mock_scraper,), {})
+    monkeypatch.setattr(
+        collector, "get_enabled_scrapers", lambda: [mock_scraper, other]
+    )
+    breaker.record_failure("MockScraper")
+
+    assert collector.collect(workspace).skipped == ["MockScraper"]
+    driver_session.assert_called_once_with("OtherScraper", other.routes)
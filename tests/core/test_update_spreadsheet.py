@@ -5,10 +5,19 @@ from unittest import mock
 
 import pytest
 
+from vigilant.common.spreadsheet import SheetsClient, SpreadSheet
 from vigilant.core import update_spreadsheet
 from vigilant.common.values import balance_spreadsheet
 
 
+@pytest.fixture(autouse=True)
+def snapshot_path(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> Path:
+    path: Path = tmp_path / "snapshot.json"
+    monkeypatch.setattr("vigilant.common.values.IOResources.SNAPSHOT_PATH", path)
+
+    return path
+
+
 @pytest.fixture
 def transformed_data_output() -> dict:
     return json.loads(Path("tests/resources/transformed_bank_data.json").read_text())
@@ -29,10 +38,10 @@ def test_main(
 
     monkeypatch.setattr(
         "vigilant.core.update_spreadsheet.load_bank_data",
-        lambda: (mock_amount, mock_expenses),
+        lambda *_: (mock_amount, mock_expenses),
     )
 
-    update_spreadsheet.main()
+    update_spreadsheet.main(mock.MagicMock())
 
     MockSpreadSheet.load.assert_called_once_with(balance_spreadsheet.KEY)
     update_balance_spreadsheet.assert_called_once_with(
@@ -40,37 +49,146 @@ def test_main(
     )
 
 
-def test_load_bank_data(
-    monkeypatch: pytest.MonkeyPatch, transformed_data_output: dict
-) -> None:
-    monkeypatch.setattr(
-        "vigilant.common.values.IOResources.OUTPUT_PATH",
-        Path("tests/resources/scraper_output"),
-    )
+def test_load_bank_data(transformed_data_output: dict) -> None:
+    workspace = mock.MagicMock(output_path=Path("tests/resources/scraper_output"))
 
-    amount, transactions = update_spreadsheet.load_bank_data()
+    amount, transactions = update_spreadsheet.load_bank_data(workspace)
 
     assert amount == transformed_data_output["amount"]
     assert sorted(transactions) == sorted(transformed_data_output["transactions"])
 
 
-@mock.patch("vigilant.core.update_spreadsheet.SpreadSheet")
-def test_update_balance_spreadsheet(MockSpreadSheet: mock.MagicMock) -> None:
+def test_load_bank_data_outputs() -> None:
+    workspace = mock.MagicMock(output_path=Path("tests/resources/scraper_output"))
+    bank: dict = json.loads((workspace.output_path / "bank_1.json").read_text())
+
+    amount, transactions = update_spreadsheet.load_bank_data(workspace, ["bank_1.json"])
+
+    assert amount == bank["amount"]
+    assert len(transactions) == len(bank["transactions"])
+
+
+def test_update_balance_spreadsheet(snapshot_path: Path) -> None:
     mock_spreadsheet = mock.MagicMock()
-    MockSpreadSheet.load.return_value = mock_spreadsheet
+    mock_batch = mock_spreadsheet.batch.return_value.__enter__.return_value
 
     initial_expenses = [["store", 100], ["restaurant", 50]]
     update_spreadsheet.update_balance_spreadsheet(
         mock_spreadsheet, 1000, initial_expenses
     )
 
-    calls = mock_spreadsheet.write.call_args_list
-    expenses_call = calls[1]
-    written_expenses = expenses_call[0][2]
+    title: str = balance_spreadsheet.EXPENSES_WORKSHEET_NAME
+    mock_spreadsheet.ensure_rows.assert_called_once_with(title, 4)
+    mock_spreadsheet.batch.assert_called_once_with(balance_spreadsheet.WRITE_CHUNK_ROWS)
+    assert mock_batch.write.call_args_list == [
+        mock.call(title, balance_spreadsheet.AMOUNT_CELL, [[1000]]),
+        mock.call(title, "B3:F4", initial_expenses),
+    ]
+    mock_batch.clear.assert_called_once_with(title, "B5:F")
+    mock_batch.format_currency.assert_called_once_with(title, "F3:F4")
+    mock_spreadsheet.write.assert_not_called()
+    assert json.loads(snapshot_path.read_text())["expenses"] == initial_expenses
+
+
+@mock.patch("vigilant.common.spreadsheet.sheets_client", SheetsClient(6000))
+def test_update_balance_spreadsheet_single_metadata_fetch() -> None:
+    worksheet = mock.MagicMock(id=42, row_count=100)
+    worksheet.title = balance_spreadsheet.EXPENSES_WORKSHEET_NAME
+    gspread_spreadsheet = mock.MagicMock()
+    gspread_spreadsheet.worksheets.return_value = [worksheet]
+
+    update_spreadsheet.update_balance_spreadsheet(
+        SpreadSheet(gspread_spreadsheet), 1000, [["store", 100]]
+    )
+
+    gspread_spreadsheet.worksheets.assert_called_once()
+    gspread_spreadsheet.worksheet.assert_not_called()
+    gspread_spreadsheet.batch_update.assert_called_once()
+
+
+def test_update_balance_spreadsheet_clears_stale_tail() -> None:
+    update_spreadsheet.save_snapshot([["store", 100]] * 5)
+    mock_spreadsheet = mock.MagicMock()
+    mock_batch = mock_spreadsheet.batch.return_value.__enter__.return_value
+
+    update_spreadsheet.update_balance_spreadsheet(
+        mock_spreadsheet, 1000, [["store", 100]] * 3
+    )
+
+    mock_batch.clear.assert_called_once_with(
+        balance_spreadsheet.EXPENSES_WORKSHEET_NAME, "B6:F7"
+    )
+
+
+def test_update_balance_spreadsheet_incremental(
+    monkeypatch: pytest.MonkeyPatch, snapshot_path: Path
+) -> None:
+    monkeypatch.setattr(balance_spreadsheet, "INCREMENTAL_SYNC", True)
+    mock_spreadsheet = mock.MagicMock()
+    mock_batch = mock_spreadsheet.batch.return_value.__enter__.return_value
+
+    update_spreadsheet.save_snapshot([["store", 100], ["restaurant", 50]])
+
+    update_spreadsheet.update_balance_spreadsheet(
+        mock_spreadsheet, 1000, [["store", 100], ["cinema", 20], ["bar", 10]]
+    )
+
+    title: str = balance_spreadsheet.EXPENSES_WORKSHEET_NAME
+    assert mock_batch.write.call_args_list == [
+        mock.call(title, balance_spreadsheet.AMOUNT_CELL, [[1000]]),
+        mock.call(title, "B4:F5", [["cinema", 20], ["bar", 10]]),
+    ]
+    mock_batch.clear.assert_not_called()
+    mock_batch.format_currency.assert_called_once_with(title, "F5:F5")
+    mock_spreadsheet.read.assert_not_called()
+    assert json.loads(snapshot_path.read_text())["expenses"][1] == ["cinema", 20]
+
+
+def test_changed_blocks() -> None:
+    previous = [["a", 1], ["b", 2], ["c", 3], ["d", 4]]
+    current = [["a", 1], ["x", 2], ["y", 3], ["d", 4], ["e", 5]]
+
+    assert update_spreadsheet.changed_blocks(previous, current) == [
+        (1, [["x", 2], ["y", 3]]),
+        (4, [["e", 5]]),
+    ]
+    assert update_spreadsheet.changed_blocks(None, current) == [(0, current)]
+    assert update_spreadsheet.changed_blocks(None, []) == []
+
+
+def test_read_snapshot(snapshot_path: Path) -> None:
+    assert update_spreadsheet.read_snapshot() is None
+
+    snapshot_path.write_text(json.dumps({"key": "other", "expenses": [["a", 1]]}))
+    assert update_spreadsheet.read_snapshot() is None
+
+    update_spreadsheet.save_snapshot([["a", 1]])
+    assert update_spreadsheet.read_snapshot() == [["a", 1]]
+
+
+def test_read_expenses() -> None:
+    mock_spreadsheet = mock.MagicMock()
+    mock_spreadsheet.read.return_value = [["store", 100, "", "", ""], ["-"]]
+
+    rows = update_spreadsheet.read_expenses(mock_spreadsheet)
+
+    assert rows == [["store", 100, "", "", ""], ["-", "", "", "", ""]]
+    mock_spreadsheet.read.assert_called_once_with(
+        balance_spreadsheet.EXPENSES_WORKSHEET_NAME, "B3:F", unformatted=True
+    )
+
+
+def test_update_balance_spreadsheet_reads_back_without_snapshot(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(balance_spreadsheet, "INCREMENTAL_SYNC", True)
+    mock_spreadsheet = mock.MagicMock()
+    mock_spreadsheet.read.return_value = [["store", 100, "", "", ""]]
+    mock_batch = mock_spreadsheet.batch.return_value.__enter__.return_value
 
-    assert len(written_expenses) == update_spreadsheet.TRANSACTIONS_COUNT
+    update_spreadsheet.update_balance_spreadsheet(mock_spreadsheet, 1000, [])
 
-    mock_spreadsheet.format_currency.assert_called_once_with(
-        balance_spreadsheet.EXPENSES_WORKSHEET_NAME,
-        balance_spreadsheet.TRANSACTIONS_AMOUNT_RANGE,
+    mock_batch.clear.assert_called_once_with(
+        balance_spreadsheet.EXPENSES_WORKSHEET_NAME, "B3:F3"
     )
+    mock_batch.format_currency.assert_not_called()
@@ -1,10 +1,14 @@
+import sys
 from unittest import mock
 
 import httpx
+import pytest
 from fastapi import testclient
 
-from vigilant.app import app
+from vigilant.app import WARM_UP_JOB, app, run
 from vigilant.common.exceptions import VigilantException
+from vigilant.common.jobs import jobs
+from vigilant.warmup import Readiness, WarmUpStatus, warm_up
 
 client = testclient.TestClient(app)
 
@@ -13,14 +17,117 @@ client = testclient.TestClient(app)
 def test_update_expenses(run_mock: mock.Mock) -> None:
     response: httpx.Response = client.post("/update-expenses")
 
+    assert response.status_code == 202
+    job_id: str = response.json()["id"]
+    assert response.headers["Location"] == f"/jobs/{job_id}"
+
+    jobs.wait(job_id, timeout=5)
     run_mock.assert_called_once()
+
+    response = client.get(f"/jobs/{job_id}")
+
     assert response.status_code == 200
-    assert response.json() == "Ok"
+    assert response.json()["status"] == "succeeded"
+    assert response.json()["duration"] is not None
 
 
 @mock.patch("vigilant.app.run", mock.Mock(side_effect=VigilantException))
 def test_update_expenses_bad() -> None:
-    response: httpx.Response = client.post("/update-expenses")
+    job_id: str = client.post("/update-expenses").json()["id"]
+    jobs.wait(job_id, timeout=5)
+
+    response: httpx.Response = client.get(f"/jobs/{job_id}")
 
-    assert response.status_code == 500
+    assert response.json()["status"] == "failed"
+    assert response.json()["error"] == VigilantException.message
+
+
+def test_get_job_not_found() -> None:
+    response: httpx.Response = client.get("/jobs/unknown")
+
+    assert response.status_code == 404
     assert "details" in response.json()
+
+
+@mock.patch("vigilant.app.jobs")
+def test_lifespan(mock_jobs: mock.MagicMock) -> None:
+    browser, collector = mock.MagicMock(), mock.MagicMock()
+    modules = {
+        "vigilant.common.browser": browser,
+        "vigilant.core.collector.main": collector,
+    }
+
+    with mock.patch.dict(sys.modules, modules), testclient.TestClient(app):
+        mock_jobs.submit.assert_called_once_with(warm_up.run, key=WARM_UP_JOB)
+        mock_jobs.shutdown.assert_not_called()
+
+    mock_jobs.shutdown.assert_called_once_with(browser.close_pool)
+    collector.shutdown.assert_called_once()
+
+
+@mock.patch("vigilant.app.jobs")
+def test_lifespan_nothing_imported(mock_jobs: mock.MagicMock) -> None:
+    with mock.patch.dict(sys.modules):
+        del sys.modules["vigilant.common.browser"]
+        del sys.modules["vigilant.core.collector.main"]
+
+        with testclient.TestClient(app):
+            pass
+
+        assert "vigilant.common.browser" not in sys.modules
+
+    mock_jobs.shutdown.assert_called_once_with(None)
+
+
+@mock.patch("vigilant.app.jobs")
+def test_lifespan_without_warm_up(
+    mock_jobs: mock.MagicMock, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr("vigilant.common.values.settings.BROWSER_WARM_UP", False)
+    monkeypatch.setattr(warm_up, "readiness", Readiness())
+
+    with testclient.TestClient(app) as lifespan_client:
+        response: httpx.Response = lifespan_client.get("/healthz")
+
+    mock_jobs.submit.assert_not_called()
+    assert response.status_code == 200
+    assert response.json()["status"] == "ready"
+
+
+def test_healthz(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(warm_up, "readiness", Readiness())
+
+    response: httpx.Response = client.get("/healthz")
+
+    assert response.status_code == 503
+    assert response.json()["status"] == "pending"
+
+
+def test_healthz_degraded(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(
+        warm_up,
+        "readiness",
+        Readiness(status=WarmUpStatus.FAILED, error="RuntimeError()"),
+    )
+
+    response: httpx.Response = client.get("/healthz")
+
+    assert response.status_code == 200
+    assert response.json()["status"] == "failed"
+    assert response.json()["error"] == "RuntimeError()"
+
+
+def test_metrics() -> None:
+    response: httpx.Response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert "# TYPE vigilant_runs_total counter" in response.text
+    assert "# TYPE vigilant_scraper_step_seconds histogram" in response.text
+
+
+@mock.patch("vigilant.run.main")
+def test_run(main: mock.MagicMock) -> None:
+    run()
+
+    main.assert_called_once()
@@ -1,15 +1,157 @@
+from pathlib import Path
 from unittest import mock
 
+import pytest
+
 from vigilant import run
+from vigilant.common.exceptions import CircuitOpen, IncompleteRun
+from vigilant.common.models import CollectionResult
+from vigilant.common.singleflight import SingleFlight
 
 
+@mock.patch("vigilant.run.checkpoints")
 @mock.patch("vigilant.run.collector")
 @mock.patch("vigilant.run.update_spreadsheet")
 def test_main(
     update_balance_spreadsheet: mock.MagicMock,
     collector: mock.MagicMock,
+    checkpoints: mock.MagicMock,
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
 ) -> None:
+    monkeypatch.setattr("vigilant.common.values.IOResources.RUNS_PATH", tmp_path)
+    monkeypatch.setattr(
+        run, "pipeline", SingleFlight(tmp_path / "run.lock", tmp_path / "run.json")
+    )
+
+    collector.collect.return_value = CollectionResult(outputs=["chile.json"])
+    succeeded: float = run.RUNS.value(outcome="succeeded")
     run.main()
 
-    collector.collect.assert_called_once()
-    update_balance_spreadsheet.main.assert_called_once()
+    assert run.RUNS.value(outcome="succeeded") == succeeded + 1
+    workspace = collector.collect.call_args.args[0]
+    update_balance_spreadsheet.main.assert_called_once_with(workspace, ["chile.json"])
+    assert workspace.output_path.is_dir()
+    checkpoints.clear.assert_called_once()
+
+
+@mock.patch("vigilant.run.checkpoints")
+@mock.patch("vigilant.run.collector")
+def test_main_keeps_checkpoints_on_failure(
+    collector: mock.MagicMock,
+    checkpoints: mock.MagicMock,
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    monkeypatch.setattr("vigilant.common.values.IOResources.RUNS_PATH", tmp_path)
+    monkeypatch.setattr(
+        run, "pipeline", SingleFlight(tmp_path / "run.lock", tmp_path / "run.json")
+    )
+    collector.collect.side_effect = RuntimeError("Hesitation is defeat!")
+
+    with pytest.raises(RuntimeError):
+        run.main()
+
+    checkpoints.clear.assert_not_called()
+
+
+@pytest.mark.parametrize("collected", [True, False])
+@mock.patch("vigilant.run.checkpoints")
+@mock.patch("vigilant.run.collector")
+@mock.patch("vigilant.run.update_spreadsheet")
+def test_main_incomplete(
+    update_balance_spreadsheet: mock.MagicMock,
+    collector: mock.MagicMock,
+    checkpoints: mock.MagicMock,
+    collected: bool,
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    monkeypatch.setattr("vigilant.common.values.IOResources.RUNS_PATH", tmp_path)
+    monkeypatch.setattr(
+        run, "pipeline", SingleFlight(tmp_path / "run.lock", tmp_path / "run.json")
+    )
+
+    def collect(workspace, deadline) -> CollectionResult:
+        return CollectionResult(
+            outputs=["chile.json"] if collected else [],
+            skipped=["BancoFalabellaScraper"],
+        )
+
+    collector.collect.side_effect = collect
+    incomplete: float = run.RUNS.value(outcome="incomplete")
+
+    with pytest.raises(IncompleteRun, match="BancoFalabellaScraper not collected"):
+        run.main()
+
+    assert update_balance_spreadsheet.main.called == collected
+    assert run.RUNS.value(outcome="incomplete") == incomplete + 1
+    checkpoints.clear.assert_not_called()
+
+
+@pytest.mark.parametrize("concurrent", [False, True])
+@mock.patch("vigilant.run.checkpoints", mock.MagicMock())
+@mock.patch("vigilant.run.update_spreadsheet")
+@mock.patch("vigilant.core.collector.main._run_scraper")
+def test_main_circuit_open(
+    run_scraper: mock.MagicMock,
+    update_balance_spreadsheet: mock.MagicMock,
+    concurrent: bool,
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    monkeypatch.setattr("vigilant.common.values.IOResources.RUNS_PATH", tmp_path)
+    monkeypatch.setattr("vigilant.common.values.collector.CONCURRENT", concurrent)
+    monkeypatch.setattr(
+        run, "pipeline", SingleFlight(tmp_path / "run.lock", tmp_path / "run.json")
+    )
+    scrapers: list[mock.MagicMock] = [
+        mock.MagicMock(__name__=n, output_filename=f"{n}.json") for n in "ABC"
+    ]
+    monkeypatch.setattr(
+        "vigilant.core.collector.main.get_enabled_scrapers", lambda: scrapers
+    )
+
+    def scrap(SPR, workspace, deadline) -> None:
+        if SPR.__name__ == "A":
+            raise CircuitOpen("A", 60)
+
+    run_scraper.side_effect = scrap
+
+    with pytest.raises(IncompleteRun, match="A not collected"):
+        run.main()
+
+    assert sorted(c.args[0].__name__ for c in run_scraper.call_args_list) == [
+        "A",
+        "B",
+        "C",
+    ]
+    assert sorted(update_balance_spreadsheet.main.call_args.args[1]) == [
+        "B.json",
+        "C.json",
+    ]
+
+
+@mock.patch("vigilant.run.close_pool")
+@mock.patch("vigilant.run.collector")
+@mock.patch("vigilant.run.main", side_effect=RuntimeError)
+def test_cli(
+    main: mock.MagicMock, collector: mock.MagicMock, close_pool: mock.MagicMock
+) -> None:
+    with pytest.raises(RuntimeError):
+        run.cli()
+
+    collector.shutdown.assert_called_once()
+    close_pool.assert_called_once()
+
+
+def test_main_failed(monkeypatch: pytest.MonkeyPatch) -> None:
+    pipeline = mock.MagicMock()
+    pipeline.run.side_effect = RuntimeError
+    monkeypatch.setattr(run, "pipeline", pipeline)
+    failed: float = run.RUNS.value(outcome="failed")
+
+    with pytest.raises(RuntimeError):
+        run.main()
+
+    assert run.RUNS.value(outcome="failed") == failed + 1
@@ -0,0 +1,30 @@
+from unittest import mock
+
+from vigilant.warmup import WarmUp, WarmUpStatus
+
+
+@mock.patch("vigilant.core.collector.warm_up")
+@mock.patch("vigilant.common.browser.get_pool")
+def test_warm_up(get_pool: mock.MagicMock, collector_warm_up: mock.MagicMock) -> None:
+    warm_up = WarmUp(modules=("json",))
+
+    assert not warm_up.readiness.ready
+    warm_up.run()
+
+    assert warm_up.readiness.ready and warm_up.readiness.duration >= 0
+    get_pool.assert_called_once()
+    collector_warm_up.assert_called_once()
+
+
+@mock.patch("vigilant.core.collector.warm_up", mock.MagicMock())
+@mock.patch("vigilant.common.browser.get_pool")
+def test_warm_up_failed(get_pool: mock.MagicMock) -> None:
+    type(get_pool.return_value).browser = mock.PropertyMock(
+        side_effect=RuntimeError("Hesitation is defeat!")
+    )
+    warm_up = WarmUp(modules=())
+
+    warm_up.run()
+
+    assert warm_up.readiness.status == WarmUpStatus.FAILED
+    assert "Hesitation is defeat!" in warm_up.readiness.error
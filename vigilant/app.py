@@ -1,22 +1,113 @@
-from fastapi import FastAPI
-from fastapi.responses import JSONResponse
+import sys
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Final
 
-from vigilant.common.exceptions import VigilantException
-from vigilant.run import main as run
+from fastapi import FastAPI, Response
+from fastapi.responses import JSONResponse, PlainTextResponse
 
-app = FastAPI()
+from vigilant.common.jobs import Job, jobs
+from vigilant.common.metrics import CONTENT_TYPE, metrics
+from vigilant.common.tracing import tracer
+from vigilant.common.values import settings
+from vigilant.warmup import Readiness, WarmUpStatus, warm_up
 
+UPDATE_EXPENSES_JOB: Final[str] = "update-expenses"
+WARM_UP_JOB: Final[str] = "warm-up"
 
-@app.post("/update-expenses")
-def update_expenses() -> str:
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Warm up the browsers in background at startup, the warm-up is queued as
+    a job so updates requested meanwhile run after it, reusing its browser.
+    Release the browsers at shutdown, each pool is closed by its owner thread:
+    the job worker and the scraper workers, and export the pending spans.
+    """
+    if settings.BROWSER_WARM_UP:
+        jobs.submit(warm_up.run, key=WARM_UP_JOB)
+    else:
+        warm_up.readiness = Readiness(status=WarmUpStatus.READY)
+
+    yield
+
+    # Browsers only exist when their modules were imported, there is no need
+    # to import them just to find nothing to close
+    browser = sys.modules.get("vigilant.common.browser")
+    jobs.shutdown(browser.close_pool if browser is not None else None)
+
+    collector = sys.modules.get("vigilant.core.collector.main")
+    if collector is not None:
+        collector.shutdown()
+
+    tracer.flush()
+
+
+app = FastAPI(lifespan=lifespan)
+
+
+def run() -> None:
+    """Run the update process. The pipeline modules (Playwright, gspread,
+    Google clients) are imported here, keeping them out of the startup path.
+    """
+    from vigilant.run import main
+
+    main()
+
+
+@app.post("/update-expenses", status_code=202)
+def update_expenses(response: Response) -> Job:
     """Start process for collecting expenses data and load it into a google
-    spreadsheet
+    spreadsheet, in background. Requests arriving while an update is in
+    progress get that same job.
+
+    Returns:
+        Job: Queued job, its status is available in /jobs/{job_id}
+    """
+    job: Job = jobs.submit(run, key=UPDATE_EXPENSES_JOB)
+    response.headers["Location"] = f"/jobs/{job.id}"
+
+    return job
+
+
+@app.get("/jobs/{job_id}", response_model=None)
+def get_job(job_id: str) -> Job | JSONResponse:
+    """Status, timing and error details of a job
+
+    Args:
+        job_id (str): Job ID
+
+    Returns:
+        Job | JSONResponse: Job, or 404 when it is unknown
+    """
+    job: Job | None = jobs.get(job_id)
+    if job is None:
+        return JSONResponse(status_code=404, content={"details": "Job not found"})
+
+    return job
+
+
+@app.get("/healthz", response_model=None)
+def healthz() -> Readiness | JSONResponse:
+    """Readiness of the service, ready once the warm-up finished. A failed
+    warm-up still answers 200, with the `failed` status and its error: the
+    service works, launching the browsers on demand, and restarting the
+    instance would not help.
+
+    Returns:
+        Readiness | JSONResponse: Warm-up status, with 503 until it finished
+    """
+    readiness: Readiness = warm_up.readiness
+    if not readiness.finished:
+        return JSONResponse(status_code=503, content=readiness.model_dump())
+
+    return readiness
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def get_metrics() -> PlainTextResponse:
+    """In-process metrics, in the Prometheus text exposition format
 
     Returns:
-        str: Finished process status message
+        PlainTextResponse: Exposition document
     """
-    try:
-        run()
-        return "Ok"
-    except VigilantException as e:
-        return JSONResponse(status_code=500, content={"details": str(e)})
+    return PlainTextResponse(metrics.render(), media_type=CONTENT_TYPE)
@@ -1,61 +1,520 @@
+import atexit
+import json
+import os
+import threading
+import time
+from collections import Counter
 from collections.abc import Generator
 from contextlib import contextmanager
+from dataclasses import dataclass, field
 from datetime import datetime
+from pathlib import Path
+from typing import Final
+from urllib.parse import urlparse
 
+from cryptography.fernet import Fernet, InvalidToken
 from playwright.sync_api import (
     Browser,
     BrowserContext,
     Page,
+    Playwright,
+    Route,
     sync_playwright,
 )
+from pydantic import BaseModel
 
 from vigilant import logger
 from vigilant.common.exceptions import DriverException
-from vigilant.common.storage import GoogleCloudStorage, LocalStorage
-from vigilant.common.values import (
-    settings,
-    IOResources,
-    StorageLocation,
-)
+from vigilant.common.metrics import Histogram, metrics
+from vigilant.common.storage import Storage, get_storage
+from vigilant.common.values import settings, IOResources
+
+DEFAULT_CONTEXT_NAME: str = "default"
 
-storage = (
-    GoogleCloudStorage()
-    if settings.STORAGE_LOCATION == StorageLocation.GCS
-    else LocalStorage()
+# Rough transfer size per resource type, used to estimate the savings of
+# aborted requests, since their real size is never known.
+ESTIMATED_RESOURCE_BYTES: Final[dict[str, int]] = {
+    "image": 50_000,
+    "media": 500_000,
+    "font": 40_000,
+    "script": 30_000,
+    "stylesheet": 20_000,
+}
+DEFAULT_RESOURCE_BYTES: Final[int] = 10_000
+
+LAUNCH_SECONDS: Final[Histogram] = metrics.histogram(
+    "vigilant_browser_launch_seconds",
+    "Time to start the Playwright driver and launch Chromium",
 )
 
 
-@contextmanager
-def session() -> Generator[Page]:
-    with sync_playwright() as p:
-        browser: Browser = p.chromium.launch(
-            channel="chrome",
-            args=[
-                "--no-sandbox",
-                "--disable-setuid-sandbox",
-                "--disable-dev-shm-usage",
-                "--disable-gpu",
-            ],
+class SessionStateCache:
+    """Authenticated browser states (cookies and localStorage) saved per
+    scraper, encrypted at rest. Disabled unless `SESSION_CACHE_KEY` is set.
+    Stored in the configured storage unless another one is given.
+
+    The key is only checked on first use, so processes that never scrape
+    neither warn about a missing key nor fail on an invalid one.
+    """
+
+    def __init__(
+        self,
+        storage: Storage | None = None,
+        key: str | None = settings.SESSION_CACHE_KEY,
+        ttl: int = settings.SESSION_CACHE_TTL,
+    ):
+        self._storage = storage
+        self._key = key
+        self._fernet: Fernet | None = None
+        self._loaded: bool = False
+        self._lock = threading.Lock()
+        self.ttl = ttl
+
+    @property
+    def enabled(self) -> bool:
+        return self.fernet is not None
+
+    @property
+    def fernet(self) -> Fernet | None:
+        with self._lock:
+            if not self._loaded:
+                if not self._key:
+                    logger.warning(
+                        "SESSION_CACHE_KEY is not set, sessions will not be cached"
+                    )
+                self._fernet = Fernet(self._key) if self._key else None
+                self._loaded = True
+
+        return self._fernet
+
+    @property
+    def storage(self) -> Storage:
+        if self._storage is None:
+            self._storage = get_storage()
+
+        return self._storage
+
+    def load(self, name: str) -> dict | None:
+        """Get the saved state of `name`. Expired or unreadable states are
+        deleted.
+
+        Args:
+            name (str): State owner
+
+        Returns:
+            dict | None: Playwright storage state, None when there is no valid one
+        """
+        if not self.enabled:
+            return None
+
+        token: bytes | None = self.storage.load_file(self._path(name))
+        if token is None:
+            return None
+
+        try:
+            return json.loads(self.fernet.decrypt(token, ttl=self.ttl))
+        except InvalidToken:
+            self.invalidate(name)
+            return None
+
+    def save(self, name: str, state: dict) -> None:
+        """Encrypt and save the state of `name`
+
+        Args:
+            name (str): State owner
+            state (dict): Playwright storage state
+        """
+        if self.enabled:
+            token: bytes = self.fernet.encrypt(json.dumps(state).encode())
+            self.storage.save_file(token, self._path(name))
+
+    def invalidate(self, name: str) -> None:
+        """Delete the saved state of `name`
+
+        Args:
+            name (str): State owner
+        """
+        if self.enabled:
+            self.storage.delete_file(self._path(name))
+
+    @staticmethod
+    def _path(name: str) -> str:
+        return f"{IOResources.SESSIONS_PATH}/{name}.state"
+
+
+session_cache = SessionStateCache()
+
+
+class RouteRules:
+    """Requests aborted by the browser. Scrapers extend them next to their
+    `Locators`. Allowed domains take precedence over any block.
+    """
+
+    BLOCKED_RESOURCE_TYPES: tuple[str, ...] = ("image", "media", "font")
+    BLOCKED_DOMAINS: tuple[str, ...] = (
+        "google-analytics.com",
+        "googletagmanager.com",
+        "doubleclick.net",
+        "facebook.net",
+        "hotjar.com",
+    )
+    ALLOWED_DOMAINS: tuple[str, ...] = ()
+
+
+class RouteStats(BaseModel):
+    blocked_requests: dict[str, int]
+    estimated_bytes_saved: int
+
+
+class RequestBlocker:
+    """Context route handler that aborts the requests matching `RouteRules`"""
+
+    def __init__(self, rules: type[RouteRules] = RouteRules):
+        self.rules = rules
+        self.blocked: Counter[str] = Counter()
+        self.bytes_saved: int = 0
+
+    def install(self, context: BrowserContext) -> None:
+        """Route every request of the context through the blocker
+
+        Args:
+            context (BrowserContext): Browser context
+        """
+        context.route("**/*", self.handle)
+
+    def handle(self, route: Route) -> None:
+        """Abort the request when it is blocked, let it through otherwise
+
+        Args:
+            route (Route): Intercepted request
+        """
+        resource_type: str = route.request.resource_type
+        host: str = urlparse(route.request.url).hostname or ""
+
+        if self.must_block(resource_type, host):
+            self.blocked[resource_type] += 1
+            self.bytes_saved += ESTIMATED_RESOURCE_BYTES.get(
+                resource_type, DEFAULT_RESOURCE_BYTES
+            )
+            route.abort("blockedbyclient")
+        else:
+            route.fallback()
+
+    def must_block(self, resource_type: str, host: str) -> bool:
+        """Check a request against the rules
+
+        Args:
+            resource_type (str): Playwright resource type of the request
+            host (str): Requested host
+
+        Returns:
+            bool: Whether the request has to be aborted
+        """
+        if _match_domain(host, self.rules.ALLOWED_DOMAINS):
+            return False
+
+        return resource_type in self.rules.BLOCKED_RESOURCE_TYPES or _match_domain(
+            host, self.rules.BLOCKED_DOMAINS
         )
-        context: BrowserContext = browser.new_context(
-            accept_downloads=True,
-            viewport={"width": 1920, "height": 1080},
-            user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/123.0.0.0 Safari/537.36",
+
+    def stats(self) -> RouteStats:
+        return RouteStats(
+            blocked_requests=dict(self.blocked),
+            estimated_bytes_saved=self.bytes_saved,
         )
-        page: Page = context.new_page()
-        page.set_default_timeout(settings.BROWSER_WAIT_TIMEOUT)
 
+
+class PoolStats(BaseModel):
+    launches: int
+    reuses: int
+    recycles: int
+    contexts_age: dict[str, float]
+    routes: dict[str, RouteStats]
+
+
+@dataclass
+class _PooledContext:
+    context: BrowserContext
+    blocker: RequestBlocker
+    created_at: float = field(default_factory=time.monotonic)
+    uses: int = 0
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.created_at
+
+
+class BrowserPool:
+    """Long-lived Chromium instance handing out an isolated context per name.
+
+    Playwright's sync API is bound to the thread that started it, so a pool
+    must only be used from its owner thread (see `get_pool`).
+    """
+
+    def __init__(
+        self,
+        max_context_uses: int = settings.BROWSER_CONTEXT_MAX_USES,
+        memory_limit_mb: float = settings.BROWSER_MEMORY_LIMIT_MB,
+    ):
+        self.max_context_uses = max_context_uses
+        self.memory_limit_mb = memory_limit_mb
+
+        self._playwright: Playwright | None = None
+        self._browser: Browser | None = None
+        self._contexts: dict[str, _PooledContext] = {}
+
+        self.launches: int = 0
+        self.reuses: int = 0
+        self.recycles: int = 0
+
+    @property
+    def browser(self) -> Browser:
+        """Running browser, launched on first access or after a disconnection
+
+        Returns:
+            Browser: Chromium browser instance
+        """
+        if self._browser is None or not self._browser.is_connected():
+            self._launch()
+
+        return self._browser
+
+    def acquire(
+        self,
+        name: str = DEFAULT_CONTEXT_NAME,
+        rules: type[RouteRules] = RouteRules,
+    ) -> BrowserContext:
+        """Get the context dedicated to `name`, creating a fresh one when there
+        is none yet or the current one has to be recycled
+
+        Args:
+            name (str, optional): Context owner. Defaults to DEFAULT_CONTEXT_NAME.
+            rules (type[RouteRules], optional): Requests to block in a new
+                context. Defaults to RouteRules.
+
+        Returns:
+            BrowserContext: Isolated browser context
+        """
+        browser: Browser = self.browser
+        pooled: _PooledContext | None = self._contexts.get(name)
+
+        if pooled is not None and self._must_recycle(pooled):
+            logger.debug(f"Recycling browser context '{name}' after {pooled.uses} uses")
+            self.discard(name)
+            self.recycles += 1
+            pooled = None
+
+        if pooled is None:
+            context: BrowserContext = browser.new_context(
+                accept_downloads=True,
+                viewport={"width": 1920, "height": 1080},
+                user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+                "AppleWebKit/537.36 (KHTML, like Gecko) "
+                "Chrome/123.0.0.0 Safari/537.36",
+            )
+            blocker = RequestBlocker(rules)
+            blocker.install(context)
+
+            pooled = self._contexts[name] = _PooledContext(context, blocker)
+        else:
+            self.reuses += 1
+
+        pooled.uses += 1
+        return pooled.context
+
+    def discard(self, name: str) -> None:
+        """Close and forget the context owned by `name`
+
+        Args:
+            name (str): Context owner
+        """
+        pooled: _PooledContext | None = self._contexts.pop(name, None)
+        if pooled is not None:
+            pooled.context.close()
+
+    def pages(self, name: str) -> list[Page]:
+        """Open pages of the context owned by `name`
+
+        Args:
+            name (str): Context owner
+
+        Returns:
+            list[Page]: Pages, oldest first
+        """
+        pooled: _PooledContext | None = self._contexts.get(name)
+
+        return list(pooled.context.pages) if pooled is not None else []
+
+    def stats(self) -> PoolStats:
+        """Usage counters of the pool
+
+        Returns:
+            PoolStats: Launches, reuses, recycles, and age and blocked requests
+                of each live context
+        """
+        return PoolStats(
+            launches=self.launches,
+            reuses=self.reuses,
+            recycles=self.recycles,
+            contexts_age={
+                name: round(pooled.age, 3) for name, pooled in self._contexts.items()
+            },
+            routes={
+                name: pooled.blocker.stats() for name, pooled in self._contexts.items()
+            },
+        )
+
+    def close(self) -> None:
+        """Close every context, the browser and the Playwright driver"""
+        for name in list(self._contexts):
+            self.discard(name)
+
+        if self._browser is not None:
+            self._browser.close()
+            self._browser = None
+
+        if self._playwright is not None:
+            self._playwright.stop()
+            self._playwright = None
+
+    def _launch(self) -> None:
+        with LAUNCH_SECONDS.time():
+            if self._playwright is None:
+                self._playwright = sync_playwright().start()
+
+            self._browser = self._playwright.chromium.launch(
+                channel="chrome",
+                args=[
+                    "--no-sandbox",
+                    "--disable-setuid-sandbox",
+                    "--disable-dev-shm-usage",
+                    "--disable-gpu",
+                ],
+            )
+        self._contexts.clear()
+        self.launches += 1
+
+    def _must_recycle(self, pooled: _PooledContext) -> bool:
+        return (
+            pooled.uses >= self.max_context_uses
+            or _browser_memory_mb() >= self.memory_limit_mb
+        )
+
+
+_local = threading.local()
+
+
+def get_pool() -> BrowserPool:
+    """Browser pool owned by the current thread, created on first use
+
+    Returns:
+        BrowserPool: Pool of the current thread
+    """
+    pool: BrowserPool | None = getattr(_local, "pool", None)
+    if pool is None:
+        pool = _local.pool = BrowserPool()
+        if threading.current_thread() is threading.main_thread():
+            atexit.register(pool.close)
+
+    return pool
+
+
+def close_pool() -> None:
+    """Close the browser pool of the current thread, if it has one. Playwright
+    objects can only be closed from the thread that created them, so every
+    thread using `get_pool` has to call this before it ends.
+    """
+    pool: BrowserPool | None = getattr(_local, "pool", None)
+    if pool is not None:
+        pool.close()
+        del _local.pool
+
+
+@contextmanager
+def session(
+    name: str = DEFAULT_CONTEXT_NAME, rules: type[RouteRules] = RouteRules
+) -> Generator[Page]:
+    pool: BrowserPool = get_pool()
+    page: Page = _new_page(pool.acquire(name, rules))
+
+    try:
+        yield page
+    except Exception as e:
+        logger.exception(e)
+        # The scraper may have moved to a renewed context, see `renew_page`
+        screenshot_path: str = _take_screenshot(next(reversed(pool.pages(name)), page))
+        pool.discard(name)
+
+        raise DriverException(screenshot_path)
+    finally:
+        for open_page in [page, *pool.pages(name)]:
+            if not open_page.is_closed():
+                open_page.close()
+
+
+def renew_page(
+    name: str = DEFAULT_CONTEXT_NAME, rules: type[RouteRules] = RouteRules
+) -> Page:
+    """Replace the context owned by `name` with a fresh one, dropping its
+    cookies, storage and init scripts. Meant to be used inside `session`,
+    which closes the returned page.
+
+    Args:
+        name (str, optional): Context owner. Defaults to DEFAULT_CONTEXT_NAME.
+        rules (type[RouteRules], optional): Requests to block in the new
+            context. Defaults to RouteRules.
+
+    Returns:
+        Page: Page of the new context
+    """
+    pool: BrowserPool = get_pool()
+    pool.discard(name)
+
+    return _new_page(pool.acquire(name, rules))
+
+
+def _new_page(context: BrowserContext) -> Page:
+    page: Page = context.new_page()
+    page.set_default_timeout(settings.BROWSER_WAIT_TIMEOUT)
+
+    return page
+
+
+def _match_domain(host: str, domains: tuple[str, ...]) -> bool:
+    return any(host == domain or host.endswith(f".{domain}") for domain in domains)
+
+
+def _browser_memory_mb() -> float:
+    """Resident memory of every process spawned by this one, which accounts for
+    the Playwright driver and Chromium. Returns 0 where /proc is not available.
+
+    Returns:
+        float: Resident memory in MB
+    """
+    proc = Path("/proc")
+    if not proc.is_dir():
+        return 0.0
+
+    children: dict[int, list[int]] = {}
+    rss_pages: dict[int, int] = {}
+    for stat_file in proc.glob("[0-9]*/stat"):
         try:
-            yield page
-        except Exception as e:
-            logger.exception(e)
-            screenshot_path: str = _take_screenshot(page)
+            fields: list[str] = stat_file.read_text().rsplit(")", 1)[1].split()
+        except (OSError, IndexError):
+            continue
+
+        pid = int(stat_file.parent.name)
+        children.setdefault(int(fields[1]), []).append(pid)
+        rss_pages[pid] = int(fields[21])
+
+    total_pages: int = 0
+    pending: list[int] = list(children.get(os.getpid(), []))
+    while pending:
+        pid: int = pending.pop()
+        total_pages += rss_pages.get(pid, 0)
+        pending.extend(children.get(pid, []))
 
-            raise DriverException(screenshot_path)
-        finally:
-            browser.close()
+    return total_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
 
 
 def _take_screenshot(page: Page) -> str:
@@ -68,7 +527,7 @@ def _take_screenshot(page: Page) -> str:
     screenshot_path: str = f"{IOResources.SCREENSHOTS_PATH}/browser-{date_now}.png"
 
     image_data: bytes = page.screenshot(full_page=True)
-    saved_path: str = storage.save_image(image_data, screenshot_path)
+    saved_path: str = get_storage().save_image(image_data, screenshot_path)
 
     logger.info(f"\N{CAMERA} Browser screenshot saved at: {saved_path}")
     return saved_path
@@ -0,0 +1,104 @@
+import json
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from pydantic import BaseModel
+
+from vigilant import logger
+from vigilant.common.values import settings
+
+
+class CacheStats(BaseModel):
+    hits: int
+    misses: int
+    keys: list[str]
+
+
+class ReferenceDataCache:
+    """Process-wide TTL cache for reference data shared by every scraper,
+    optionally persisted in a local JSON file so later processes reuse it.
+
+    Lookups of a missing key are serialized, so concurrent scrapers trigger a
+    single fetch.
+    """
+
+    def __init__(
+        self,
+        ttl: float = settings.REFERENCE_DATA_TTL,
+        path: str | None = settings.REFERENCE_DATA_CACHE_PATH,
+    ):
+        self.ttl = ttl
+        self.path: Path | None = Path(path) if path else None
+
+        self._entries: dict[str, tuple[float, Any]] = self._read_persisted()
+        self._lock = threading.Lock()
+
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def get(self, key: str, loader: Callable[[], Any]) -> Any:
+        """Get the value of `key`, calling `loader` when it is missing or expired
+
+        Args:
+            key (str): Reference data name
+            loader (Callable[[], Any]): Fetches the value, it must be JSON
+                serializable when the cache is persisted
+
+        Returns:
+            Any: Cached value
+        """
+        with self._lock:
+            entry: tuple[float, Any] | None = self._entries.get(key)
+            if entry is not None and entry[0] > time.time():
+                self.hits += 1
+                return entry[1]
+
+            self.misses += 1
+            value: Any = loader()
+            self._entries[key] = (time.time() + self.ttl, value)
+            self._write_persisted()
+
+            return value
+
+    def invalidate(self, key: str | None = None) -> None:
+        """Drop `key`, or every entry when no key is given
+
+        Args:
+            key (str | None, optional): Reference data name. Defaults to None.
+        """
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+            self._write_persisted()
+
+    def stats(self) -> CacheStats:
+        return CacheStats(hits=self.hits, misses=self.misses, keys=list(self._entries))
+
+    def _read_persisted(self) -> dict[str, tuple[float, Any]]:
+        if self.path is None or not self.path.is_file():
+            return {}
+
+        try:
+            return {
+                key: (expires_at, value)
+                for key, (expires_at, value) in json.loads(
+                    self.path.read_text()
+                ).items()
+            }
+        except (ValueError, TypeError):
+            logger.warning(f"Ignoring unreadable reference data cache: {self.path}")
+            return {}
+
+    def _write_persisted(self) -> None:
+        if self.path is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.write_text(json.dumps(self._entries))
+
+
+reference_data = ReferenceDataCache()
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Final
+
+from vigilant import logger
+
+if TYPE_CHECKING:
+    import gspread
+    from google.auth.credentials import Credentials
+    from google.auth.transport.requests import AuthorizedSession, Request
+    from google.cloud import storage
+
+SCOPES: Final[tuple[str, ...]] = (
+    "https://www.googleapis.com/auth/spreadsheets",
+    "https://www.googleapis.com/auth/drive",
+    "https://www.googleapis.com/auth/devstorage.read_write",
+)
+REFRESH_MARGIN: Final[timedelta] = timedelta(minutes=5)
+
+
+class GoogleClients:
+    """Process-wide registry of authorized Google clients. Credentials are
+    loaded once and refreshed before they expire, and every client shares the
+    same authorized HTTP session, so connections are pooled across calls.
+
+    Google libraries are imported on first use, they are slow to import and
+    not needed to start the service.
+    """
+
+    def __init__(self, refresh_margin: timedelta = REFRESH_MARGIN):
+        self.refresh_margin = refresh_margin
+
+        self._credentials: Credentials | None = None
+        self._project: str | None = None
+        self._session: AuthorizedSession | None = None
+        self._refresh_request: Request | None = None
+        self._sheets: gspread.Client | None = None
+        self._storage: storage.Client | None = None
+        self._lock = threading.RLock()
+
+    def credentials(self) -> Credentials:
+        """Application default credentials, refreshed when about to expire
+
+        Returns:
+            Credentials: Valid credentials
+        """
+        with self._lock:
+            credentials: Credentials = self._load()
+
+            if self._must_refresh(credentials):
+                logger.debug("Refreshing Google credentials ...")
+                if self._refresh_request is None:
+                    import requests
+                    from google.auth.transport.requests import Request
+
+                    self._refresh_request = Request(requests.Session())
+                credentials.refresh(self._refresh_request)
+
+            return credentials
+
+    def session(self) -> AuthorizedSession:
+        """HTTP session shared by every client
+
+        Returns:
+            AuthorizedSession: Authorized session
+        """
+        with self._lock:
+            if self._session is None:
+                from google.auth.transport.requests import AuthorizedSession
+
+                self._session = AuthorizedSession(self._load())
+
+            return self._session
+
+    def sheets(self) -> gspread.Client:
+        """Authorized Sheets client
+
+        Returns:
+            gspread.Client: Sheets client
+        """
+        with self._lock:
+            credentials: Credentials = self.credentials()
+            if self._sheets is None:
+                import gspread
+
+                self._sheets = gspread.authorize(credentials, session=self.session())
+
+            return self._sheets
+
+    def storage(self) -> storage.Client:
+        """Authorized Cloud Storage client
+
+        Returns:
+            storage.Client: Cloud Storage client
+        """
+        with self._lock:
+            credentials: Credentials = self.credentials()
+            if self._storage is None:
+                from google.cloud import storage
+
+                self._storage = storage.Client(
+                    project=self._project,
+                    credentials=credentials,
+                    _http=self.session(),
+                )
+
+            return self._storage
+
+    def close(self) -> None:
+        """Close the HTTP session and forget every client"""
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+
+            self._credentials = self._project = self._session = None
+            self._refresh_request = None
+            self._sheets = self._storage = None
+
+    def _load(self) -> Credentials:
+        if self._credentials is None:
+            import google.auth
+
+            self._credentials, self._project = google.auth.default(scopes=SCOPES)
+
+        return self._credentials
+
+    def _must_refresh(self, credentials: Credentials) -> bool:
+        if not credentials.token:
+            return True
+        if credentials.expiry is None:
+            return False
+
+        # google-auth keeps `expiry` as a naive UTC datetime
+        expiry: datetime = credentials.expiry.replace(tzinfo=timezone.utc)
+
+        return expiry - datetime.now(timezone.utc) < self.refresh_margin
+
+
+google_clients = GoogleClients()
@@ -0,0 +1,65 @@
+import math
+import time
+from typing import Final
+
+MIN_TIMEOUT: Final[float] = 1.0
+
+
+class Deadline:
+    """Point in time work has to be finished by, split into budgets for the
+    parts of the work. Without seconds it never expires.
+    """
+
+    def __init__(self, seconds: float | None = None):
+        self.expires_at: float = (
+            math.inf if seconds is None else time.monotonic() + seconds
+        )
+
+    @property
+    def remaining(self) -> float:
+        """Seconds left, infinite for a deadline that never expires"""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining == 0.0
+
+    def child(self, seconds: float) -> "Deadline":
+        """Budget of a part of the work, it never outlives this deadline
+
+        Args:
+            seconds (float): Budget of the part
+
+        Returns:
+            Deadline: Deadline of the part
+        """
+        child = Deadline()
+        child.expires_at = min(self.expires_at, time.monotonic() + seconds)
+
+        return child
+
+    def before(self, seconds: float) -> "Deadline":
+        """Deadline `seconds` earlier, keeping them for the work coming after
+
+        Args:
+            seconds (float): Seconds reserved
+
+        Returns:
+            Deadline: Earlier deadline
+        """
+        earlier = Deadline()
+        earlier.expires_at = self.expires_at - seconds
+
+        return earlier
+
+    def timeout(self, cap: float) -> float:
+        """Playwright timeout bounded by the deadline. Playwright reads 0 as no
+        timeout at all, so it is at least MIN_TIMEOUT.
+
+        Args:
+            cap (float): Timeout wanted, in milliseconds
+
+        Returns:
+            float: Timeout in milliseconds
+        """
+        return max(MIN_TIMEOUT, min(cap, self.remaining * 1000))
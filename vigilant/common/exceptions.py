@@ -25,3 +25,39 @@ class DownloadTimeout(DataCollectorException):
 
     def __init__(self, timeout: float):
         self.message = f"Download timeout reached. ({timeout} sec)"
+
+
+class CircuitOpen(DataCollectorException):
+    """Scraper skipped, its bank portal failed too many times in a row"""
+
+    def __init__(self, scraper: str, retry_in: float):
+        self.message = (
+            f"{scraper} failed too many times in a row, "
+            f"skipping it for {retry_in:.0f} more seconds"
+        )
+
+
+class DeadlineExceeded(DataCollectorException):
+    """Scraper cancelled, the run ran out of time"""
+
+    def __init__(self, scraper: str):
+        self.message = f"{scraper} cancelled, it ran out of its time budget"
+
+
+class IncompleteRun(VigilantException):
+    """Some banks were not collected, because the run ran out of time or their
+    circuit was open. The spreadsheet only got the other banks.
+    """
+
+    def __init__(self, scrapers: list[str]):
+        self.message = (
+            f"Run incomplete, {', '.join(scrapers)} not collected. "
+            "The spreadsheet only has the other banks"
+        )
+
+
+class AttachedRunFailed(VigilantException):
+    """The run in progress, attached to instead of starting a new one, failed"""
+
+    def __init__(self, run_id: str, error: str | None):
+        self.message = f"Attached run {run_id} failed: {error}"
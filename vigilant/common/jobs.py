@@ -0,0 +1,160 @@
+import threading
+import uuid
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timezone
+from enum import StrEnum
+from typing import Optional
+
+from pydantic import BaseModel, Field, computed_field
+
+from vigilant import logger
+from vigilant.common.exceptions import VigilantException
+from vigilant.common.values import settings
+
+
+class JobStatus(StrEnum):
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class Job(BaseModel):
+    id: str = Field(default_factory=lambda: uuid.uuid4().hex)
+    key: Optional[str] = None
+    status: JobStatus = JobStatus.PENDING
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = None
+
+    @computed_field
+    @property
+    def duration(self) -> Optional[float]:
+        """Seconds spent running the job
+
+        Returns:
+            Optional[float]: Duration, None while the job has not finished
+        """
+        if self.started_at is None or self.finished_at is None:
+            return None
+
+        return (self.finished_at - self.started_at).total_seconds()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (JobStatus.SUCCEEDED, JobStatus.FAILED)
+
+
+class JobManager:
+    """Runs jobs one at a time in a background thread and keeps the latest
+    `history` of them for status queries
+    """
+
+    def __init__(self, history: int = settings.JOB_HISTORY_SIZE):
+        self.history = history
+
+        self._jobs: OrderedDict[str, Job] = OrderedDict()
+        self._futures: dict[str, Future] = {}
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="job")
+        self._lock = threading.Lock()
+
+    def submit(self, task: Callable[[], None], key: str | None = None) -> Job:
+        """Queue `task` in a new job. When a job with the same `key` is still
+        pending or running, that job is returned instead.
+
+        Args:
+            task (Callable[[], None]): Work to run
+            key (str | None, optional): Deduplication key. Defaults to None.
+
+        Returns:
+            Job: Created or in-progress job
+        """
+        with self._lock:
+            for job in self._jobs.values():
+                if key is not None and job.key == key and not job.finished:
+                    logger.info(f"Attaching to job {job.id} in progress")
+                    return job
+
+            job = Job(key=key)
+            self._jobs[job.id] = job
+            self._futures[job.id] = self._executor.submit(self._run, job, task)
+            self._evict()
+
+        logger.info(f"Job {job.id} queued")
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        """Get a job of the history
+
+        Args:
+            job_id (str): Job ID
+
+        Returns:
+            Job | None: Job, None when it is unknown or was evicted
+        """
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def wait(self, job_id: str, timeout: float | None = None) -> Job | None:
+        """Block until a job finishes
+
+        Args:
+            job_id (str): Job ID
+            timeout (float | None, optional): Seconds to wait. Defaults to None.
+
+        Returns:
+            Job | None: Job, None when it is unknown or was evicted
+        """
+        with self._lock:
+            future: Future | None = self._futures.get(job_id)
+
+        if future is not None:
+            future.result(timeout)
+
+        return self.get(job_id)
+
+    def shutdown(self, cleanup: Callable[[], None] | None = None) -> None:
+        """Wait for the queued jobs and stop the worker thread
+
+        Args:
+            cleanup (Callable[[], None] | None, optional): Run in the worker
+                thread after the last job, to release resources bound to it.
+                Defaults to None.
+        """
+        if cleanup is not None:
+            self._executor.submit(cleanup)
+
+        self._executor.shutdown(wait=True)
+
+    def _run(self, job: Job, task: Callable[[], None]) -> None:
+        job.started_at = datetime.now(timezone.utc)
+        job.status = JobStatus.RUNNING
+        logger.info(f"Job {job.id} started")
+
+        status: JobStatus = JobStatus.FAILED
+        try:
+            task()
+            status = JobStatus.SUCCEEDED
+        except VigilantException as e:
+            job.error = str(e)
+        except Exception as e:
+            logger.exception(f"Job {job.id} crashed")
+            job.error = repr(e)
+        finally:
+            job.finished_at = datetime.now(timezone.utc)
+            job.status = status
+            logger.info(f"Job {job.id} {job.status} in {job.duration:.1f}s")
+
+    def _evict(self) -> None:
+        finished: list[str] = [
+            job_id for job_id, job in self._jobs.items() if job.finished
+        ]
+        for job_id in finished[: max(0, len(self._jobs) - self.history)]:
+            del self._jobs[job_id]
+            del self._futures[job_id]
+
+
+jobs = JobManager()
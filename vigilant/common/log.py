@@ -1,11 +1,23 @@
+import atexit
+import copy
+import json
 import logging
-from typing import Final
+import queue
+from collections.abc import Iterator, MutableMapping
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Final
 
 from vigilant.common.values import settings
 
 APP_NAME: Final[str] = "Vigilant"
 LOG_LEVEL: Final[str] = "LOG_LEVEL"
 DEFAULT_LOG_LEVEL: Final[int] = 20
+JSON_FORMAT: Final[str] = "json"
+
+run_id: ContextVar[str | None] = ContextVar("run_id", default=None)
 
 
 class _DefaultContextFilter(logging.Filter):
@@ -14,28 +26,110 @@ class _DefaultContextFilter(logging.Filter):
             record.role = "App"
         if not hasattr(record, "entity"):
             record.entity = APP_NAME
+        if not hasattr(record, "run_id"):
+            record.run_id = run_id.get()
         return True
 
 
+class ContextAdapter(logging.LoggerAdapter):
+    """Logger adapter merging its context with the `extra` of each call,
+    instead of replacing it
+    """
+
+    def process(
+        self, msg: Any, kwargs: MutableMapping[str, Any]
+    ) -> tuple[Any, MutableMapping[str, Any]]:
+        kwargs["extra"] = {**self.extra, **kwargs.get("extra", {})}
+        return msg, kwargs
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON document per record, with the fields Cloud Logging reads
+    (`severity`, `message`, `time`) and the context fields at the top level
+    """
+
+    FIELDS: Final[tuple[str, ...]] = ("role", "entity", "run_id", "step", "duration")
+
+    def format(self, record: logging.LogRecord) -> str:
+        document: dict[str, Any] = {
+            "severity": record.levelname,
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        document |= {
+            field: getattr(record, field)
+            for field in self.FIELDS
+            if getattr(record, field, None) is not None
+        }
+        if record.exc_info:
+            document["exception"] = self.formatException(record.exc_info)
+
+        return json.dumps(document, default=str)
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """Queues records without formatting them, the listener thread does it"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg, record.args = record.getMessage(), None
+
+        return record
+
+
 def build_logger() -> logging.Logger:
-    formatter = logging.Formatter(
-        "%(levelname)s - [%(asctime)s] - %(role)s - %(entity)s - %(message)s",
-        "%Y-%m-%d %H:%M:%S",
-    )
+    """Configure the root logger. Records are queued and written by a
+    background thread, so logging never blocks on a slow stream. The queue is
+    drained when the process exits.
 
+    Returns:
+        logging.Logger: Root logger
+    """
     handler = logging.StreamHandler()
-    handler.setFormatter(formatter)
-    handler.addFilter(_DefaultContextFilter())
+    handler.setFormatter(_build_formatter())
+
+    listener = QueueListener(queue.SimpleQueue(), handler)
+    queue_handler = _DeferredQueueHandler(listener.queue)
+    queue_handler.addFilter(_DefaultContextFilter())
+    queue_handler.listener = listener
 
     logger = logging.getLogger()
-    logger.addHandler(handler)
+    logger.addHandler(queue_handler)
 
     log_level: int = _get_loglevel()
     logger.setLevel(log_level)
 
+    listener.start()
+    atexit.register(listener.stop)
+
     return logger
 
 
+@contextmanager
+def bind_run_id(value: str) -> Iterator[None]:
+    """Tag the records logged in the block with a run ID
+
+    Args:
+        value (str): Run ID
+    """
+    token = run_id.set(value)
+    try:
+        yield
+    finally:
+        run_id.reset(token)
+
+
+def _build_formatter() -> logging.Formatter:
+    if settings.LOG_FORMAT.lower() == JSON_FORMAT:
+        return JsonFormatter()
+
+    return logging.Formatter(
+        "%(levelname)s - [%(asctime)s] - %(role)s - %(entity)s - %(message)s",
+        "%Y-%m-%d %H:%M:%S",
+    )
+
+
 def _get_loglevel() -> int:
     log_level: str | int = settings.LOG_LEVEL or DEFAULT_LOG_LEVEL
 
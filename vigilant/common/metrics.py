@@ -0,0 +1,267 @@
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import ClassVar, Final, TypeVar
+
+CONTENT_TYPE: Final[str] = "text/plain; version=0.0.4; charset=utf-8"
+DEFAULT_BUCKETS: Final[tuple[float, ...]] = (
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+    120.0,
+)
+
+LabelValues = tuple[str, ...]
+
+
+class Metric(ABC):
+    """Named family of samples, one per combination of label values"""
+
+    type: ClassVar[str]
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...]):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+
+        self._lock = threading.Lock()
+
+    def render(self) -> list[str]:
+        """Samples in the Prometheus text exposition format
+
+        Returns:
+            list[str]: HELP and TYPE lines, followed by the samples
+        """
+        with self._lock:
+            samples: list[str] = self._samples()
+
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type}",
+            *samples,
+        ]
+
+    @abstractmethod
+    def reset(self) -> None: ...
+
+    @abstractmethod
+    def _samples(self) -> list[str]: ...
+
+    def _label_values(self, labels: dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(
+                f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}"
+            )
+
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _format(self, suffix: str, values: LabelValues, value: float, **extra) -> str:
+        labels: dict[str, str] = dict(zip(self.labelnames, values)) | extra
+        rendered: str = ",".join(
+            f'{name}="{_escape(value)}"' for name, value in labels.items()
+        )
+
+        return (
+            f"{self.name}{suffix}{{{rendered}}} {_number(value)}"
+            if rendered
+            else f"{self.name}{suffix} {_number(value)}"
+        )
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        """Increase the counter of the given label values
+
+        Args:
+            amount (float, optional): Increment. Defaults to 1.0.
+        """
+        key: LabelValues = self._label_values(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        with self._lock:
+            return self._values.get(self._label_values(labels), 0.0)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+    def _samples(self) -> list[str]:
+        return [self._format("", key, value) for key, value in self._values.items()]
+
+
+class _HistogramSeries:
+    def __init__(self, buckets: int):
+        self.counts: list[int] = [0] * buckets
+        self.sum: float = 0.0
+        self.count: int = 0
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series: dict[LabelValues, _HistogramSeries] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        """Record an observation for the given label values
+
+        Args:
+            value (float): Observed value, usually seconds
+        """
+        key: LabelValues = self._label_values(labels)
+        with self._lock:
+            series = self._series.setdefault(key, _HistogramSeries(len(self.buckets)))
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series.counts[index] += 1
+            series.sum += value
+            series.count += 1
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """Observe the seconds spent in the block, even when it fails"""
+        start: float = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels: str) -> int:
+        with self._lock:
+            series = self._series.get(self._label_values(labels))
+            return series.count if series is not None else 0
+
+    def reset(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+    def _samples(self) -> list[str]:
+        samples: list[str] = []
+        for key, series in self._series.items():
+            samples.extend(
+                self._format("_bucket", key, count, le=_number(bound))
+                for bound, count in zip(self.buckets, series.counts)
+            )
+            samples.append(self._format("_bucket", key, series.count, le="+Inf"))
+            samples.append(self._format("_sum", key, series.sum))
+            samples.append(self._format("_count", key, series.count))
+
+        return samples
+
+
+M = TypeVar("M", bound=Metric)
+
+
+class MetricsRegistry:
+    """In-process registry of metrics, rendered for Prometheus scrapes"""
+
+    def __init__(self):
+        self._metrics: dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def counter(
+        self, name: str, documentation: str, labelnames: tuple[str, ...] = ()
+    ) -> Counter:
+        """Get the counter called `name`, registering it on first use
+
+        Args:
+            name (str): Metric name, by convention ending in `_total`
+            documentation (str): HELP text
+            labelnames (tuple[str, ...], optional): Labels. Defaults to none.
+
+        Returns:
+            Counter: Registered counter
+        """
+        return self._register(Counter, name, documentation, labelnames)
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        """Get the histogram called `name`, registering it on first use
+
+        Args:
+            name (str): Metric name, by convention ending in the unit
+            documentation (str): HELP text
+            labelnames (tuple[str, ...], optional): Labels. Defaults to none.
+            buckets (tuple[float, ...], optional): Upper bounds. Defaults to
+                DEFAULT_BUCKETS.
+
+        Returns:
+            Histogram: Registered histogram
+        """
+        return self._register(Histogram, name, documentation, labelnames, buckets)
+
+    def render(self) -> str:
+        """Every metric in the Prometheus text exposition format
+
+        Returns:
+            str: Exposition document
+        """
+        with self._lock:
+            metrics: list[Metric] = sorted(self._metrics.values(), key=_metric_name)
+
+        return "".join(f"{line}\n" for metric in metrics for line in metric.render())
+
+    def reset(self) -> None:
+        """Drop the samples of every metric, keeping them registered"""
+        with self._lock:
+            for metric in self._metrics.values():
+                metric.reset()
+
+    def _register(self, cls: type[M], name: str, documentation: str, *args) -> M:
+        with self._lock:
+            metric: Metric | None = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, documentation, *args)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"{name} is already registered as a {metric.type}")
+
+            return metric
+
+
+def _metric_name(metric: Metric) -> str:
+    return metric.name
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+metrics = MetricsRegistry()
@@ -4,6 +4,15 @@ from datetime import datetime
 from pydantic import BaseModel
 
 
+class CollectionResult(BaseModel):
+    """Outcome of a collection. Only the listed outputs are loaded: scrapers
+    left behind past the deadline may still write theirs.
+    """
+
+    outputs: list[str] = []
+    skipped: list[str] = []
+
+
 class AccountReport(BaseModel):
     accounts: list[AccountData]
 
@@ -52,3 +61,8 @@ class Transaction(BaseModel):
             list[str, int]: Transaction data as a list
         """
         return list(self.model_dump().values())
+
+
+class SpreadsheetSnapshot(BaseModel):
+    key: str
+    expenses: list[list[str | int | float]]
@@ -0,0 +1,106 @@
+import fcntl
+import uuid
+from collections.abc import Callable
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+from pydantic import BaseModel, Field, ValidationError
+
+from vigilant import logger
+from vigilant.common.exceptions import AttachedRunFailed
+from vigilant.common.values import IOResources
+
+
+class RunResult(BaseModel):
+    run_id: str
+    succeeded: bool
+    finished_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    error: Optional[str] = None
+
+
+class SingleFlight:
+    """Lets a single run of a task happen at a time across threads and
+    processes sharing `lock_path`. Callers arriving while a run is in
+    progress wait for it and get its result instead of running the task again.
+
+    The local file lock stands in for a distributed one, it only coordinates
+    runs sharing the same file system.
+    """
+
+    def __init__(
+        self,
+        lock_path: Path = IOResources.LOCK_PATH,
+        result_path: Path = IOResources.LAST_RUN_PATH,
+    ):
+        self.lock_path = lock_path
+        self.result_path = result_path
+
+    def run(self, task: Callable[[str], None]) -> RunResult:
+        """Run `task`, or attach to the run in progress
+
+        Args:
+            task (Callable[[str], None]): Work to run, called with the run ID
+
+        Raises:
+            AttachedRunFailed: The run attached to failed
+
+        Returns:
+            RunResult: Result of the run
+        """
+        self.lock_path.parent.mkdir(parents=True, exist_ok=True)
+
+        with self.lock_path.open("a+") as lock_file:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return self._attach(lock_file)
+
+            try:
+                return self._lead(lock_file, task)
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _lead(self, lock_file, task: Callable[[str], None]) -> RunResult:
+        run_id: str = uuid.uuid4().hex
+        lock_file.truncate(0)
+        lock_file.write(run_id)
+        lock_file.flush()
+
+        try:
+            task(run_id)
+        except Exception as e:
+            self._save(RunResult(run_id=run_id, succeeded=False, error=str(e)))
+            raise
+
+        return self._save(RunResult(run_id=run_id, succeeded=True))
+
+    def _attach(self, lock_file) -> RunResult:
+        logger.info("Run in progress, waiting for its result ...")
+
+        # Holding the shared lock, no new run can start while reading its result
+        fcntl.flock(lock_file, fcntl.LOCK_SH)
+        try:
+            lock_file.seek(0)
+            run_id: str = lock_file.read()
+            result: RunResult | None = self._load()
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+        if result is None or result.run_id != run_id:
+            raise AttachedRunFailed(run_id, "no result was recorded")
+        if not result.succeeded:
+            raise AttachedRunFailed(run_id, result.error)
+
+        return result
+
+    def _save(self, result: RunResult) -> RunResult:
+        self.result_path.write_text(result.model_dump_json())
+
+        return result
+
+    def _load(self) -> RunResult | None:
+        try:
+            return RunResult.model_validate_json(self.result_path.read_text())
+        except (FileNotFoundError, ValidationError):
+            return None
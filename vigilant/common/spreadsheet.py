@@ -1,7 +1,216 @@
 from __future__ import annotations
 
-import google.auth
+import copy
+import random
+import threading
+import time
+from collections.abc import Callable, Generator, Hashable
+from concurrent.futures import Future
+from contextlib import contextmanager
+from functools import partial
+from typing import Any, Final
+
 import gspread
+from gspread.exceptions import APIError
+from gspread.utils import (
+    ValueRenderOption,
+    a1_range_to_grid_range,
+    a1_to_rowcol,
+    absolute_range_name,
+    rowcol_to_a1,
+)
+from pydantic import BaseModel
+
+from vigilant import logger
+from vigilant.common.clients import google_clients
+from vigilant.common.metrics import Histogram, metrics
+from vigilant.common.tracing import tracer
+from vigilant.common.values import settings
+
+CURRENCY_FORMAT: Final[dict[str, Any]] = {
+    "numberFormat": {
+        "type": "NUMBER",
+        "pattern": '_ "$"* #,##0_ ;_ "$"* \-#,##0_ ;_ "$"* "-"_ ;_ @_ ',
+    },
+}
+
+RETRYABLE_STATUS: Final[frozenset[int]] = frozenset({429, 500, 502, 503, 504})
+
+REQUEST_SECONDS: Final[Histogram] = metrics.histogram(
+    "vigilant_sheets_request_seconds",
+    "Latency of Sheets API requests, each retry observed on its own",
+    ("operation",),
+)
+
+
+class TokenBucket:
+    """Allows `rate` requests per second on average, with bursts of up to
+    `capacity` requests
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+
+        self._tokens: float = capacity
+        self._updated_at: float = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take a token, waiting until one is available
+
+        Returns:
+            float: Seconds waited
+        """
+        with self._lock:
+            now: float = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated_at) * self.rate
+            )
+            self._updated_at = now
+
+            self._tokens -= 1
+            wait: float = max(0.0, -self._tokens / self.rate)
+
+        if wait:
+            time.sleep(wait)
+
+        return wait
+
+
+class ClientStats(BaseModel):
+    requests: int
+    throttled: int
+    throttle_seconds: float
+    retries: int
+    coalesced: int
+    latency_seconds: dict[str, float]
+
+
+class SheetsClient:
+    """Sends Sheets API calls through a token bucket shared by the process,
+    retrying quota (429) and server (5xx) errors with jittered exponential
+    backoff. Concurrent reads of the same range share one request.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: int = settings.SHEETS_REQUESTS_PER_MINUTE,
+        max_retries: int = settings.SHEETS_MAX_RETRIES,
+        backoff_base: float = settings.SHEETS_BACKOFF_BASE,
+        backoff_max: float = settings.SHEETS_BACKOFF_MAX,
+    ):
+        self.bucket = TokenBucket(requests_per_minute / 60, requests_per_minute)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        self._in_flight: dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+
+        self.requests: int = 0
+        self.throttled: int = 0
+        self.throttle_seconds: float = 0.0
+        self.retries: int = 0
+        self.coalesced: int = 0
+        self.latency_seconds: dict[str, float] = {}
+
+    def call(self, operation: str, request: Callable[[], Any]) -> Any:
+        """Send a request once the bucket allows it, retrying retryable errors
+
+        Args:
+            operation (str): Name the latency is accounted under
+            request (Callable[[], Any]): Sends the request
+
+        Returns:
+            Any: Response of the request
+        """
+        with tracer.span(f"sheets.{operation}") as span:
+            attempt: int = 0
+            while True:
+                self._throttle()
+
+                span.set_attribute("attempts", attempt + 1)
+                start: float = time.perf_counter()
+                try:
+                    return request()
+                except APIError as e:
+                    if e.code not in RETRYABLE_STATUS or attempt == self.max_retries:
+                        raise
+
+                    delay: float = self._backoff(attempt)
+                    logger.warning(
+                        f"Sheets {operation} failed with HTTP {e.code}, "
+                        f"retrying in {delay:.1f}s ..."
+                    )
+                    with self._lock:
+                        self.retries += 1
+                    time.sleep(delay)
+                    attempt += 1
+                finally:
+                    elapsed: float = time.perf_counter() - start
+                    REQUEST_SECONDS.observe(elapsed, operation=operation)
+                    with self._lock:
+                        self.latency_seconds[operation] = (
+                            self.latency_seconds.get(operation, 0.0) + elapsed
+                        )
+
+    def read(self, key: Hashable, request: Callable[[], Any]) -> Any:
+        """Send a read, or wait for the same one when it is already in flight
+
+        Args:
+            key (Hashable): Identifies the spreadsheet range read
+            request (Callable[[], Any]): Sends the request
+
+        Returns:
+            Any: Response of the request
+        """
+        with self._lock:
+            future: Future | None = self._in_flight.get(key)
+            leader: bool = future is None
+            if leader:
+                future = self._in_flight[key] = Future()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            return copy.deepcopy(future.result())
+
+        try:
+            future.set_result(self.call("read", request))
+        except Exception as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+
+        return future.result()
+
+    def stats(self) -> ClientStats:
+        with self._lock:
+            return ClientStats(
+                requests=self.requests,
+                throttled=self.throttled,
+                throttle_seconds=self.throttle_seconds,
+                retries=self.retries,
+                coalesced=self.coalesced,
+                latency_seconds=dict(self.latency_seconds),
+            )
+
+    def _throttle(self) -> None:
+        wait: float = self.bucket.acquire()
+
+        with self._lock:
+            self.requests += 1
+            if wait:
+                self.throttled += 1
+                self.throttle_seconds += wait
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2**attempt))
+
+
+sheets_client = SheetsClient()
 
 
 class SpreadSheet:
@@ -9,10 +218,11 @@ class SpreadSheet:
 
     def __init__(self, spreadsheet=gspread.Spreadsheet):
         self._spreadsheet = spreadsheet
+        self._worksheets: dict[str, gspread.Worksheet] | None = None
 
     @staticmethod
     def load(key: str) -> SpreadSheet:
-        """Login to GCP and returns an authorized spreadsheet instance
+        """Open a spreadsheet with the shared authorized Sheets client
 
         Args:
             key (str): Unique key of the spreadsheet
@@ -20,28 +230,37 @@ class SpreadSheet:
         Returns:
             SpreadSheet: Authorized spreadsheet
         """
-        scopes: list[str] = [
-            "https://www.googleapis.com/auth/spreadsheets",
-            "https://www.googleapis.com/auth/drive",
-        ]
-        credentials, _ = google.auth.default(scopes=scopes)
-        gc: gspread.Client = gspread.authorize(credentials)
+        gc: gspread.Client = google_clients.sheets()
 
-        return SpreadSheet(gc.open_by_key(key))
+        return SpreadSheet(sheets_client.call("open", partial(gc.open_by_key, key)))
 
-    def read(self, worksheet_title: str, range: str) -> list[list[str]]:
+    def read(
+        self, worksheet_title: str, range: str, unformatted: bool = False
+    ) -> list[list[str]]:
         """Reads from a range in a worksheet
 
         Args:
             worksheet_title (str): Title of the worksheet
             range (str): Location from where to read the data
+            unformatted (bool, optional): Read raw values instead of the
+                displayed ones. Defaults to False.
 
         Returns:
             list[list[str]]: Data from the range
         """
-        worksheet: gspread.Worksheet = self._spreadsheet.worksheet(worksheet_title)
+        worksheet: gspread.Worksheet = self._worksheet(worksheet_title)
 
-        return worksheet.get(range)
+        request: Callable[[], list[list[str]]] = (
+            partial(
+                worksheet.get, range, value_render_option=ValueRenderOption.unformatted
+            )
+            if unformatted
+            else partial(worksheet.get, range)
+        )
+
+        return sheets_client.read(
+            (self._spreadsheet.id, worksheet_title, range, unformatted), request
+        )
 
     def write(self, worksheet_title, range: str, data: list[list[str]]) -> None:
         """Write data into a range of a worksheet
@@ -51,9 +270,9 @@ class SpreadSheet:
             range (str): Location from where to read the data
             data (list[list[str]]): Data to write in cells
         """
-        worksheet: gspread.Worksheet = self._spreadsheet.worksheet(worksheet_title)
+        worksheet: gspread.Worksheet = self._worksheet(worksheet_title)
 
-        worksheet.update(data, range)
+        sheets_client.call("write", partial(worksheet.update, data, range))
 
     def format_currency(self, worksheet_title: str, range: str) -> None:
         """Formats a range of cells as CLP currency
@@ -62,18 +281,203 @@ class SpreadSheet:
             worksheet_title (str): Title of the worksheet
             range (str): Location from where to read the data
         """
-        worksheet: gspread.Worksheet = self._spreadsheet.worksheet(worksheet_title)
+        worksheet: gspread.Worksheet = self._worksheet(worksheet_title)
+
+        sheets_client.call(
+            "format",
+            partial(
+                worksheet.batch_format, [{"range": range, "format": CURRENCY_FORMAT}]
+            ),
+        )
+
+    def ensure_rows(self, worksheet_title: str, rows: int) -> None:
+        """Grow a worksheet so it has at least `rows` rows
+
+        Args:
+            worksheet_title (str): Title of the worksheet
+            rows (int): Minimum number of rows
+        """
+        worksheet: gspread.Worksheet = self._worksheet(worksheet_title)
+
+        if worksheet.row_count < rows:
+            sheets_client.call(
+                "resize", partial(worksheet.add_rows, rows - worksheet.row_count)
+            )
 
-        worksheet.batch_format(
-            [
+    @contextmanager
+    def batch(self, chunk_rows: int | None = None) -> Generator[SpreadSheetBatch]:
+        """Gather clears, writes and formats, sent when leaving the context in
+        one clear, one format update and as few values updates as `chunk_rows`
+        allows
+
+        Args:
+            chunk_rows (int | None, optional): Maximum rows sent per values
+                update. Defaults to None, no limit.
+
+        Yields:
+            SpreadSheetBatch: Batch of pending requests
+        """
+        batch = SpreadSheetBatch(self, chunk_rows)
+        yield batch
+
+        batch.commit()
+
+    def worksheet_id(self, worksheet_title: str) -> int:
+        """Get the ID of a worksheet
+
+        Args:
+            worksheet_title (str): Title of the worksheet
+
+        Returns:
+            int: Worksheet ID
+        """
+        return self._worksheet(worksheet_title).id
+
+    def _worksheet(self, worksheet_title: str) -> gspread.Worksheet:
+        """Get a worksheet. Every worksheet, with its ID, is resolved by the
+        first call, in a single metadata request.
+
+        Args:
+            worksheet_title (str): Title of the worksheet
+
+        Raises:
+            gspread.WorksheetNotFound: No worksheet has this title
+
+        Returns:
+            gspread.Worksheet: Worksheet
+        """
+        if self._worksheets is None:
+            self._worksheets = {
+                worksheet.title: worksheet
+                for worksheet in sheets_client.call(
+                    "metadata", self._spreadsheet.worksheets
+                )
+            }
+
+        if worksheet_title not in self._worksheets:
+            raise gspread.WorksheetNotFound(worksheet_title)
+
+        return self._worksheets[worksheet_title]
+
+
+class SpreadSheetBatch:
+    def __init__(self, spreadsheet: SpreadSheet, chunk_rows: int | None = None):
+        self._spreadsheet = spreadsheet
+        self.chunk_rows = chunk_rows
+        self.clears: list[str] = []
+        self.values: list[dict[str, Any]] = []
+        self.formats: list[tuple[str, str, dict[str, Any]]] = []
+
+    def clear(self, worksheet_title: str, range: str) -> None:
+        """Queue the removal of the values in a range of a worksheet
+
+        Args:
+            worksheet_title (str): Title of the worksheet
+            range (str): Location to clear
+        """
+        self.clears.append(absolute_range_name(worksheet_title, range))
+
+    def write(self, worksheet_title: str, range: str, data: list[list[str]]) -> None:
+        """Queue data to write into a range of a worksheet. Data larger than
+        `chunk_rows` is split into consecutive ranges.
+
+        Args:
+            worksheet_title (str): Title of the worksheet
+            range (str): Location where to write the data, only its top-left
+                cell is used when the data is split
+            data (list[list[str]]): Data to write in cells
+        """
+        if self.chunk_rows is None or len(data) <= self.chunk_rows:
+            self.values.append(
+                {"range": absolute_range_name(worksheet_title, range), "values": data}
+            )
+            return
+
+        row, col = a1_to_rowcol(range.split(":")[0])
+        for offset in _chunk_offsets(len(data), self.chunk_rows):
+            self.values.append(
                 {
-                    "range": range,
-                    "format": {
-                        "numberFormat": {
-                            "type": "NUMBER",
-                            "pattern": '_ "$"* #,##0_ ;_ "$"* \-#,##0_ ;_ "$"* "-"_ ;_ @_ ',
-                        },
-                    },
+                    "range": absolute_range_name(
+                        worksheet_title, rowcol_to_a1(row + offset, col)
+                    ),
+                    "values": data[offset : offset + self.chunk_rows],
                 }
-            ]
-        )
+            )
+
+    def format_currency(self, worksheet_title: str, range: str) -> None:
+        """Queue a CLP currency format for a range of cells
+
+        Args:
+            worksheet_title (str): Title of the worksheet
+            range (str): Location to format
+        """
+        self.formats.append((worksheet_title, range, CURRENCY_FORMAT))
+
+    def commit(self) -> None:
+        """Send the queued clears, writes and formats"""
+        spreadsheet: gspread.Spreadsheet = self._spreadsheet._spreadsheet
+
+        if self.clears:
+            sheets_client.call(
+                "clear",
+                partial(spreadsheet.values_batch_clear, body={"ranges": self.clears}),
+            )
+
+        for values in self._values_chunks():
+            sheets_client.call(
+                "write",
+                partial(
+                    spreadsheet.values_batch_update,
+                    {"valueInputOption": "RAW", "data": values},
+                ),
+            )
+
+        if self.formats:
+            body: dict[str, Any] = {
+                "requests": [
+                    {
+                        "repeatCell": {
+                            "range": a1_range_to_grid_range(
+                                range, self._spreadsheet.worksheet_id(title)
+                            ),
+                            "cell": {"userEnteredFormat": cell_format},
+                            "fields": f"userEnteredFormat({','.join(cell_format)})",
+                        }
+                    }
+                    for title, range, cell_format in self.formats
+                ]
+            }
+            sheets_client.call("format", partial(spreadsheet.batch_update, body))
+
+        self.clears, self.values, self.formats = [], [], []
+
+    def _values_chunks(self) -> Generator[list[dict[str, Any]]]:
+        chunk: list[dict[str, Any]] = []
+        rows: int = 0
+        for value in self.values:
+            if (
+                chunk
+                and self.chunk_rows
+                and rows + len(value["values"]) > self.chunk_rows
+            ):
+                yield chunk
+                chunk, rows = [], 0
+
+            chunk.append(value)
+            rows += len(value["values"])
+
+        if chunk:
+            yield chunk
+
+
+def _chunk_offsets(rows: int, chunk_rows: int) -> range:
+    """Offsets of the first row of each chunk
+
+    Args:
+        rows (int): Total number of rows
+        chunk_rows (int): Rows per chunk
+
+    Returns:
+        range: Chunk offsets
+    """
+    return range(0, rows, chunk_rows)
@@ -1,21 +1,43 @@
-import shutil
+from __future__ import annotations
+
+import functools
 from abc import ABC, abstractmethod
+from contextlib import suppress
 from pathlib import Path
-from typing import Final
+from typing import TYPE_CHECKING, Final
 
-from google.cloud import storage
+from vigilant.common.clients import google_clients
+from vigilant.common.metrics import Histogram, metrics
+from vigilant.common.tracing import tracer
+from vigilant.common.values import settings, StorageLocation
 
-from vigilant.common.values import settings, IOResources
+if TYPE_CHECKING:
+    from google.cloud import storage
 
 DEFAULT_PATH: Final[str] = "."
+DEFAULT_CONTENT_TYPE: Final[str] = "application/octet-stream"
+
+UPLOAD_SECONDS: Final[Histogram] = metrics.histogram(
+    "vigilant_gcs_upload_seconds", "Latency of Cloud Storage uploads"
+)
 
 
 class Storage(ABC):
     @abstractmethod
     def save_image(self, data: bytes, path: str) -> str: ...
 
+    @abstractmethod
+    def save_file(self, data: bytes, path: str) -> str: ...
+
+    @abstractmethod
+    def load_file(self, path: str) -> bytes | None: ...
+
+    @abstractmethod
+    def delete_file(self, path: str) -> None: ...
+
 
 class LocalStorage(Storage):
+    @tracer.traced("storage.save_image", backend="local")
     def save_image(self, data: bytes, path: str = DEFAULT_PATH) -> str:
         """Save image in local file system
 
@@ -26,18 +48,52 @@ class LocalStorage(Storage):
         Returns:
             str: Path where the image was saved
         """
-        image_path = Path(path)
-        image_path.parents[0].mkdir(parents=True, exist_ok=True)
+        return self.save_file(data, path)
+
+    def save_file(self, data: bytes, path: str) -> str:
+        """Save file in local file system
+
+        Args:
+            data (bytes): File content
+            path (str): Path where to save the file
+
+        Returns:
+            str: Path where the file was saved
+        """
+        file_path = Path(path)
+        file_path.parents[0].mkdir(parents=True, exist_ok=True)
+
+        file_path.write_bytes(data)
+        return file_path.as_posix()
+
+    def load_file(self, path: str) -> bytes | None:
+        """Read file from local file system
+
+        Args:
+            path (str): Path of the file
+
+        Returns:
+            bytes | None: File content, None when the file does not exist
+        """
+        file_path = Path(path)
+
+        return file_path.read_bytes() if file_path.is_file() else None
 
-        image_path.write_bytes(data)
-        return image_path.as_posix()
+    def delete_file(self, path: str) -> None:
+        """Delete file from local file system, if it exists
+
+        Args:
+            path (str): Path of the file
+        """
+        Path(path).unlink(missing_ok=True)
 
 
 class GoogleCloudStorage(Storage):
     def __init__(self):
-        storage_client = storage.Client()
+        storage_client: storage.Client = google_clients.storage()
         self.bucket: storage.Bucket = storage_client.bucket(settings.BUCKET_NAME)
 
+    @tracer.traced("storage.save_image", backend="gcs")
     def save_image(self, data: bytes, path: str = "") -> str:
         """Save image in GCS bucket
 
@@ -48,11 +104,54 @@ class GoogleCloudStorage(Storage):
         Returns:
             str: URI of the image as GCS object
         """
+        return self.save_file(data, path, content_type="image/png")
+
+    def save_file(
+        self, data: bytes, path: str, content_type: str = DEFAULT_CONTENT_TYPE
+    ) -> str:
+        """Save file in GCS bucket
+
+        Args:
+            data (bytes): File content
+            path (str): Object path
+            content_type (str, optional): MIME type. Defaults to DEFAULT_CONTENT_TYPE.
+
+        Returns:
+            str: URI of the GCS object
+        """
         blob: storage.Blob = self.bucket.blob(path)
-        blob.upload_from_string(data, content_type="image/png")
+        with UPLOAD_SECONDS.time():
+            blob.upload_from_string(data, content_type=content_type)
 
         return self._build_object_uri(path)
 
+    def load_file(self, path: str) -> bytes | None:
+        """Download file from GCS bucket
+
+        Args:
+            path (str): Object path
+
+        Returns:
+            bytes | None: Object content, None when the object does not exist
+        """
+        from google.api_core.exceptions import NotFound
+
+        try:
+            return self.bucket.blob(path).download_as_bytes()
+        except NotFound:
+            return None
+
+    def delete_file(self, path: str) -> None:
+        """Delete file from GCS bucket, if it exists
+
+        Args:
+            path (str): Object path
+        """
+        from google.api_core.exceptions import NotFound
+
+        with suppress(NotFound):
+            self.bucket.blob(path).delete()
+
     @staticmethod
     def _build_object_uri(object_path: str) -> str:
         GCS_BASE_URL: Final[str] = "https://storage.cloud.google.com"
@@ -60,10 +159,15 @@ class GoogleCloudStorage(Storage):
         return f"{GCS_BASE_URL}/{settings.BUCKET_NAME}/{object_path}"
 
 
-def clear_resources() -> None:
-    """Setup resources directory for data persistence"""
-    shutil.rmtree(IOResources.DATA_PATH, ignore_errors=True)
-    shutil.rmtree(IOResources.OUTPUT_PATH, ignore_errors=True)
+@functools.cache
+def get_storage() -> Storage:
+    """Storage of the configured location, created on first use so importing
+    this module does not build any client
+
+    Returns:
+        Storage: Process-wide storage
+    """
+    if settings.STORAGE_LOCATION == StorageLocation.GCS:
+        return GoogleCloudStorage()
 
-    IOResources.DATA_PATH.mkdir(parents=True, exist_ok=True)
-    IOResources.OUTPUT_PATH.mkdir(parents=True, exist_ok=True)
+    return LocalStorage()
@@ -0,0 +1,255 @@
+import functools
+import secrets
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Final, Optional, TypeVar
+
+from pydantic import BaseModel, Field
+
+from vigilant import logger
+from vigilant.common.values import settings
+
+SERVICE_NAME: Final[str] = "vigilant"
+BUFFER_SIZE: Final[int] = 512
+OTLP_TIMEOUT: Final[float] = 5.0
+
+F = TypeVar("F", bound=Callable)
+
+
+class Span(BaseModel):
+    name: str
+    trace_id: str = Field(default_factory=lambda: secrets.token_hex(16))
+    span_id: str = Field(default_factory=lambda: secrets.token_hex(8))
+    parent_id: Optional[str] = None
+    start_ns: int = Field(default_factory=time.time_ns)
+    end_ns: Optional[int] = None
+    attributes: dict[str, Any] = Field(default_factory=dict)
+    error: Optional[str] = None
+
+    @property
+    def duration(self) -> float | None:
+        """Seconds spent in the span
+
+        Returns:
+            float | None: Duration, None while the span is open
+        """
+        return None if self.end_ns is None else (self.end_ns - self.start_ns) / 1e9
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+
+class SpanExporter(ABC):
+    @abstractmethod
+    def export(self, spans: list[Span]) -> None: ...
+
+
+class JsonLinesExporter(SpanExporter):
+    """Appends one JSON document per span to a local file"""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, spans: list[Span]) -> None:
+        """Write spans at the end of the file
+
+        Args:
+            spans (list[Span]): Finished spans
+        """
+        lines: str = "".join(f"{span.model_dump_json()}\n" for span in spans)
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a") as file:
+                file.write(lines)
+
+
+class OtlpExporter(SpanExporter):
+    """Sends spans to an OpenTelemetry collector, through OTLP/HTTP with its
+    JSON encoding, so no OpenTelemetry SDK is needed
+    """
+
+    def __init__(self, endpoint: str, timeout: float = OTLP_TIMEOUT):
+        import requests
+
+        self.url = f"{endpoint.rstrip('/')}/v1/traces"
+        self.timeout = timeout
+        self._session = requests.Session()
+
+    def export(self, spans: list[Span]) -> None:
+        """Post spans to the collector, failures are logged and the spans lost
+
+        Args:
+            spans (list[Span]): Finished spans
+        """
+        import requests
+
+        try:
+            response = self._session.post(
+                self.url, json=self.payload(spans), timeout=self.timeout
+            )
+            response.raise_for_status()
+        except requests.RequestException as e:
+            logger.warning(f"Could not export {len(spans)} spans: {e}")
+
+    @staticmethod
+    def payload(spans: list[Span]) -> dict:
+        """OTLP `ExportTraceServiceRequest` of the spans
+
+        Args:
+            spans (list[Span]): Finished spans
+
+        Returns:
+            dict: Request body
+        """
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": _otlp_attributes({"service.name": SERVICE_NAME})
+                    },
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": SERVICE_NAME},
+                            "spans": [_otlp_span(span) for span in spans],
+                        }
+                    ],
+                }
+            ]
+        }
+
+
+class Tracer:
+    """Records nested spans. The current span lives in a context variable, so
+    nesting follows the call stack, and threads started through
+    `contextvars.copy_context` keep their parent span.
+
+    Finished spans are buffered and exported when the root span of a trace
+    ends, or when the buffer is full. Without exporter spans are discarded.
+    """
+
+    def __init__(self, exporter: SpanExporter | None = None):
+        self.exporter = exporter
+
+        self._current: ContextVar[Span | None] = ContextVar("span", default=None)
+        self._buffer: list[Span] = []
+        self._lock = threading.Lock()
+
+    @property
+    def current(self) -> Span | None:
+        return self._current.get()
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Span]:
+        """Open a span, child of the current one
+
+        Args:
+            name (str): Span name
+
+        Yields:
+            Iterator[Span]: Open span, attributes can be added to it
+        """
+        parent: Span | None = self._current.get()
+        span = Span(name=name, attributes=attributes)
+        if parent is not None:
+            span.trace_id, span.parent_id = parent.trace_id, parent.span_id
+
+        token = self._current.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = repr(e)
+            raise
+        finally:
+            self._current.reset(token)
+            span.end_ns = time.time_ns()
+            self._finish(span)
+
+    def traced(self, name: str | None = None, **attributes: Any) -> Callable[[F], F]:
+        """Run the decorated function in a span
+
+        Args:
+            name (str | None, optional): Span name. Defaults to the function
+                qualified name.
+
+        Returns:
+            Callable[[F], F]: Decorator
+        """
+
+        def decorator(function: F) -> F:
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                with self.span(name or function.__qualname__, **attributes):
+                    return function(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    def flush(self) -> None:
+        """Export the buffered spans"""
+        with self._lock:
+            spans, self._buffer = self._buffer, []
+
+        if spans and self.exporter is not None:
+            self.exporter.export(spans)
+
+    def _finish(self, span: Span) -> None:
+        if self.exporter is None:
+            return
+
+        with self._lock:
+            self._buffer.append(span)
+            full: bool = len(self._buffer) >= BUFFER_SIZE
+
+        if span.parent_id is None or full:
+            self.flush()
+
+
+def _otlp_span(span: Span) -> dict:
+    otlp: dict[str, Any] = {
+        "traceId": span.trace_id,
+        "spanId": span.span_id,
+        "name": span.name,
+        "kind": 1,
+        "startTimeUnixNano": str(span.start_ns),
+        "endTimeUnixNano": str(span.end_ns),
+        "attributes": _otlp_attributes(span.attributes),
+        "status": {"code": 2, "message": span.error} if span.error else {"code": 1},
+    }
+    if span.parent_id is not None:
+        otlp["parentSpanId"] = span.parent_id
+
+    return otlp
+
+
+def _otlp_attributes(attributes: dict[str, Any]) -> list[dict]:
+    def value(attribute: Any) -> dict:
+        match attribute:
+            case bool():
+                return {"boolValue": attribute}
+            case int():
+                return {"intValue": str(attribute)}
+            case float():
+                return {"doubleValue": attribute}
+            case _:
+                return {"stringValue": str(attribute)}
+
+    return [{"key": key, "value": value(attr)} for key, attr in attributes.items()]
+
+
+def _build_exporter() -> SpanExporter | None:
+    if settings.OTLP_ENDPOINT:
+        return OtlpExporter(settings.OTLP_ENDPOINT)
+    if settings.TRACES_PATH:
+        return JsonLinesExporter(Path(settings.TRACES_PATH))
+
+    return None
+
+
+tracer = Tracer(_build_exporter())
@@ -1,33 +1,137 @@
+import functools
 from pathlib import Path
-from typing import Final, Optional
-
-from pydantic_settings import BaseSettings, SettingsConfigDict
-
-
-class Settings(BaseSettings):
-    model_config = SettingsConfigDict(
-        env_file=".env", env_file_encoding="utf-8", extra="ignore"
-    )
-
+from typing import Any, Final, Optional
+
+from dotenv import dotenv_values
+from pydantic.fields import FieldInfo
+from pydantic_settings import (
+    BaseSettings,
+    PydanticBaseSettingsSource,
+    SettingsConfigDict,
+)
+
+ENV_FILE: Final[str] = ".env"
+
+
+@functools.cache
+def _read_env_file(file_path: Path) -> dict[str, str | None]:
+    if not file_path.is_file():
+        return {}
+
+    return dotenv_values(file_path, encoding="utf-8")
+
+
+class _EnvFileSource(PydanticBaseSettingsSource):
+    """Settings from the `.env` file, parsed once per process however many
+    settings classes read it. The `env_prefix` and `case_sensitive` of the
+    settings class apply as they do to the environment.
+    """
+
+    def __init__(self, settings_cls: type[BaseSettings], env_file: str = ENV_FILE):
+        super().__init__(settings_cls)
+        self.prefix: str = self.config.get("env_prefix", "")
+        self.case_sensitive: bool = self.config.get("case_sensitive", False)
+        self.env_vars: dict[str, str | None] = {
+            self._key(name): value
+            for name, value in _read_env_file(Path(env_file).absolute()).items()
+        }
+
+    def get_field_value(
+        self, field: FieldInfo, field_name: str
+    ) -> tuple[Any, str, bool]:
+        value: str | None = self.env_vars.get(self._key(f"{self.prefix}{field_name}"))
+
+        return value, field_name, self.field_is_complex(field)
+
+    def __call__(self) -> dict[str, Any]:
+        data: dict[str, Any] = {}
+        for field_name, field in self.settings_cls.model_fields.items():
+            value, key, is_complex = self.get_field_value(field, field_name)
+            if value is not None:
+                data[key] = (
+                    self.decode_complex_value(field_name, field, value)
+                    if is_complex
+                    else value
+                )
+
+        return data
+
+    def _key(self, name: str) -> str:
+        return name if self.case_sensitive else name.lower()
+
+
+class VigilantSettings(BaseSettings):
+    """Base of the settings classes, all of them share a single `.env` load.
+    The file is read by `_EnvFileSource` only, the default dotenv source gets
+    no file.
+    """
+
+    model_config = SettingsConfigDict(extra="ignore")
+
+    @classmethod
+    def settings_customise_sources(
+        cls,
+        settings_cls: type[BaseSettings],
+        init_settings: PydanticBaseSettingsSource,
+        env_settings: PydanticBaseSettingsSource,
+        dotenv_settings: PydanticBaseSettingsSource,
+        file_secret_settings: PydanticBaseSettingsSource,
+    ) -> tuple[PydanticBaseSettingsSource, ...]:
+        return (
+            init_settings,
+            env_settings,
+            _EnvFileSource(settings_cls),
+            file_secret_settings,
+        )
+
+
+class Settings(VigilantSettings):
     LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "text"
     BROWSER_WAIT_TIMEOUT: float = 30000.0
+    BROWSER_CONTEXT_MAX_USES: int = 10
+    BROWSER_MEMORY_LIMIT_MB: float = 1536.0
+    BROWSER_WARM_UP: bool = True
+    TRACES_PATH: Optional[str] = None
+    OTLP_ENDPOINT: Optional[str] = None
+    SESSION_CACHE_KEY: Optional[str] = None
+    SESSION_CACHE_TTL: int = 1800
     STORAGE_LOCATION: str = "local"
+    ARCHIVE_DOWNLOADS: bool = False
+    PARSER_ENGINE: str = "stream"
+    REFERENCE_DATA_TTL: int = 3600
+    REFERENCE_DATA_CACHE_PATH: Optional[str] = None
     BUCKET_NAME: Optional[str] = None
-
-
-class Collector(BaseSettings):
-    model_config = SettingsConfigDict(
-        env_file=".env", env_file_encoding="utf-8", extra="ignore"
-    )
-
+    SHEETS_REQUESTS_PER_MINUTE: int = 60
+    SHEETS_MAX_RETRIES: int = 5
+    SHEETS_BACKOFF_BASE: float = 1.0
+    SHEETS_BACKOFF_MAX: float = 32.0
+    STEP_BACKOFF_BASE: float = 1.0
+    STEP_BACKOFF_MAX: float = 10.0
+    JOB_HISTORY_SIZE: int = 100
+    # Bounds the collection of a run so it does not hold the job worker, 0
+    # disables it. The last RUN_WRITE_RESERVE seconds are kept for writing the
+    # spreadsheet, a write still retrying Sheets errors may run past them
+    RUN_TIMEOUT: float = 270.0
+    RUN_WRITE_RESERVE: float = 30.0
+    WORKSPACE_MAX_AGE: int = 7 * 24 * 3600
+    WORKSPACE_MAX_COUNT: int = 20
+
+
+class Collector(VigilantSettings):
     ENABLED_SCRAPERS: list[str] = ["BancoChile", "BancoFalabella"]
-
-
-class BalanceSpreadsheet(BaseSettings):
-    model_config = SettingsConfigDict(
-        env_file=".env", env_file_encoding="utf-8", extra="ignore"
-    )
-
+    CONCURRENT: bool = False
+    # Each worker runs its own Chromium, a few hundred MB of memory apiece
+    MAX_CONCURRENCY: int = 2
+    # Retried runs skip the scrapers that succeeded this recently, 0 disables it
+    CHECKPOINT_MAX_AGE: int = 3600
+    # Banks failing this many runs in a row are skipped for CIRCUIT_RESET_TIMEOUT
+    # seconds, 0 disables it
+    CIRCUIT_FAILURE_THRESHOLD: int = 3
+    CIRCUIT_RESET_TIMEOUT: int = 1800
+
+
+class BalanceSpreadsheet(VigilantSettings):
     KEY: str = "1IKyPmWeaZ_5IRa4I4EOgVwu5oGZ9RSQqQxjRu9P4qY4"
 
     DATA_WORKSHEET_NAME: str = "Data"
@@ -37,7 +141,9 @@ class BalanceSpreadsheet(BaseSettings):
     AMOUNT_CELL: str = "J2"
     EXPENSES_CELL: str = "B3"
 
-    TRANSACTIONS_AMOUNT_RANGE: str = "F3:F200"
+    WRITE_CHUNK_ROWS: int = 1000
+
+    INCREMENTAL_SYNC: bool = False
 
 
 settings = Settings()
@@ -48,12 +154,17 @@ balance_spreadsheet = BalanceSpreadsheet()
 class IOResources:
     APP_ROOT_PATH: Final[Path] = Path("/var", "lib", "vigilant")
     SCREENSHOTS_PATH: Final[str] = "screenshots"
+    SESSIONS_PATH: Final[str] = "sessions"
 
+    RUNS_PATH: Final[Path] = APP_ROOT_PATH / "runs"
     DATA_DIR: Final[str] = "data_collection"
-    DATA_PATH: Final[Path] = APP_ROOT_PATH / DATA_DIR
-
     OUTPUT_DIR: Final[str] = "output"
-    OUTPUT_PATH: Final[Path] = APP_ROOT_PATH / OUTPUT_DIR
+
+    SNAPSHOT_PATH: Final[Path] = APP_ROOT_PATH / "spreadsheet_snapshot.json"
+    LOCK_PATH: Final[Path] = APP_ROOT_PATH / "pipeline.lock"
+    LAST_RUN_PATH: Final[Path] = APP_ROOT_PATH / "last_run.json"
+    CHECKPOINTS_PATH: Final[Path] = APP_ROOT_PATH / "checkpoints"
+    CIRCUITS_PATH: Final[Path] = APP_ROOT_PATH / "circuits"
 
 
 class StorageLocation:
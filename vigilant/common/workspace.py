@@ -0,0 +1,142 @@
+import os
+import shutil
+import threading
+import time
+import uuid
+from pathlib import Path
+
+from pydantic import BaseModel
+
+from vigilant import logger
+from vigilant.common.values import settings, IOResources
+
+
+class Workspace(BaseModel):
+    """Directories of a single run, kept after it finishes so its outputs can
+    be replayed
+    """
+
+    run_id: str
+    root: Path
+
+    @property
+    def data_path(self) -> Path:
+        return self.root / IOResources.DATA_DIR
+
+    @property
+    def output_path(self) -> Path:
+        return self.root / IOResources.OUTPUT_DIR
+
+    @staticmethod
+    def create(run_id: str | None = None) -> "Workspace":
+        """Create the directories of a new run
+
+        Args:
+            run_id (str | None, optional): Run ID. Defaults to a random one.
+
+        Returns:
+            Workspace: Run workspace
+        """
+        workspace: Workspace = Workspace.open(run_id or uuid.uuid4().hex)
+        workspace.data_path.mkdir(parents=True, exist_ok=True)
+        workspace.output_path.mkdir(parents=True, exist_ok=True)
+
+        return workspace
+
+    @staticmethod
+    def open(run_id: str) -> "Workspace":
+        """Workspace of an existing run
+
+        Args:
+            run_id (str): Run ID
+
+        Returns:
+            Workspace: Run workspace
+        """
+        return Workspace(run_id=run_id, root=IOResources.RUNS_PATH / run_id)
+
+
+def write_atomic(path: Path, data: str | bytes) -> None:
+    """Write a file through a temporary one renamed over it, so readers never
+    see it half written
+
+    Args:
+        path (Path): File to write
+        data (str | bytes): Content
+    """
+    temporary: Path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        if isinstance(data, bytes):
+            temporary.write_bytes(data)
+        else:
+            temporary.write_text(data)
+        os.replace(temporary, path)
+    finally:
+        temporary.unlink(missing_ok=True)
+
+
+def collect_garbage(
+    keep: set[str] = frozenset(),
+    max_age: float = settings.WORKSPACE_MAX_AGE,
+    max_count: int = settings.WORKSPACE_MAX_COUNT,
+) -> list[Path]:
+    """Delete workspaces older than `max_age` seconds, and the oldest ones
+    beyond `max_count`
+
+    Args:
+        keep (set[str], optional): Run IDs never deleted. Defaults to none.
+        max_age (float, optional): Defaults to WORKSPACE_MAX_AGE setting.
+        max_count (int, optional): Defaults to WORKSPACE_MAX_COUNT setting.
+
+    Returns:
+        list[Path]: Deleted workspaces
+    """
+    if not IOResources.RUNS_PATH.is_dir():
+        return []
+
+    workspaces: list[Path] = sorted(
+        (path for path in IOResources.RUNS_PATH.iterdir() if path.is_dir()),
+        key=lambda path: path.stat().st_mtime,
+        reverse=True,
+    )
+    expired_at: float = time.time() - max_age
+
+    deleted: list[Path] = [
+        path
+        for index, path in enumerate(workspaces)
+        if path.name not in keep
+        and (index >= max_count or path.stat().st_mtime < expired_at)
+    ]
+    for path in deleted:
+        shutil.rmtree(path, ignore_errors=True)
+
+    if deleted:
+        logger.info(f"Deleted {len(deleted)} old workspaces")
+
+    return deleted
+
+
+def collect_garbage_in_background(
+    keep: set[str] = frozenset(),
+    max_age: float = settings.WORKSPACE_MAX_AGE,
+    max_count: int = settings.WORKSPACE_MAX_COUNT,
+) -> threading.Thread:
+    """Run `collect_garbage` in a daemon thread
+
+    Args:
+        keep (set[str], optional): Run IDs never deleted. Defaults to none.
+        max_age (float, optional): Defaults to WORKSPACE_MAX_AGE setting.
+        max_count (int, optional): Defaults to WORKSPACE_MAX_COUNT setting.
+
+    Returns:
+        threading.Thread: Started thread
+    """
+    thread = threading.Thread(
+        target=collect_garbage,
+        args=(keep, max_age, max_count),
+        name="workspace-gc",
+        daemon=True,
+    )
+    thread.start()
+
+    return thread
@@ -1,3 +1,3 @@
-from vigilant.core.collector.main import collect
+from vigilant.core.collector.main import collect, shutdown, warm_up
 
-__all__ = ["collect"]
+__all__ = ["collect", "shutdown", "warm_up"]
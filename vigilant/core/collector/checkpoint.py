@@ -0,0 +1,134 @@
+import hashlib
+import time
+from pathlib import Path
+from typing import Final
+
+from pydantic import BaseModel, ValidationError
+
+from vigilant import logger
+from vigilant.common.metrics import Counter, metrics
+from vigilant.common.values import collector, IOResources
+from vigilant.common.workspace import Workspace, write_atomic
+
+RESTORED: Final[Counter] = metrics.counter(
+    "vigilant_scraper_checkpoints_restored_total",
+    "Scrapers skipped because a fresh checkpoint had their output",
+    ("scraper",),
+)
+
+
+class Checkpoint(BaseModel):
+    """Output of a scraper that succeeded in a run"""
+
+    scraper: str
+    run_id: str
+    filename: str
+    sha256: str
+    completed_at: float
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.completed_at
+
+    @property
+    def output_path(self) -> Path:
+        return Workspace.open(self.run_id).output_path / self.filename
+
+
+class CheckpointStore:
+    """Records the output of each scraper as it succeeds, so a retried run
+    scrapes again only the banks that failed. Checkpoints older than `max_age`
+    seconds are ignored, and they are all cleared once a run succeeds, so a
+    new run always gets fresh data.
+
+    The output stays in the workspace of the run that produced it, its hash
+    guards against the workspace being deleted or changed since.
+    """
+
+    def __init__(
+        self,
+        path: Path = IOResources.CHECKPOINTS_PATH,
+        max_age: float = collector.CHECKPOINT_MAX_AGE,
+    ):
+        self.path = path
+        self.max_age = max_age
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_age > 0
+
+    def save(self, scraper: str, workspace: Workspace, filename: str) -> Checkpoint:
+        """Record the output of a scraper that succeeded
+
+        Args:
+            scraper (str): Scraper name
+            workspace (Workspace): Workspace of the run
+            filename (str): Output file of the scraper, in the workspace
+
+        Returns:
+            Checkpoint: Recorded checkpoint
+        """
+        checkpoint = Checkpoint(
+            scraper=scraper,
+            run_id=workspace.run_id,
+            filename=filename,
+            sha256=_sha256((workspace.output_path / filename).read_bytes()),
+            completed_at=time.time(),
+        )
+
+        self.path.mkdir(parents=True, exist_ok=True)
+        write_atomic(self._checkpoint_path(scraper), checkpoint.model_dump_json())
+
+        return checkpoint
+
+    def restore(self, scraper: str, workspace: Workspace) -> Checkpoint | None:
+        """Copy the output of a fresh checkpoint into the workspace
+
+        Args:
+            scraper (str): Scraper name
+            workspace (Workspace): Workspace of the current run
+
+        Returns:
+            Checkpoint | None: Restored checkpoint, None when there is no fresh
+                checkpoint or its output is gone
+        """
+        checkpoint: Checkpoint | None = self.load(scraper)
+        if checkpoint is None or checkpoint.age > self.max_age:
+            return None
+
+        source: Path = checkpoint.output_path
+        output: bytes | None = source.read_bytes() if source.is_file() else None
+        if output is None or _sha256(output) != checkpoint.sha256:
+            logger.warning(f"Output of the {scraper} checkpoint is gone or changed")
+            return None
+
+        if checkpoint.run_id != workspace.run_id:
+            write_atomic(workspace.output_path / checkpoint.filename, output)
+
+        RESTORED.inc(scraper=scraper)
+
+        return checkpoint
+
+    def load(self, scraper: str) -> Checkpoint | None:
+        try:
+            return Checkpoint.model_validate_json(
+                self._checkpoint_path(scraper).read_text()
+            )
+        except (FileNotFoundError, ValidationError):
+            return None
+
+    def clear(self) -> None:
+        """Forget every checkpoint"""
+        if self.path.is_dir():
+            for path in self.path.glob("*.json"):
+                path.unlink(missing_ok=True)
+
+    def _checkpoint_path(self, scraper: str) -> Path:
+        return self.path / f"{scraper}.json"
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+checkpoints = CheckpointStore()
@@ -0,0 +1,110 @@
+import time
+from pathlib import Path
+from typing import Final, Optional
+
+from pydantic import BaseModel, ValidationError
+
+from vigilant import logger
+from vigilant.common.exceptions import CircuitOpen
+from vigilant.common.metrics import Counter, metrics
+from vigilant.common.values import collector, IOResources
+
+REJECTED: Final[Counter] = metrics.counter(
+    "vigilant_scraper_circuit_rejections_total",
+    "Scraper runs skipped because the circuit of their bank was open",
+    ("scraper",),
+)
+
+
+class CircuitState(BaseModel):
+    failures: int = 0
+    opened_at: Optional[float] = None
+
+
+class CircuitBreaker:
+    """Per bank circuit breaker, persisted between runs. Once a scraper fails
+    `failure_threshold` runs in a row its circuit opens, and the scraper is
+    skipped instead of waiting on a portal that is down. After
+    `reset_timeout` seconds a single trial run is let through: a success
+    closes the circuit, a failure opens it again.
+    """
+
+    def __init__(
+        self,
+        path: Path = IOResources.CIRCUITS_PATH,
+        failure_threshold: int = collector.CIRCUIT_FAILURE_THRESHOLD,
+        reset_timeout: float = collector.CIRCUIT_RESET_TIMEOUT,
+    ):
+        self.path = path
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+    @property
+    def enabled(self) -> bool:
+        return self.failure_threshold > 0
+
+    def check(self, scraper: str) -> None:
+        """Let the scraper run unless its circuit is open
+
+        Args:
+            scraper (str): Scraper name
+
+        Raises:
+            CircuitOpen: The circuit is open, the scraper must not run
+        """
+        state: CircuitState = self.load(scraper)
+        if state.opened_at is None:
+            return
+
+        retry_in: float = state.opened_at + self.reset_timeout - time.time()
+        if retry_in > 0:
+            REJECTED.inc(scraper=scraper)
+            raise CircuitOpen(scraper, retry_in)
+
+        logger.info(f"Circuit of {scraper} half-open, trying it again")
+
+    def record_success(self, scraper: str) -> None:
+        """Close the circuit of the scraper
+
+        Args:
+            scraper (str): Scraper name
+        """
+        if self.load(scraper) != CircuitState():
+            self._save(scraper, CircuitState())
+
+    def record_failure(self, scraper: str) -> None:
+        """Count a failed run, opening the circuit when the threshold is
+        reached. A failed trial run opens it again for `reset_timeout`.
+
+        Args:
+            scraper (str): Scraper name
+        """
+        state: CircuitState = self.load(scraper)
+        state.failures += 1
+
+        if state.failures >= self.failure_threshold:
+            state.opened_at = time.time()
+            logger.warning(
+                f"Circuit of {scraper} open after {state.failures} failures, "
+                f"skipping it for {self.reset_timeout:.0f}s"
+            )
+
+        self._save(scraper, state)
+
+    def load(self, scraper: str) -> CircuitState:
+        try:
+            return CircuitState.model_validate_json(
+                self._state_path(scraper).read_text()
+            )
+        except (FileNotFoundError, ValidationError):
+            return CircuitState()
+
+    def _save(self, scraper: str, state: CircuitState) -> None:
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._state_path(scraper).write_text(state.model_dump_json())
+
+    def _state_path(self, scraper: str) -> Path:
+        return self.path / f"{scraper}.json"
+
+
+breaker = CircuitBreaker()
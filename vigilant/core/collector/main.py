@@ -1,40 +1,298 @@
-from typing import Type
+import contextvars
+import math
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed, wait
+from collections.abc import Callable
+from typing import Final, Type
 
 from vigilant import logger
-from vigilant.common.browser import session
-from vigilant.common.storage import clear_resources
-from vigilant.core.collector.scraper import (
-    BancoChileScraper,
-    BancoFalabellaScraper,
-    Scraper,
-)
+from vigilant.common.browser import close_pool, get_pool, session
+from vigilant.common.cache import reference_data
+from vigilant.common.deadline import Deadline
+from vigilant.common.exceptions import CircuitOpen, DeadlineExceeded
+from vigilant.common.models import CollectionResult
+from vigilant.common.tracing import tracer
+from vigilant.core.collector.checkpoint import checkpoints
+from vigilant.core.collector.circuit import breaker
+from vigilant.core.collector.scraper import Scraper
+from vigilant.core.collector.scraper.registry import ScraperRegistry
 from vigilant.common.values import collector
+from vigilant.common.workspace import Workspace
 
 
-SCRAPER_REGISTRY: dict[str, Type[Scraper]] = {
-    "BancoChile": BancoChileScraper,
-    "BancoFalabella": BancoFalabellaScraper,
-}
+SCRAPER_REGISTRY = ScraperRegistry()
+
+WORKERS_TIMEOUT: Final[float] = 30.0
+CANCEL_GRACE: Final[float] = 5.0
+# Scrapers failing with these are reported as not collected, the run goes on
+SKIPPED_ERRORS: Final[tuple[type[Exception], ...]] = (DeadlineExceeded, CircuitOpen)
+
+_executor: ThreadPoolExecutor | None = None
+_workers: int = 0
+_workers_lock = threading.Lock()
 
 
 def get_enabled_scrapers() -> list[Type[Scraper]]:
-    enabled = collector.ENABLED_SCRAPERS
-    return [
-        SCRAPER_REGISTRY[name.strip()]
-        for name in enabled
-        if name.strip() in SCRAPER_REGISTRY
-    ]
+    return SCRAPER_REGISTRY.load(collector.ENABLED_SCRAPERS)
+
 
+@tracer.traced("collect")
+def collect(workspace: Workspace, deadline: Deadline | None = None) -> CollectionResult:
+    """Collect accounts data. Scrapers running out of time are cancelled, and
+    those of banks with an open circuit skipped, the others keep their results.
 
-def collect() -> None:
-    """Collect accounts data"""
-    clear_resources()
+    Args:
+        workspace (Workspace): Workspace of the run, scrapers save their data in it
+        deadline (Deadline | None, optional): Time to collect by. Defaults to
+            no deadline.
 
+    Returns:
+        CollectionResult: Outputs of the scrapers that completed, and the
+            scrapers cancelled by the deadline or skipped by their circuit
+    """
     logger.info("Collecting transactions data ...")
-    for SPR in get_enabled_scrapers():
-        with session() as page:
-            SPR(page).scrap()
+    deadline = deadline or Deadline()
+    scrapers: list[Type[Scraper]] = get_enabled_scrapers()
+
+    if collector.CONCURRENT:
+        result: CollectionResult = _collect_concurrently(scrapers, workspace, deadline)
+    else:
+        result = CollectionResult()
+        for index, SPR in enumerate(scrapers):
+            # Even share of the time left, what a scraper does not use goes
+            # to the next ones
+            budget: float = deadline.remaining / (len(scrapers) - index)
+            try:
+                _run_scraper(SPR, workspace, deadline.child(budget))
+            except SKIPPED_ERRORS as e:
+                logger.warning(str(e))
+                result.skipped.append(SPR.__name__)
+            else:
+                _add_output(result, SPR)
+
+    logger.debug(f"Reference data cache stats: {reference_data.stats()}")
+
+    return result
+
+
+def _run_scraper(
+    SPR: Type[Scraper], workspace: Workspace, deadline: Deadline | None = None
+) -> None:
+    """Run a scraper, unless a fresh checkpoint of a previous attempt already
+    has its output. Its output is checkpointed once it succeeds. Outcomes go
+    to the circuit breaker of the bank, which fails the scraper right away
+    while its circuit is open.
+
+    Args:
+        SPR (Type[Scraper]): Scraper to run
+        workspace (Workspace): Workspace of the run
+        deadline (Deadline | None, optional): Time budget of the scraper.
+            Defaults to no deadline.
+
+    Raises:
+        DeadlineExceeded: The scraper ran out of time
+    """
+    name: str = SPR.__name__
+    deadline = deadline or Deadline()
+    checkpointed: bool = checkpoints.enabled and SPR.output_filename is not None
+
+    if checkpointed and (checkpoint := checkpoints.restore(name, workspace)):
+        logger.info(
+            f"Skipping {name}, it succeeded {checkpoint.age:.0f}s ago "
+            f"in run {checkpoint.run_id}"
+        )
+        return
+
+    if deadline.expired:
+        raise DeadlineExceeded(name)
+    if breaker.enabled:
+        breaker.check(name)
+
+    try:
+        with session(name, SPR.routes) as page:
+            SPR(page, workspace, deadline).scrap()
+    except Exception as e:
+        # Running out of time says nothing about the health of the portal
+        if deadline.expired:
+            raise DeadlineExceeded(name) from e
+        if breaker.enabled:
+            breaker.record_failure(name)
+        raise
+
+    if breaker.enabled:
+        breaker.record_success(name)
+    if checkpointed:
+        checkpoints.save(name, workspace, SPR.output_filename)
+
+    logger.debug(f"Browser pool stats: {get_pool().stats()}")
+
+
+def _collect_concurrently(
+    scrapers: list[Type[Scraper]], workspace: Workspace, deadline: Deadline
+) -> CollectionResult:
+    """Run scrapers in a bounded thread pool. A failing scraper does not stop
+    the others, the first error is raised once all of them are finished.
+    Scrapers cancelled by the deadline or skipped by their circuit are
+    reported instead.
+
+    Every scraper gets the whole deadline. Their page timeouts are bounded by
+    it, so they stop soon after it; those still running CANCEL_GRACE seconds
+    later are left behind and their outputs left out of the result.
+
+    Args:
+        scrapers (list[Type[Scraper]]): Scrapers to run
+        workspace (Workspace): Workspace of the run
+        deadline (Deadline): Time to collect by
+
+    Returns:
+        CollectionResult: Outputs of the scrapers that completed, and the
+            scrapers cancelled by the deadline or skipped by their circuit
+    """
+    # Each scraper runs in a copy of the caller context to keep its parent span
+    futures: dict[Future, Type[Scraper]] = {
+        _get_executor().submit(
+            contextvars.copy_context().run, _run_scraper, SPR, workspace, deadline
+        ): SPR
+        for SPR in scrapers
+    }
+    timeout: float | None = (
+        deadline.remaining + CANCEL_GRACE if math.isfinite(deadline.remaining) else None
+    )
+
+    result = CollectionResult()
+    errors: list[BaseException] = []
+    try:
+        for future in as_completed(futures, timeout=timeout):
+            SPR: Type[Scraper] = futures[future]
+            if isinstance(error := future.exception(), SKIPPED_ERRORS):
+                logger.warning(str(error))
+                result.skipped.append(SPR.__name__)
+            elif error is not None:
+                logger.error(f"Scraper {SPR.__name__} failed: {error}")
+                errors.append(error)
+            else:
+                _add_output(result, SPR)
+    except TimeoutError:
+        for future, SPR in futures.items():
+            if not future.done():
+                future.cancel()
+                logger.warning(
+                    f"{SPR.__name__} still running past the deadline, dropping it"
+                )
+                result.skipped.append(SPR.__name__)
+
+    if errors:
+        raise errors[0]
+
+    return result
+
+
+def _add_output(result: CollectionResult, SPR: Type[Scraper]) -> None:
+    if SPR.output_filename is not None:
+        result.outputs.append(SPR.output_filename)
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Executor kept for the whole process, so each worker thread keeps its own
+    browser pool warm between runs. Every worker launches its own Chromium, so
+    workers are capped by the number of enabled scrapers too.
+
+    Returns:
+        ThreadPoolExecutor: Scrapers executor
+    """
+    global _executor
+
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=_concurrency(),
+            thread_name_prefix="scraper",
+            initializer=_register_worker,
+        )
+
+    return _executor
+
+
+def _concurrency() -> int:
+    return max(1, min(collector.MAX_CONCURRENCY, len(get_enabled_scrapers())))
+
+
+def _register_worker() -> None:
+    global _workers
+
+    with _workers_lock:
+        _workers += 1
+
+
+def warm_up() -> None:
+    """Import the enabled scrapers, and launch the browser of every scraper
+    worker ahead of the first run. Only concurrent runs use the workers,
+    sequential ones scrape in the caller thread.
+    """
+    started_at: float = time.perf_counter()
+    scrapers: list[Type[Scraper]] = get_enabled_scrapers()
+    logger.info(
+        f"Loaded {len(scrapers)} scrapers in {time.perf_counter() - started_at:.3f}s"
+    )
+
+    if not collector.CONCURRENT:
+        return
+
+    for future in _run_on_workers(lambda: get_pool().browser, _concurrency()):
+        future.result()
+
+
+def shutdown() -> None:
+    """Close the browser pool of every scraper worker and stop the executor"""
+    global _executor, _workers
+
+    if _executor is None:
+        return
+
+    with _workers_lock:
+        workers: int = _workers
+
+    _run_on_workers(close_pool, workers)
+    _executor.shutdown(wait=True)
+    _executor, _workers = None, 0
+
+
+def _run_on_workers(task: Callable[[], object], workers: int) -> list[Future]:
+    """Run `task` once in each of `workers` threads of the executor. Browser
+    pools are bound to the thread owning them, a barrier makes each worker
+    take exactly one of the tasks.
+
+    Args:
+        task (Callable[[], object]): Work to run
+        workers (int): Number of worker threads
+
+    Returns:
+        list[Future]: Finished tasks
+    """
+    if not workers:
+        return []
+
+    barrier = threading.Barrier(workers, timeout=WORKERS_TIMEOUT)
+    futures: list[Future] = [
+        _get_executor().submit(_run_on_worker, task, barrier) for _ in range(workers)
+    ]
+    wait(futures, timeout=WORKERS_TIMEOUT)
+
+    return futures
+
+
+def _run_on_worker(task: Callable[[], object], barrier: threading.Barrier) -> None:
+    try:
+        barrier.wait()
+    except threading.BrokenBarrierError:
+        logger.warning("Not every scraper worker took part in the task")
+    finally:
+        task()
 
 
 if __name__ == "__main__":
-    collect()
+    try:
+        collect(Workspace.create())
+    finally:
+        shutdown()
+        close_pool()
@@ -1,7 +1,18 @@
+import importlib
+
 from vigilant.core.collector.scraper.scraper import Scraper
-from vigilant.core.collector.scraper.banco_chile.scraper import BancoChileScraper
-from vigilant.core.collector.scraper.banco_falabella.scraper import (
-    BancoFalabellaScraper,
-)
+
+# Bank scrapers are imported on first access, their settings need credentials
+_LAZY_SCRAPERS: dict[str, str] = {
+    "BancoChileScraper": "vigilant.core.collector.scraper.banco_chile.scraper",
+    "BancoFalabellaScraper": "vigilant.core.collector.scraper.banco_falabella.scraper",
+}
 
 __all__ = ["Scraper", "BancoChileScraper", "BancoFalabellaScraper"]
+
+
+def __getattr__(name: str):
+    if name in _LAZY_SCRAPERS:
+        return getattr(importlib.import_module(_LAZY_SCRAPERS[name]), name)
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
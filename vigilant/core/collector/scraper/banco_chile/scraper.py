@@ -1,29 +1,31 @@
 from contextlib import suppress
 from typing import Final
 
-import pandas as pd
 from playwright.sync_api import TimeoutError
 
 from vigilant.common.models import AccountData, Transaction
-from vigilant.common.spreadsheet import SpreadSheet
-from vigilant.common.values import (
-    balance_spreadsheet,
-    IOResources as VigilantIOResources,
-)
+from vigilant.common.workspace import write_atomic
 from vigilant.core.collector.scraper.banco_chile.values import (
     secrets,
     Locators,
     IOResources,
+    Routes,
 )
 from vigilant.core.collector.scraper import Scraper
+from vigilant.core.collector.scraper.parser import Row
+from vigilant.core.collector.scraper.scraper import step
 
 
 class BancoChileScraper(Scraper):
     amount: int
+    home_url: Final[str] = secrets.HOME_URL
+    session_probe: Final[str] = Locators.AMOUNT_TEXT_CLASS
+    routes: Final[type[Routes]] = Routes
+    output_filename: Final[str] = IOResources.OUTPUT_FILENAME
     identifier: Final[str] = "Chile"
 
     def navigate(self) -> None:
-        self._login()
+        self.authenticate()
         self._get_current_amount()
         self._get_credit_transactions()
         self._save()
@@ -40,6 +42,7 @@ class BancoChileScraper(Scraper):
 
         self.page.wait_for_url(secrets.HOME_URL)
 
+    @step("amount", retries=1)
     def _get_current_amount(self) -> None:
         """Collect current account amount and save it in a file"""
         BANNER_WAIT_TIMEOUT: float = 3000.0
@@ -48,7 +51,7 @@ class BancoChileScraper(Scraper):
 
         with suppress(TimeoutError):
             self.page.locator(Locators.PROMOTION_BANNER_CLASS).wait_for(
-                timeout=BANNER_WAIT_TIMEOUT
+                timeout=self.timeout(BANNER_WAIT_TIMEOUT)
             )
             self.page.keyboard.press("Escape")
 
@@ -60,10 +63,15 @@ class BancoChileScraper(Scraper):
             .strip()
         )
 
+    @step("download", retries=2)
     def _get_credit_transactions(self) -> None:
         """Collect current transactions on credit card"""
         self.logger.info("Getting transactions ...")
 
+        self.statement = self._fetch_export(secrets.EXPORT_URL)
+        if self.statement is not None:
+            return
+
         self.page.goto(secrets.CREDIT_TRANSACTIONS_URL)
 
         try:
@@ -72,18 +80,18 @@ class BancoChileScraper(Scraper):
             self.page.locator(Locators.NO_TRANSACTIONS_CLASS).wait_for(state="visible")
             return
 
-        with self.page.expect_download() as download_info:
-            self.page.locator(Locators.DOWNLOAD_BTN_XPATH).click()
-
-        download_info.value.save_as(self.data_path / IOResources.TRANSACTIONS_FILENAME)
+        self._download_statement(
+            self.page.locator(Locators.DOWNLOAD_BTN_XPATH),
+            IOResources.TRANSACTIONS_FILENAME,
+        )
 
+    @step("save", browser=False)
     def _save(self) -> None:
         """Structure and saves collected data in a json file"""
         self.logger.info("Saving data ...")
 
-        transactions_file = self.data_path / IOResources.TRANSACTIONS_FILENAME
         collected_transactions: list[Transaction] = []
-        if transactions_file.exists():
+        if self.statement is not None:
             EXPENSES_COLUMNS_INDEX: tuple[str] = (1, 4, 6, 10)
             EXPENSES_COLUMNS_KEYS: tuple[str] = (
                 "date",
@@ -92,32 +100,21 @@ class BancoChileScraper(Scraper):
                 "amount",
             )
 
-            expenses: pd.DataFrame = pd.read_excel(
-                transactions_file,
-                sheet_name=0,
-                header=17,
-                names=EXPENSES_COLUMNS_KEYS,
-                usecols=EXPENSES_COLUMNS_INDEX,
+            expenses: list[Row] = self._parse_statement(
+                header=17, usecols=EXPENSES_COLUMNS_INDEX
             )
 
-            spreadsheet = SpreadSheet.load(balance_spreadsheet.KEY)
-            payment_descriptions: list[str] = [
-                desc.pop()
-                for desc in spreadsheet.read(
-                    balance_spreadsheet.DATA_WORKSHEET_NAME,
-                    balance_spreadsheet.PAYMENT_DESC_RANGE,
-                )
-            ]
-
-            expenses = expenses[
-                (~expenses.description.isin(payment_descriptions))
-            ].fillna("")
+            payment_descriptions: list[str] = self._get_payment_descriptions()
 
             collected_transactions = [
                 Transaction(
-                    **dict(zip(list(Transaction.model_fields), raw_transaction))
+                    **{
+                        key: "" if value is None else value
+                        for key, value in zip(EXPENSES_COLUMNS_KEYS, expense)
+                    }
                 )
-                for raw_transaction in expenses.values.tolist()
+                for expense in expenses
+                if expense[1] not in payment_descriptions
             ]
 
         account_data = AccountData(
@@ -126,6 +123,7 @@ class BancoChileScraper(Scraper):
             transactions=collected_transactions,
         )
 
-        (VigilantIOResources.OUTPUT_PATH / IOResources.OUTPUT_FILENAME).write_text(
-            account_data.model_dump_json()
+        write_atomic(
+            self.workspace.output_path / self.output_filename,
+            account_data.model_dump_json(),
         )
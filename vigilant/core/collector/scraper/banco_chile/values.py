@@ -1,12 +1,13 @@
-from typing import Final
+from typing import Final, Optional
 
-from pydantic_settings import BaseSettings, SettingsConfigDict
+from pydantic_settings import SettingsConfigDict
 
+from vigilant.common.browser import RouteRules
+from vigilant.common.values import VigilantSettings
 
-class Secrets(BaseSettings):
-    model_config = SettingsConfigDict(
-        env_file=".env", env_file_encoding="utf-8", env_prefix="CHILE_", extra="ignore"
-    )
+
+class Secrets(VigilantSettings):
+    model_config = SettingsConfigDict(env_prefix="CHILE_")
 
     USERNAME: str
     PASSWORD: str
@@ -14,6 +15,7 @@ class Secrets(BaseSettings):
     LOGIN_URL: str
     HOME_URL: str
     CREDIT_TRANSACTIONS_URL: str
+    EXPORT_URL: Optional[str] = None
 
 
 secrets = Secrets()
@@ -39,6 +41,13 @@ class Locators:
     DOWNLOAD_BTN_XPATH: Final[str] = '//*[@id="cdk-overlay-0"]/div/div/button[1]'
 
 
+class Routes(RouteRules):
+    BLOCKED_DOMAINS: Final[tuple[str, ...]] = RouteRules.BLOCKED_DOMAINS + (
+        "clarity.ms",
+        "newrelic.com",
+    )
+
+
 class IOResources:
     TRANSACTIONS_FILENAME: Final[str] = "transactions.xls"
     OUTPUT_FILENAME: Final[str] = "banco_chile.json"
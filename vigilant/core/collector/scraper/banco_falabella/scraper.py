@@ -1,29 +1,30 @@
 from contextlib import suppress
 from typing import Final
 
-import pandas as pd
 from playwright.sync_api import Locator, TimeoutError
 
 from vigilant.common.models import AccountData, Transaction
-from vigilant.common.spreadsheet import SpreadSheet
-from vigilant.common.values import (
-    balance_spreadsheet,
-    IOResources as VigilantIOResources,
-    settings,
-)
+from vigilant.common.workspace import write_atomic
 from vigilant.core.collector.scraper.banco_falabella.values import (
     secrets,
     Locators,
     IOResources,
+    Routes,
 )
 from vigilant.core.collector.scraper import Scraper
+from vigilant.core.collector.scraper.parser import Row
+from vigilant.core.collector.scraper.scraper import step
 
 
 class BancoFalabellaScraper(Scraper):
+    home_url: Final[str] = secrets.HOME_URL
+    session_probe: Final[str] = Locators.PRODUCT_BTN_CLASS
+    routes: Final[type[Routes]] = Routes
+    output_filename: Final[str] = IOResources.OUTPUT_FILENAME
     identifier: Final[str] = "Falabella"
 
     def navigate(self) -> None:
-        self._login()
+        self.authenticate()
         self._get_credit_transactions()
         self._save()
 
@@ -35,89 +36,81 @@ class BancoFalabellaScraper(Scraper):
         self.page.wait_for_load_state("networkidle")
 
         login_btn: Locator = self.page.locator(Locators.LOGIN_FORM_BTN_XPATH)
-        login_btn.wait_for(state="visible", timeout=settings.BROWSER_WAIT_TIMEOUT)
+        login_btn.wait_for(state="visible", timeout=self.timeout())
         login_btn.click(delay=500.0)
 
         user_input: Locator = self.page.locator(Locators.USER_INPUT_XPATH).first
-        user_input.wait_for(state="visible", timeout=settings.BROWSER_WAIT_TIMEOUT)
+        user_input.wait_for(state="visible", timeout=self.timeout())
         user_input.fill(secrets.USERNAME)
 
         password_input: Locator = self.page.locator(Locators.PASSWORD_INPUT_XPATH).first
-        password_input.wait_for(state="visible", timeout=settings.BROWSER_WAIT_TIMEOUT)
+        password_input.wait_for(state="visible", timeout=self.timeout())
         password_input.fill(secrets.PASSWORD)
 
         submit_btn = self.page.locator(Locators.LOGIN_SUBMIT_BTN_ID).first
-        submit_btn.wait_for(state="visible", timeout=settings.BROWSER_WAIT_TIMEOUT)
+        submit_btn.wait_for(state="visible", timeout=self.timeout())
         submit_btn.click(delay=500.0)
 
-        self.page.wait_for_url(secrets.HOME_URL, timeout=settings.BROWSER_WAIT_TIMEOUT)
+        self.page.wait_for_url(secrets.HOME_URL, timeout=self.timeout())
         self.page.wait_for_load_state("networkidle")
 
+    @step("download", retries=2)
     def _get_credit_transactions(self) -> None:
         """Collect current transactions on credit card"""
         BANNER_WAIT_TIMEOUT: float = 3000.0
 
         self.logger.info("Getting transactions ...")
 
+        self.statement = self._fetch_export(secrets.EXPORT_URL)
+        if self.statement is not None:
+            return
+
+        # A retried attempt starts over from the home page
+        if self.page.url != secrets.HOME_URL:
+            self.page.goto(secrets.HOME_URL)
+
         with suppress(TimeoutError):
             self.page.locator(Locators.PROMOTION_BANNER_XPATH).wait_for(
-                timeout=BANNER_WAIT_TIMEOUT
+                timeout=self.timeout(BANNER_WAIT_TIMEOUT)
             )
             self.page.locator(Locators.CLOSE_BANNER_BTN_CLASS).click()
 
         self.page.locator(Locators.PRODUCT_BTN_CLASS).click()
 
-        with self.page.expect_download() as download_info:
-            self.page.locator(Locators.DOWNLOAD_BTN_CLASS).first.click()
-
-        download_info.value.save_as(self.data_path / IOResources.TRANSACTIONS_FILENAME)
+        self._download_statement(
+            self.page.locator(Locators.DOWNLOAD_BTN_CLASS).first,
+            IOResources.TRANSACTIONS_FILENAME,
+        )
 
+    @step("save", browser=False)
     def _save(self) -> None:
         """Structure and saves collected data in a json file"""
         self.logger.info("Saving data ...")
 
         EXPENSES_COLUMNS_INDEX: tuple[str] = (0, 1, 4, 5)
-        EXPENSES_COLUMNS_KEYS: tuple[str] = (
-            "date",
-            "description",
-            "fees",
-            "amount",
-        )
 
-        expenses: pd.DataFrame = pd.read_excel(
-            self.data_path / IOResources.TRANSACTIONS_FILENAME,
-            sheet_name=0,
-            header=0,
-            names=EXPENSES_COLUMNS_KEYS,
-            usecols=EXPENSES_COLUMNS_INDEX,
+        expenses: list[Row] = self._parse_statement(
+            header=0, usecols=EXPENSES_COLUMNS_INDEX
         )
 
-        spreadsheet = SpreadSheet.load(balance_spreadsheet.KEY)
-        payment_descriptions: list[str] = [
-            desc.pop()
-            for desc in spreadsheet.read(
-                balance_spreadsheet.DATA_WORKSHEET_NAME,
-                balance_spreadsheet.PAYMENT_DESC_RANGE,
-            )
-        ]
-
-        expenses = expenses[
-            (~expenses.description.isin(payment_descriptions)) & (expenses.fees == 0)
-        ].drop(columns=["fees"])
-        expenses.insert(loc=2, column="location", value="")
-        expenses["date"] = expenses["date"].dt.strftime("%d/%m/%Y")
+        payment_descriptions: list[str] = self._get_payment_descriptions()
 
         account_data = AccountData(
             identifier=self.identifier,
             amount=0,
             transactions=[
                 Transaction(
-                    **dict(zip(list(Transaction.model_fields), raw_transaction))
+                    date=date.strftime("%d/%m/%Y"),
+                    description=description,
+                    location="",
+                    amount=amount,
                 )
-                for raw_transaction in expenses.values.tolist()
+                for date, description, fees, amount in expenses
+                if description not in payment_descriptions and fees == 0
             ],
         )
 
-        (VigilantIOResources.OUTPUT_PATH / IOResources.OUTPUT_FILENAME).write_text(
-            account_data.model_dump_json()
+        write_atomic(
+            self.workspace.output_path / self.output_filename,
+            account_data.model_dump_json(),
         )
@@ -1,21 +1,20 @@
-from typing import Final
+from typing import Final, Optional
 
-from pydantic_settings import BaseSettings, SettingsConfigDict
+from pydantic_settings import SettingsConfigDict
 
+from vigilant.common.browser import RouteRules
+from vigilant.common.values import VigilantSettings
 
-class Secrets(BaseSettings):
-    model_config = SettingsConfigDict(
-        env_file=".env",
-        env_file_encoding="utf-8",
-        env_prefix="FALABELLA_",
-        extra="ignore",
-    )
+
+class Secrets(VigilantSettings):
+    model_config = SettingsConfigDict(env_prefix="FALABELLA_")
 
     USERNAME: str
     PASSWORD: str
 
     LOGIN_URL: str
     HOME_URL: str
+    EXPORT_URL: Optional[str] = None
 
 
 secrets = Secrets()
@@ -40,6 +39,13 @@ class Locators:
     PROMOTION_BANNER_XPATH: Final[str] = '//*[@id="shadow-container"]'
 
 
+class Routes(RouteRules):
+    BLOCKED_DOMAINS: Final[tuple[str, ...]] = RouteRules.BLOCKED_DOMAINS + (
+        "cookielaw.org",
+        "newrelic.com",
+    )
+
+
 class IOResources:
     TRANSACTIONS_FILENAME: Final[str] = "transactions.xls"
     OUTPUT_FILENAME: Final[str] = "banco_falabella.json"
@@ -0,0 +1,139 @@
+from abc import ABC, abstractmethod
+from io import BytesIO
+from typing import Any, ClassVar, Final, Type
+
+from vigilant import logger
+from vigilant.common.values import settings
+
+XLSX_SIGNATURE: Final[bytes] = b"PK\x03\x04"
+XLS_SIGNATURE: Final[bytes] = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+
+Row = list[Any]
+
+
+class StatementParser(ABC):
+    """Reads the first sheet of a statement. Rows come after the `header` row,
+    restricted to `usecols`, with empty cells as None, dates as datetime and
+    trailing empty rows dropped.
+    """
+
+    # Third party modules imported on first read, preloaded by the warm-up
+    modules: ClassVar[tuple[str, ...]] = ()
+
+    @abstractmethod
+    def read(self, data: bytes, header: int, usecols: tuple[int, ...]) -> list[Row]:
+        """Extract rows from a statement
+
+        Args:
+            data (bytes): Statement file content
+            header (int): Index of the header row
+            usecols (tuple[int, ...]): Indexes of the columns to keep
+
+        Returns:
+            list[Row]: Statement rows
+        """
+
+
+class PandasParser(StatementParser):
+    modules = ("pandas", "xlrd", "openpyxl")
+
+    def read(self, data: bytes, header: int, usecols: tuple[int, ...]) -> list[Row]:
+        import pandas as pd
+
+        frame: pd.DataFrame = pd.read_excel(
+            BytesIO(data), sheet_name=0, header=header, usecols=usecols
+        )
+        frame = frame.astype(object).where(frame.notna(), None)
+
+        return [
+            [
+                cell.to_pydatetime() if isinstance(cell, pd.Timestamp) else cell
+                for cell in row
+            ]
+            for row in frame.values.tolist()
+        ]
+
+
+class RowStreamParser(StatementParser):
+    """Reads rows straight from xlrd (.xls) or openpyxl (.xlsx), no pandas"""
+
+    modules = ("xlrd", "openpyxl")
+
+    def read(self, data: bytes, header: int, usecols: tuple[int, ...]) -> list[Row]:
+        rows = (
+            self._read_xlsx(data, header)
+            if data.startswith(XLSX_SIGNATURE)
+            else self._read_xls(data, header)
+        )
+
+        while rows and all(cell is None for cell in rows[-1]):
+            rows.pop()
+
+        return [
+            [row[col] if col < len(row) else None for col in usecols] for row in rows
+        ]
+
+    @staticmethod
+    def _read_xls(data: bytes, header: int) -> list[Row]:
+        import xlrd
+
+        book = xlrd.open_workbook(file_contents=data, on_demand=True)
+        try:
+            sheet = book.sheet_by_index(0)
+            return [
+                [_xls_cell_value(cell, book.datemode) for cell in sheet.row(index)]
+                for index in range(header + 1, sheet.nrows)
+            ]
+        finally:
+            book.release_resources()
+
+    @staticmethod
+    def _read_xlsx(data: bytes, header: int) -> list[Row]:
+        from openpyxl import load_workbook
+
+        book = load_workbook(BytesIO(data), read_only=True, data_only=True)
+        try:
+            return [
+                list(row)
+                for row in book.worksheets[0].iter_rows(
+                    min_row=header + 2, values_only=True
+                )
+            ]
+        finally:
+            book.close()
+
+
+def _xls_cell_value(cell, datemode: int) -> Any:
+    import xlrd
+
+    match cell.ctype:
+        case xlrd.XL_CELL_EMPTY | xlrd.XL_CELL_BLANK:
+            return None
+        case xlrd.XL_CELL_DATE:
+            return xlrd.xldate.xldate_as_datetime(cell.value, datemode)
+        case _:
+            return cell.value
+
+
+PARSER_REGISTRY: dict[str, Type[StatementParser]] = {
+    "pandas": PandasParser,
+    "stream": RowStreamParser,
+}
+DEFAULT_ENGINE: Final[str] = "stream"
+
+
+def get_parser(engine: str | None = None) -> StatementParser:
+    """Build the statement parser of the configured engine
+
+    Args:
+        engine (str | None, optional): Engine name. Defaults to PARSER_ENGINE setting.
+
+    Returns:
+        StatementParser: Parser instance
+    """
+    engine = engine or settings.PARSER_ENGINE
+    if engine not in PARSER_REGISTRY:
+        logger.warning(f"Unknown parser engine '{engine}', using '{DEFAULT_ENGINE}'")
+        engine = DEFAULT_ENGINE
+
+    return PARSER_REGISTRY[engine]()
@@ -0,0 +1,119 @@
+import importlib
+import threading
+import time
+from collections.abc import Iterable, Mapping
+from importlib.metadata import entry_points
+from typing import Final, Type
+
+from vigilant import logger
+from vigilant.common.metrics import Histogram, metrics
+from vigilant.core.collector.scraper.scraper import Scraper
+
+ENTRY_POINT_GROUP: Final[str] = "vigilant.scrapers"
+BUILTIN_SCRAPERS: Final[dict[str, str]] = {
+    "BancoChile": "vigilant.core.collector.scraper.banco_chile.scraper:BancoChileScraper",
+    "BancoFalabella": (
+        "vigilant.core.collector.scraper.banco_falabella.scraper:BancoFalabellaScraper"
+    ),
+}
+
+LOAD_SECONDS: Final[Histogram] = metrics.histogram(
+    "vigilant_scraper_registry_load_seconds",
+    "Duration of the scraper registry loads, discovery and scraper imports",
+)
+
+
+class ScraperRegistry:
+    """Scrapers by name, as `module:Class` paths. The built-in scrapers are
+    extended, or overridden, by the `vigilant.scrapers` entry points of the
+    installed packages.
+
+    A scraper module is only imported when the scraper is loaded, so disabled
+    banks cost no import time nor memory.
+    """
+
+    def __init__(
+        self,
+        scrapers: Mapping[str, str | Type[Scraper]] | None = None,
+        group: str | None = ENTRY_POINT_GROUP,
+    ):
+        self.group = group
+
+        self._scrapers: dict[str, str | Type[Scraper]] = dict(
+            BUILTIN_SCRAPERS if scrapers is None else scrapers
+        )
+        self._discovered: bool = group is None
+        self._lock = threading.Lock()
+
+    @property
+    def names(self) -> list[str]:
+        with self._lock:
+            self._discover()
+            return list(self._scrapers)
+
+    def register(self, name: str, scraper: str | Type[Scraper]) -> None:
+        """Add a scraper, or replace the one with the same name
+
+        Args:
+            name (str): Name used in ENABLED_SCRAPERS setting
+            scraper (str | Type[Scraper]): `module:Class` path, or the class
+        """
+        with self._lock:
+            self._scrapers[name] = scraper
+
+    def get(self, name: str) -> Type[Scraper]:
+        """Scraper called `name`, importing its module on first use
+
+        Args:
+            name (str): Scraper name
+
+        Raises:
+            KeyError: When no scraper has this name
+
+        Returns:
+            Type[Scraper]: Scraper class
+        """
+        with self._lock:
+            self._discover()
+            scraper: str | Type[Scraper] = self._scrapers[name]
+
+            if isinstance(scraper, str):
+                scraper = self._scrapers[name] = _import(scraper)
+
+        return scraper
+
+    def load(self, names: Iterable[str]) -> list[Type[Scraper]]:
+        """Scrapers of the given names, unknown names are skipped
+
+        Args:
+            names (Iterable[str]): Scraper names
+
+        Returns:
+            list[Type[Scraper]]: Scraper classes, in the order of the names
+        """
+        started_at: float = time.perf_counter()
+
+        scrapers: list[Type[Scraper]] = []
+        for name in (name.strip() for name in names):
+            try:
+                scrapers.append(self.get(name))
+            except KeyError:
+                logger.warning(f"Unknown scraper '{name}', skipping it")
+
+        LOAD_SECONDS.observe(time.perf_counter() - started_at)
+
+        return scrapers
+
+    def _discover(self) -> None:
+        if self._discovered:
+            return
+
+        for entry_point in entry_points(group=self.group):
+            self._scrapers[entry_point.name] = entry_point.value
+        self._discovered = True
+
+
+def _import(path: str) -> Type[Scraper]:
+    module, _, name = path.partition(":")
+
+    return getattr(importlib.import_module(module), name)
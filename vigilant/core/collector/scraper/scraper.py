@@ -1,31 +1,337 @@
+import functools
+import json
 import random
-import string
+import time
 from abc import ABC, abstractmethod
+from collections.abc import Callable
 from pathlib import Path
+from typing import ClassVar, Final, TypeVar
 
-from playwright.sync_api import Page
+from playwright.sync_api import (
+    APIResponse,
+    BrowserContext,
+    Download,
+    Error as PlaywrightError,
+    Locator,
+    Page,
+    TimeoutError,
+)
 
-from vigilant.common.values import IOResources
+from vigilant.common.browser import RouteRules, renew_page, session_cache
+from vigilant.common.cache import reference_data
+from vigilant.common.deadline import Deadline
+from vigilant.common.exceptions import DeadlineExceeded
+from vigilant.common.log import ContextAdapter
+from vigilant.common.metrics import Counter, Histogram, metrics
+from vigilant.common.tracing import tracer
+from vigilant.common.spreadsheet import SpreadSheet
+from vigilant.common.values import balance_spreadsheet, settings
+from vigilant.common.workspace import Workspace
+from vigilant.core.collector.scraper.parser import (
+    XLS_SIGNATURE,
+    XLSX_SIGNATURE,
+    Row,
+    get_parser,
+)
 from vigilant import logger
 import logging
 
+SESSION_PROBE_TIMEOUT: Final[float] = 5000.0
+PAYMENT_DESCRIPTIONS_KEY: Final[str] = "payment_descriptions"
+
+STEP_SECONDS: Final[Histogram] = metrics.histogram(
+    "vigilant_scraper_step_seconds",
+    "Duration of scraper steps",
+    ("scraper", "step"),
+)
+
+STEP_RETRIES: Final[Counter] = metrics.counter(
+    "vigilant_scraper_step_retries_total",
+    "Retried attempts of scraper steps",
+    ("scraper", "step"),
+)
+
+F = TypeVar("F", bound=Callable)
+
+
+def step(
+    name: str,
+    retries: int = 0,
+    retry_on: tuple[type[Exception], ...] = (TimeoutError,),
+    browser: bool = True,
+) -> Callable[[F], F]:
+    """Trace the decorated scraper method as step `name` and account its
+    duration. New scrapers get traced by decorating their steps.
+
+    Failed attempts are retried on the same page with jittered exponential
+    backoff, so the step has to be safe to run again from where the previous
+    attempt left the page.
+
+    Browser steps run within the deadline of the scraper: the page timeouts
+    are bounded by its remaining time, and no step nor retry starts once it is
+    over. Local steps (parsing, saving) run regardless, so a statement
+    downloaded in time is never thrown away.
+
+    Args:
+        name (str): Step name, e.g. login, amount, download, parse or save
+        retries (int, optional): Attempts after the first one. Defaults to 0.
+        retry_on (tuple[type[Exception], ...], optional): Errors retried.
+            Defaults to Playwright timeouts.
+        browser (bool, optional): Whether the step uses the page, and is bound
+            by the deadline. Defaults to True.
+
+    Returns:
+        Callable[[F], F]: Decorator
+    """
+
+    def decorator(method: F) -> F:
+        @functools.wraps(method)
+        def wrapper(self: "Scraper", *args, **kwargs):
+            scraper: str = self.__class__.__name__
+            start: float = time.perf_counter()
+            try:
+                with tracer.span(f"step.{name}", scraper=scraper) as span:
+                    attempt: int = 0
+                    while True:
+                        if browser:
+                            if self.deadline.expired:
+                                raise DeadlineExceeded(scraper)
+                            self.page.set_default_timeout(self.timeout())
+
+                        span.set_attribute("attempts", attempt + 1)
+                        try:
+                            return method(self, *args, **kwargs)
+                        except retry_on as e:
+                            delay: float = _backoff(attempt)
+                            if attempt == retries or (
+                                browser and delay >= self.deadline.remaining
+                            ):
+                                raise
+
+                            self.logger.warning(
+                                f"Step {name} failed ({e.__class__.__name__}), "
+                                f"retrying in {delay:.1f}s ..."
+                            )
+                            STEP_RETRIES.inc(scraper=scraper, step=name)
+                            time.sleep(delay)
+                            attempt += 1
+            finally:
+                elapsed: float = time.perf_counter() - start
+                STEP_SECONDS.observe(elapsed, scraper=scraper, step=name)
+                self.logger.info(
+                    f"Step {name} took {elapsed:.2f}s",
+                    extra={"step": name, "duration": round(elapsed, 3)},
+                )
+
+        return wrapper
+
+    return decorator
+
 
 class Scraper(ABC):
-    def __init__(self, page: Page):
+    home_url: ClassVar[str]
+    session_probe: ClassVar[str]
+    routes: ClassVar[type[RouteRules]] = RouteRules
+    # Output file in the workspace, scrapers without one are neither
+    # checkpointed nor loaded into the spreadsheet
+    output_filename: ClassVar[str | None] = None
+
+    def __init__(
+        self, page: Page, workspace: Workspace, deadline: Deadline | None = None
+    ):
         self.page = page
-        self.data_path: Path = IOResources.DATA_PATH / "".join(
-            random.choices((string.ascii_letters + string.digits), k=7)
-        )
+        self.workspace = workspace
+        self.deadline = deadline or Deadline()
+        self.statement: bytes | None = None
 
         scraper_name = self.__class__.__name__
-        self.logger = logging.LoggerAdapter(
+        self.data_path: Path = workspace.data_path / scraper_name
+        self.logger = ContextAdapter(
             logger.getChild(scraper_name), {"role": "Scraper", "entity": scraper_name}
         )
 
+    def timeout(self, cap: float = settings.BROWSER_WAIT_TIMEOUT) -> float:
+        """Playwright timeout, bounded by the remaining time of the scraper
+
+        Args:
+            cap (float, optional): Timeout wanted, in milliseconds. Defaults
+                to BROWSER_WAIT_TIMEOUT setting.
+
+        Returns:
+            float: Timeout in milliseconds
+        """
+        return self.deadline.timeout(cap)
+
     def scrap(self) -> None:
-        self.data_path.mkdir(parents=True, exist_ok=True)
+        with tracer.span("scrap", scraper=self.__class__.__name__):
+            self.navigate()
+
+    @step("login", retries=1)
+    def authenticate(self) -> None:
+        """Reuse the cached session when it is still valid, otherwise login and
+        cache the new session
+        """
+        if session_cache.enabled and self._restore_session():
+            self.logger.info("Reusing cached session ...")
+            return
+
+        self._login()
+        session_cache.save(self.__class__.__name__, self.page.context.storage_state())
+
+    @tracer.traced("scraper.restore_session")
+    def _restore_session(self) -> bool:
+        """Load the cached session into the browser context and check it is
+        still authenticated by looking for `session_probe` in the home page
+
+        Returns:
+            bool: Whether the session is authenticated
+        """
+        name: str = self.__class__.__name__
+        context: BrowserContext = self.page.context
+
+        if not context.cookies():
+            state: dict | None = session_cache.load(name)
+            if state is None:
+                return False
+
+            context.add_cookies(state["cookies"])
+            context.add_init_script(_local_storage_script(state.get("origins", [])))
+
+        self.page.goto(self.home_url)
+        try:
+            self.page.locator(self.session_probe).first.wait_for(
+                state="visible", timeout=self.timeout(SESSION_PROBE_TIMEOUT)
+            )
+        except TimeoutError:
+            self.logger.info("Cached session expired")
+            session_cache.invalidate(name)
+            # The restored localStorage init script can't be removed from the
+            # context, login continues in a fresh one
+            self.page = renew_page(name, self.routes)
+            return False
+
+        return True
 
-        self.navigate()
+    @tracer.traced("scraper.fetch_export")
+    def _fetch_export(self, url: str | None) -> bytes | None:
+        """Download the statement straight from the export endpoint, using the
+        authenticated request context of the browser
+
+        Args:
+            url (str | None): Export endpoint, the fast path is skipped when unset
+
+        Returns:
+            bytes | None: Statement content, None when it could not be fetched
+                or is not a spreadsheet (e.g. a login page after the session
+                expired)
+        """
+        if not url:
+            return None
+
+        self.logger.info("Fetching statement export ...")
+        try:
+            response: APIResponse = self.page.context.request.get(url)
+        except PlaywrightError as e:
+            self.logger.warning(f"Statement export failed: {e}")
+            return None
+
+        if not response.ok:
+            self.logger.warning(f"Statement export failed: HTTP {response.status}")
+            return None
+
+        body: bytes = response.body()
+        if not body.startswith((XLSX_SIGNATURE, XLS_SIGNATURE)):
+            content_type: str = response.headers.get("content-type", "unknown")
+            self.logger.warning(
+                f"Statement export is not a spreadsheet ({content_type}), "
+                "falling back to the download"
+            )
+            return None
+
+        return body
+
+    @tracer.traced("scraper.download_statement")
+    def _download_statement(self, trigger: Locator, filename: str) -> None:
+        """Click on `trigger` and keep the downloaded statement in memory. The
+        raw file is only persisted in `data_path` when debugging or when
+        `ARCHIVE_DOWNLOADS` is enabled.
+
+        Args:
+            trigger (Locator): Element starting the download
+            filename (str): Name of the persisted file
+        """
+        with self.page.expect_download() as download_info:
+            trigger.click()
+
+        download: Download = download_info.value
+        self.statement = Path(download.path()).read_bytes()
+
+        if settings.ARCHIVE_DOWNLOADS or self.logger.isEnabledFor(logging.DEBUG):
+            self.data_path.mkdir(parents=True, exist_ok=True)
+            (self.data_path / filename).write_bytes(self.statement)
+
+        download.delete()
+
+    @step("parse", browser=False)
+    def _parse_statement(self, header: int, usecols: tuple[int, ...]) -> list[Row]:
+        """Read the downloaded statement with the configured parser engine
+
+        Args:
+            header (int): Index of the header row
+            usecols (tuple[int, ...]): Indexes of the columns to keep
+
+        Returns:
+            list[Row]: Statement rows
+        """
+        return get_parser().read(self.statement, header=header, usecols=usecols)
+
+    def _get_payment_descriptions(self) -> list[str]:
+        """Descriptions of card payments, which are not expenses. Shared by
+        every scraper through the reference data cache.
+
+        Returns:
+            list[str]: Payment descriptions
+        """
+        return reference_data.get(PAYMENT_DESCRIPTIONS_KEY, _load_payment_descriptions)
 
     @abstractmethod
     def navigate(self) -> None: ...
+
+    @abstractmethod
+    def _login(self) -> None: ...
+
+
+def _backoff(attempt: int) -> float:
+    return random.uniform(
+        0, min(settings.STEP_BACKOFF_MAX, settings.STEP_BACKOFF_BASE * 2**attempt)
+    )
+
+
+def _load_payment_descriptions() -> list[str]:
+    spreadsheet = SpreadSheet.load(balance_spreadsheet.KEY)
+
+    return [
+        desc.pop()
+        for desc in spreadsheet.read(
+            balance_spreadsheet.DATA_WORKSHEET_NAME,
+            balance_spreadsheet.PAYMENT_DESC_RANGE,
+        )
+    ]
+
+
+def _local_storage_script(origins: list[dict]) -> str:
+    """Build an init script that fills localStorage for the saved origins
+
+    Args:
+        origins (list[dict]): `origins` entry of a Playwright storage state
+
+    Returns:
+        str: JavaScript source
+    """
+    return (
+        "(origins => {"
+        "const saved = origins.find(o => o.origin === window.location.origin);"
+        "if (saved) saved.localStorage.forEach("
+        "({name, value}) => window.localStorage.setItem(name, value));"
+        f"}})({json.dumps(origins)});"
+    )
@@ -1,29 +1,54 @@
 import json
-from pathlib import Path
-from typing import Final
+import sys
+from typing import Any, Final
+
+from gspread.utils import a1_to_rowcol, rowcol_to_a1
 
 from vigilant import logger
-from vigilant.common.models import AccountData, AccountReport
-from vigilant.common.spreadsheet import SpreadSheet
+from vigilant.common.models import AccountData, AccountReport, SpreadsheetSnapshot
+from vigilant.common.spreadsheet import SpreadSheet, sheets_client
+from vigilant.common.tracing import tracer
 from vigilant.common.values import balance_spreadsheet, IOResources
+from vigilant.common.workspace import Workspace
+
+EXPENSES_WIDTH: Final[int] = 5
+AMOUNT_COLUMN: Final[int] = 4
 
-TRANSACTIONS_COUNT: Final[int] = 198
 
+@tracer.traced("update_spreadsheet")
+def main(workspace: Workspace, outputs: list[str] | None = None) -> None:
+    """Load expenses data into a google spreadsheet
 
-def main() -> None:
-    """Load expenses data into a google spreadsheet"""
+    Args:
+        workspace (Workspace): Workspace of the run with the scrapers output
+        outputs (list[str] | None, optional): Output files to load. Defaults
+            to every output in the workspace.
+    """
     spreadsheet = SpreadSheet.load(balance_spreadsheet.KEY)
 
-    update_balance_spreadsheet(spreadsheet, *load_bank_data())
+    update_balance_spreadsheet(spreadsheet, *load_bank_data(workspace, outputs))
 
+    logger.debug(f"Sheets client: {sheets_client.stats()}")
 
-def load_bank_data() -> tuple[int, list[list[str, int]]]:
+
+def load_bank_data(
+    workspace: Workspace, outputs: list[str] | None = None
+) -> tuple[int, list[list[str, int]]]:
     """Loads bank data from scrapers output
 
+    Args:
+        workspace (Workspace): Workspace of the run with the scrapers output
+        outputs (list[str] | None, optional): Output files to load. Defaults
+            to every output in the workspace.
+
     Returns:
         tuple[int, list[list[str, int]]]: Accounts amount and transactions list
     """
-    files = Path(IOResources.OUTPUT_PATH).glob("*.json")
+    files = (
+        workspace.output_path.glob("*.json")
+        if outputs is None
+        else [workspace.output_path / output for output in outputs]
+    )
     report = AccountReport(
         accounts=[AccountData(**json.loads(file.read_text())) for file in files]
     )
@@ -34,7 +59,9 @@ def load_bank_data() -> tuple[int, list[list[str, int]]]:
 def update_balance_spreadsheet(
     spreadsheet: SpreadSheet, account_amount: str, expenses: list[list[str]]
 ) -> None:
-    """Uploads expenses data into a google spreadsheet
+    """Uploads expenses data into a google spreadsheet. The write is sized to
+    the expenses, rows left over by the previous run are cleared and the
+    worksheet grows when it is too small.
 
     Args:
         spreadsheet (SpreadSheet): spreadsheet instance
@@ -43,24 +70,145 @@ def update_balance_spreadsheet(
     """
     logger.info("Updating spreadsheet ...")
 
-    expenses.extend([["-", "", "", "", ""]] * (TRANSACTIONS_COUNT - len(expenses)))
+    title: str = balance_spreadsheet.EXPENSES_WORKSHEET_NAME
+    incremental: bool = balance_spreadsheet.INCREMENTAL_SYNC
 
-    spreadsheet.write(
-        balance_spreadsheet.EXPENSES_WORKSHEET_NAME,
-        balance_spreadsheet.AMOUNT_CELL,
-        [[account_amount]],
+    previous: list[list[Any]] | None = read_snapshot()
+    if previous is None and incremental:
+        previous = read_expenses(spreadsheet)
+
+    blocks: list[tuple[int, list[list[Any]]]] = changed_blocks(
+        previous if incremental else None, expenses
     )
-    spreadsheet.write(
-        balance_spreadsheet.EXPENSES_WORKSHEET_NAME,
-        balance_spreadsheet.EXPENSES_CELL,
-        expenses,
+    logger.info(f"Writing {sum(len(rows) for _, rows in blocks)} changed rows ...")
+
+    first_row, _ = a1_to_rowcol(balance_spreadsheet.EXPENSES_CELL)
+    spreadsheet.ensure_rows(title, first_row + len(expenses) - 1)
+
+    with spreadsheet.batch(balance_spreadsheet.WRITE_CHUNK_ROWS) as batch:
+        batch.write(title, balance_spreadsheet.AMOUNT_CELL, [[account_amount]])
+        for offset, rows in blocks:
+            batch.write(title, expenses_range(offset, len(rows)), rows)
+
+        if previous is None:
+            batch.clear(title, expenses_range(len(expenses)))
+        elif len(previous) > len(expenses):
+            batch.clear(
+                title, expenses_range(len(expenses), len(previous) - len(expenses))
+            )
+
+        formatted: int = len(previous) if incremental and previous is not None else 0
+        if len(expenses) > formatted:
+            batch.format_currency(
+                title,
+                expenses_range(
+                    formatted, len(expenses) - formatted, first_col=AMOUNT_COLUMN
+                ),
+            )
+
+    save_snapshot(expenses)
+
+
+def expenses_range(offset: int, rows: int | None = None, first_col: int = 0) -> str:
+    """A1 range of expense rows, relative to `EXPENSES_CELL`
+
+    Args:
+        offset (int): Index of the first row
+        rows (int | None, optional): Number of rows. Defaults to None, up to
+            the end of the worksheet.
+        first_col (int, optional): Index of the first column. Defaults to 0.
+
+    Returns:
+        str: A1 range
+    """
+    row, col = a1_to_rowcol(balance_spreadsheet.EXPENSES_CELL)
+    last_col: int = col + EXPENSES_WIDTH - 1
+    start: str = rowcol_to_a1(row + offset, col + first_col)
+
+    if rows is None:
+        # Open-ended range, only the column of the row 1 cell is kept
+        return f"{start}:{rowcol_to_a1(1, last_col).removesuffix('1')}"
+
+    return f"{start}:{rowcol_to_a1(row + offset + rows - 1, last_col)}"
+
+
+def changed_blocks(
+    previous: list[list[Any]] | None, current: list[list[Any]]
+) -> list[tuple[int, list[list[Any]]]]:
+    """Group the rows that differ from the previous snapshot into contiguous
+    blocks. Without snapshot, every row is part of a single block.
+
+    Args:
+        previous (list[list[Any]] | None): Rows already written
+        current (list[list[Any]]): Rows to write
+
+    Returns:
+        list[tuple[int, list[list[Any]]]]: Offset of the first row and rows of
+            each block
+    """
+    if previous is None:
+        return [(0, current)] if current else []
+
+    blocks: list[tuple[int, list[list[Any]]]] = []
+    for index, row in enumerate(current):
+        if index < len(previous) and previous[index] == row:
+            continue
+
+        if blocks and blocks[-1][0] + len(blocks[-1][1]) == index:
+            blocks[-1][1].append(row)
+        else:
+            blocks.append((index, [row]))
+
+    return blocks
+
+
+def read_snapshot() -> list[list[Any]] | None:
+    """Expenses written by the last run into the configured spreadsheet
+
+    Returns:
+        list[list[Any]] | None: Expenses rows, None when unknown
+    """
+    if not IOResources.SNAPSHOT_PATH.is_file():
+        return None
+
+    snapshot = SpreadsheetSnapshot.model_validate_json(
+        IOResources.SNAPSHOT_PATH.read_text()
     )
 
-    spreadsheet.format_currency(
+    return snapshot.expenses if snapshot.key == balance_spreadsheet.KEY else None
+
+
+def read_expenses(spreadsheet: SpreadSheet) -> list[list[Any]]:
+    """Read back the expenses currently in the spreadsheet
+
+    Args:
+        spreadsheet (SpreadSheet): spreadsheet instance
+
+    Returns:
+        list[list[Any]]: Expenses rows
+    """
+    rows: list[list[Any]] = spreadsheet.read(
         balance_spreadsheet.EXPENSES_WORKSHEET_NAME,
-        balance_spreadsheet.TRANSACTIONS_AMOUNT_RANGE,
+        expenses_range(0),
+        unformatted=True,
+    )
+
+    return [r + [""] * (EXPENSES_WIDTH - len(r)) for r in rows]
+
+
+def save_snapshot(expenses: list[list[Any]]) -> None:
+    """Remember the expenses written in the spreadsheet
+
+    Args:
+        expenses (list[list[Any]]): Expenses rows
+    """
+    IOResources.SNAPSHOT_PATH.parent.mkdir(parents=True, exist_ok=True)
+    IOResources.SNAPSHOT_PATH.write_text(
+        SpreadsheetSnapshot(
+            key=balance_spreadsheet.KEY, expenses=expenses
+        ).model_dump_json()
     )
 
 
 if __name__ == "__main__":
-    main()
+    main(Workspace.open(sys.argv[1]) if len(sys.argv) > 1 else Workspace.create())
@@ -1,12 +1,80 @@
+from typing import Final
+
 from vigilant import logger
+from vigilant.common.browser import close_pool
+from vigilant.common.deadline import Deadline
+from vigilant.common.exceptions import IncompleteRun
+from vigilant.common.log import bind_run_id
+from vigilant.common.models import CollectionResult
+from vigilant.common.metrics import Counter, Histogram, metrics
+from vigilant.common.singleflight import SingleFlight
+from vigilant.common.tracing import tracer
+from vigilant.common.values import settings
+from vigilant.common.workspace import Workspace, collect_garbage_in_background
 from vigilant.core import collector, update_spreadsheet
+from vigilant.core.collector.checkpoint import checkpoints
+
+RUNS: Final[Counter] = metrics.counter(
+    "vigilant_runs_total", "Pipeline runs by outcome", ("outcome",)
+)
+RUN_SECONDS: Final[Histogram] = metrics.histogram(
+    "vigilant_run_seconds", "Duration of pipeline runs led by this process"
+)
+
+pipeline = SingleFlight()
 
 
 def main():
     """Process for collecting expenses data and load it into a google
-    spreadsheet
+    spreadsheet. When another process is already running it, its result is
+    awaited instead.
     """
-    collector.collect()
-    update_spreadsheet.main()
+    try:
+        pipeline.run(_update_expenses)
+    except IncompleteRun:
+        RUNS.inc(outcome="incomplete")
+        raise
+    except Exception:
+        RUNS.inc(outcome="failed")
+        raise
 
+    RUNS.inc(outcome="succeeded")
     logger.info("Operation completed successfully")
+
+
+def cli():
+    """Command line entry point, runs the process once and releases the
+    browsers before exiting
+    """
+    try:
+        main()
+    finally:
+        collector.shutdown()
+        close_pool()
+
+
+def _update_expenses(run_id: str) -> None:
+    with (
+        bind_run_id(run_id),
+        tracer.span("run", run_id=run_id),
+        RUN_SECONDS.time(),
+    ):
+        deadline = Deadline(settings.RUN_TIMEOUT or None)
+        workspace: Workspace = Workspace.create(run_id)
+        collect_garbage_in_background(keep={run_id})
+
+        result: CollectionResult = collector.collect(
+            workspace, deadline.before(settings.RUN_WRITE_RESERVE)
+        )
+        # The banks collected are still written, unless there are none. Only
+        # their outputs are read, scrapers left behind may still be writing.
+        # The write is not bounded, it may outlast the reserve rather than
+        # stop half way
+        if not result.skipped or result.outputs:
+            update_spreadsheet.main(workspace, result.outputs)
+
+        if result.skipped:
+            raise IncompleteRun(result.skipped)
+
+        # Checkpoints only serve retries of a failed run
+        checkpoints.clear()
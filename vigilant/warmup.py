@@ -0,0 +1,91 @@
+import importlib
+import time
+from enum import StrEnum
+from typing import Final, Optional
+
+from pydantic import BaseModel
+
+from vigilant import logger
+from vigilant.common.metrics import Histogram, metrics
+
+PRELOAD_MODULES: Final[tuple[str, ...]] = (
+    "vigilant.run",
+    "vigilant.core.update_spreadsheet",
+)
+
+WARM_UP_SECONDS: Final[Histogram] = metrics.histogram(
+    "vigilant_warm_up_seconds", "Duration of the startup warm-up"
+)
+
+
+class WarmUpStatus(StrEnum):
+    PENDING = "pending"
+    WARMING = "warming"
+    READY = "ready"
+    FAILED = "failed"
+
+
+class Readiness(BaseModel):
+    status: WarmUpStatus = WarmUpStatus.PENDING
+    duration: Optional[float] = None
+    error: Optional[str] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.status == WarmUpStatus.READY
+
+    @property
+    def finished(self) -> bool:
+        """Whether the warm-up is over. A failed one leaves the service
+        degraded but serving, the browsers launch on demand.
+        """
+        return self.status in (WarmUpStatus.READY, WarmUpStatus.FAILED)
+
+
+class WarmUp:
+    """Pays the cold start costs ahead of the first request: imports the
+    pipeline modules and the statement parser dependencies, starts the
+    Playwright driver and launches the browsers.
+
+    Browser pools are bound to their thread, so it has to run in the thread
+    the updates run in (the job worker), the scraper workers are warmed up by
+    the collector.
+    """
+
+    def __init__(self, modules: tuple[str, ...] = PRELOAD_MODULES):
+        self.modules = modules
+        self.readiness = Readiness()
+
+    def run(self) -> None:
+        """Warm up the current thread and the scraper workers"""
+        self.readiness = Readiness(status=WarmUpStatus.WARMING)
+        started_at: float = time.perf_counter()
+
+        try:
+            for module in self.modules:
+                importlib.import_module(module)
+
+            from vigilant.common.browser import get_pool
+            from vigilant.core import collector
+            from vigilant.core.collector.scraper.parser import get_parser
+
+            for module in get_parser().modules:
+                importlib.import_module(module)
+
+            get_pool().browser
+            collector.warm_up()
+        except Exception as e:
+            logger.exception("Warm-up failed, browsers will launch on demand")
+            self.readiness.status = WarmUpStatus.FAILED
+            self.readiness.error = repr(e)
+        else:
+            self.readiness.status = WarmUpStatus.READY
+        finally:
+            elapsed: float = time.perf_counter() - started_at
+            WARM_UP_SECONDS.observe(elapsed)
+            self.readiness.duration = round(elapsed, 3)
+
+        logger.info(f"Warm-up {self.readiness.status} in {self.readiness.duration}s")
+
+
+warm_up = WarmUp()